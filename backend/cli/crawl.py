@@ -0,0 +1,338 @@
+"""
+Offline bulk crawler for full category snapshots.
+
+Walks every requested def_index through the CSFloat listings cursor chain with
+bounded concurrency at bulk priority (so it only uses spare upstream capacity
+and the shared API key pool's rate accounting), and appends each page to
+gzip-compressed, append-only segment files.
+
+After every page the checkpoint records each def_index's next cursor plus the
+current segment and its byte offset. On resume, anything written past that
+offset (a page whose checkpoint never landed) is truncated away, so pages end
+up in the segments exactly once and crawling continues where it stopped. The
+checkpoint also records the category, filters and sort; resuming into a
+directory crawled with different ones is refused rather than mixing results.
+Ctrl-C cancels queued def_indexes, lets in-flight pages land and checkpoints.
+
+Usage:
+    python -m backend.cli.crawl --category 1 --def-index 7 --def-index 9 --out data/crawl
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.exceptions import BackendError, UpstreamServiceError
+from ..services.csfloat.client import CSFloatClient
+from ..services.csfloat.params import normalize_listings_params
+from ..services.csfloat.scheduler import Priority
+
+logger = logging.getLogger("csfloat.crawl")
+
+CHECKPOINT_FILE = "checkpoint.json"
+SEGMENT_PATTERN = "segment-{:06d}.jsonl.gz"
+
+
+class SegmentWriter:
+    """Append-only writer of gzip segments, one gzip member per page."""
+
+    def __init__(self, directory: str, max_segment_bytes: int) -> None:
+        self.directory = directory
+        self.max_segment_bytes = max(1, int(max_segment_bytes))
+        os.makedirs(directory, exist_ok=True)
+        self.segment = 1
+        self.offset = 0
+        self.bytes_written = 0
+
+    def path(self, segment: Optional[int] = None) -> str:
+        return os.path.join(self.directory, SEGMENT_PATTERN.format(segment or self.segment))
+
+    def restore(self, segment: int, offset: int) -> None:
+        """Roll back to a checkpointed position, dropping uncommitted bytes."""
+        self.segment, self.offset = max(1, int(segment)), max(0, int(offset))
+        path = self.path()
+        if os.path.exists(path) and os.path.getsize(path) > self.offset:
+            with open(path, "r+b") as f:
+                f.truncate(self.offset)
+        later = self.segment + 1
+        while os.path.exists(self.path(later)):
+            os.remove(self.path(later))
+            later += 1
+
+    def append(self, lines: List[str]) -> None:
+        if self.offset >= self.max_segment_bytes:
+            self.segment += 1
+            self.offset = 0
+        data = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+        with open(self.path(), "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.offset += len(data)
+        self.bytes_written += len(data)
+
+
+class Crawler:
+    def __init__(
+        self,
+        client: CSFloatClient,
+        out_dir: str,
+        def_indexes: Sequence[int],
+        *,
+        category: int = 0,
+        filters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 4,
+        page_limit: int = 50,
+        sort_by: str = "most_recent",
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_retries: int = 5,
+        backoff_seconds: float = 2.0,
+        report_interval: float = 10.0,
+    ) -> None:
+        self.client = client
+        self.out_dir = out_dir
+        self.category = int(category)
+        self.filters = normalize_listings_params(filters or {})
+        self.concurrency = max(1, int(concurrency))
+        self.page_limit = int(page_limit)
+        self.sort_by = sort_by
+        self.max_retries = int(max_retries)
+        self.backoff_seconds = float(backoff_seconds)
+        self.report_interval = float(report_interval)
+        self.writer = SegmentWriter(out_dir, max_segment_bytes)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.targets: Dict[str, Dict[str, Any]] = {
+            str(d): {"cursor": None, "done": False, "pages": 0, "listings": 0} for d in def_indexes
+        }
+        self.pages = 0
+        self.listings = 0
+        self._load_checkpoint()
+
+    # -- checkpointing ------------------------------------------------------
+
+    def _checkpoint_path(self) -> str:
+        return os.path.join(self.out_dir, CHECKPOINT_FILE)
+
+    def _load_checkpoint(self) -> None:
+        path = self._checkpoint_path()
+        if not os.path.exists(path):
+            self.writer.restore(1, 0)
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._check_arguments(data)
+        for key, state in (data.get("targets") or {}).items():
+            if key in self.targets:
+                self.targets[key].update(state)
+        self.writer.restore(int(data.get("segment", 1)), int(data.get("offset", 0)))
+        logger.info(
+            "resuming crawl: %d/%d def_indexes done, segment %d @ %d bytes",
+            sum(1 for t in self.targets.values() if t["done"]),
+            len(self.targets),
+            self.writer.segment,
+            self.writer.offset,
+        )
+
+    def _check_arguments(self, data: Dict[str, Any]) -> None:
+        """Refuse to resume a checkpoint written for a different query."""
+        expected = {
+            "category": self.category,
+            "filters": json.loads(json.dumps(self.filters)),
+            "sort_by": self.sort_by,
+        }
+        for name, value in expected.items():
+            saved = data.get(name, value)
+            if saved != value:
+                raise ValueError(
+                    f"{self._checkpoint_path()} was written with {name}={saved!r}, "
+                    f"not {value!r}; use another --out directory or rerun with the "
+                    "original arguments"
+                )
+
+    def _save_checkpoint(self) -> None:
+        payload = {
+            "category": self.category,
+            "filters": self.filters,
+            "sort_by": self.sort_by,
+            "segment": self.writer.segment,
+            "offset": self.writer.offset,
+            "targets": self.targets,
+        }
+        tmp = self._checkpoint_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self._checkpoint_path())
+
+    # -- crawling -----------------------------------------------------------
+
+    def _fetch_with_retry(self, params: Dict[str, Any]) -> tuple[List[Dict[str, Any]], Any]:
+        attempt = 0
+        while True:
+            try:
+                return self.client.fetch_listings_page(params, Priority.BULK)
+            except UpstreamServiceError as e:
+                if attempt >= self.max_retries or self._stop.is_set():
+                    raise
+                delay = min(60.0, self.backoff_seconds * (2**attempt))
+                logger.warning("upstream refused page (%s); retrying in %.1fs", e, delay)
+                self._stop.wait(delay)
+                attempt += 1
+
+    def _crawl_target(self, def_index: str) -> None:
+        state = self.targets[def_index]
+        params: Dict[str, Any] = dict(
+            self.filters,
+            category=self.category,
+            def_index=[int(def_index)],
+            limit=self.page_limit,
+            sort_by=self.sort_by,
+        )
+        while not state["done"] and not self._stop.is_set():
+            params["cursor"] = state["cursor"]
+            listings, cursor = self._fetch_with_retry(params)
+            lines = [json.dumps(entry, separators=(",", ":")) for entry in listings]
+            with self._lock:
+                if lines:
+                    self.writer.append(lines)
+                state["pages"] += 1
+                state["listings"] += len(listings)
+                state["cursor"] = cursor
+                state["done"] = cursor is None
+                self.pages += 1
+                self.listings += len(listings)
+                self._save_checkpoint()
+
+    def _report(self, started: float) -> Dict[str, Any]:
+        elapsed = max(1e-9, time.perf_counter() - started)
+        with self._lock:
+            done = sum(1 for t in self.targets.values() if t["done"])
+            return {
+                "elapsed_seconds": round(elapsed, 1),
+                "pages": self.pages,
+                "listings": self.listings,
+                "pages_per_second": round(self.pages / elapsed, 2),
+                "listings_per_second": round(self.listings / elapsed, 1),
+                "bytes_written": self.writer.bytes_written,
+                "def_indexes_done": done,
+                "def_indexes_total": len(self.targets),
+            }
+
+    def run(self) -> Dict[str, Any]:
+        """Crawl every unfinished def_index; returns the final throughput report."""
+        started = time.perf_counter()
+        pending = [d for d, t in self.targets.items() if not t["done"]]
+        finished = threading.Event()
+
+        def reporter() -> None:
+            while not finished.wait(self.report_interval):
+                logger.info(json.dumps(self._report(started)))
+
+        threading.Thread(target=reporter, name="crawl-report", daemon=True).start()
+        errors: List[str] = []
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        try:
+            futures: Dict[Future, str] = {pool.submit(self._crawl_target, d): d for d in pending}
+            for future, def_index in futures.items():
+                try:
+                    future.result()
+                except BackendError as e:
+                    errors.append(f"def_index {def_index}: {e}")
+                    logger.error("def_index %s stopped: %s", def_index, e)
+        except KeyboardInterrupt:
+            # Drop queued def_indexes; running ones stop after their current page.
+            self.stop()
+            pool.shutdown(wait=True, cancel_futures=True)
+            with self._lock:
+                self._save_checkpoint()
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            finished.set()
+        report = self._report(started)
+        report["errors"] = errors
+        return report
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.cli.crawl",
+        description="Crawl every CSFloat listing for the given def_indexes into gzip segments.",
+    )
+    parser.add_argument(
+        "--out", default="data/crawl", help="Output directory (segments + checkpoint)"
+    )
+    parser.add_argument(
+        "--category", type=int, default=0, help="0 any, 1 normal, 2 StatTrak, 3 souvenir"
+    )
+    parser.add_argument(
+        "--def-index",
+        type=int,
+        action="append",
+        required=True,
+        help="Weapon def_index to crawl (repeatable)",
+    )
+    parser.add_argument("--min-float", type=float)
+    parser.add_argument("--max-float", type=float)
+    parser.add_argument("--min-price", type=float)
+    parser.add_argument("--max-price", type=float)
+    parser.add_argument(
+        "--concurrency", type=int, default=4, help="def_indexes crawled in parallel"
+    )
+    parser.add_argument("--page-limit", type=int, default=50)
+    parser.add_argument("--sort-by", default="most_recent")
+    parser.add_argument("--segment-mb", type=float, default=64.0, help="Segment rotation size")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per page on 429/5xx")
+    parser.add_argument(
+        "--report-interval", type=float, default=10.0, help="Seconds between reports"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    try:
+        crawler = Crawler(
+            CSFloatClient(),
+            args.out,
+            args.def_index,
+            category=args.category,
+            filters={
+                "min_float": args.min_float,
+                "max_float": args.max_float,
+                "min_price": args.min_price,
+                "max_price": args.max_price,
+            },
+            concurrency=args.concurrency,
+            page_limit=args.page_limit,
+            sort_by=args.sort_by,
+            max_segment_bytes=int(args.segment_mb * 1024 * 1024),
+            max_retries=args.max_retries,
+            report_interval=args.report_interval,
+        )
+    except ValueError as e:
+        logger.error("%s", e)
+        return 2
+    try:
+        report = crawler.run()
+    except KeyboardInterrupt:
+        logger.info("interrupted; progress is checkpointed, rerun the same command to resume")
+        return 130
+    logger.info(json.dumps(report))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,340 @@
+"""
+Local stand-in for the CSFloat listings and item-names APIs, for load tests.
+
+Serves a deterministic synthetic market (names, def/paint indexes and float
+caps from the bundled metadata catalog) behind the same query parameters,
+cursors and ``ETag``/``If-None-Match`` behaviour the backend relies on, and
+injects the failure modes worth measuring against:
+
+- latency drawn from a distribution (``fixed:0.05``, ``uniform:0.01,0.2``,
+  ``exp:0.08`` or ``lognormal:-3,0.6``, in seconds)
+- a random fraction of 500/502/503 answers
+- a per-API-key request budget per window, answered with 429 + Retry-After
+- a random fraction of slow bodies, trickled out in chunks
+
+Point the backend at it with
+``CSFLOAT_API_URL=http://127.0.0.1:8787/api/v1/listings`` and
+``CSFLOAT_ITEM_NAMES_URL=http://127.0.0.1:8787/api/v1/item-names``.
+``GET /__stats`` reports what the fake has served.
+
+Usage:
+    python -m backend.cli.fake_upstream --items 20000 --latency lognormal:-3,0.6 \\
+        --error-rate 0.02 --rate-limit 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+import uvicorn
+
+from ..services.metadata.catalog import BUNDLED_PATH, MetadataCatalog
+
+LISTINGS_PATH = "/api/v1/listings"
+ITEM_NAMES_PATH = "/api/v1/item-names"
+STATS_PATH = "/__stats"
+
+_WEARS = (
+    (0.07, "Factory New"),
+    (0.15, "Minimal Wear"),
+    (0.38, "Field-Tested"),
+    (0.45, "Well-Worn"),
+    (1.0, "Battle-Scarred"),
+)
+_SORTS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "lowest_price": lambda x: x["price"],
+    "highest_price": lambda x: -x["price"],
+    "most_recent": lambda x: -x["_created"],
+    "expires_soon": lambda x: x["_created"],
+    "lowest_float": lambda x: x["item"]["float_value"],
+    "highest_float": lambda x: -x["item"]["float_value"],
+    "best_deal": lambda x: x["price"] / x["_reference"],
+}
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Seconds-to-wait sampler for ``kind:args`` (fixed, uniform, exp, lognormal)."""
+    kind, _, raw = spec.partition(":")
+    args = [float(a) for a in raw.split(",") if a.strip()]
+    if kind == "fixed" and len(args) == 1:
+        return lambda: args[0]
+    if kind == "uniform" and len(args) == 2:
+        return lambda: rng.uniform(args[0], args[1])
+    if kind == "exp" and len(args) == 1:
+        return lambda: rng.expovariate(1.0 / args[0]) if args[0] > 0 else 0.0
+    if kind == "lognormal" and len(args) == 2:
+        return lambda: rng.lognormvariate(args[0], args[1])
+    raise ValueError(f"Unsupported latency spec {spec!r}")
+
+
+@dataclass(frozen=True)
+class FakeUpstreamConfig:
+    items: int = 5000
+    seed: int = 7
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    # Requests per API key per window (0 = unlimited)
+    rate_limit: int = 0
+    rate_window_seconds: float = 60.0
+    slow_body_rate: float = 0.0
+    slow_body_seconds: float = 2.0
+    max_page_size: int = 50
+
+
+def _wear_name(float_value: float) -> str:
+    return next(name for cap, name in _WEARS if float_value < cap or cap == 1.0)
+
+
+def generate_listings(count: int, seed: int) -> List[Dict[str, Any]]:
+    """``count`` deterministic listings shaped like the upstream API's."""
+    rng = random.Random(seed)
+    metadata = MetadataCatalog.load(BUNDLED_PATH)
+    doc = json.loads(metadata.document)
+    weapons = doc["weapons"]
+    kits = doc["paint_kits"]
+    now = time.time()
+    listings = []
+    for i in range(count):
+        weapon = rng.choice(weapons)
+        kit = rng.choice(kits)
+        float_value = round(rng.uniform(kit["min_float"], kit["max_float"]), 6)
+        category = rng.choices((1, 2, 3), weights=(80, 15, 5))[0]
+        prefix = {2: "StatTrak™ ", 3: "Souvenir "}.get(category, "")
+        star = "★ " if weapon["type"] in ("Knife", "Gloves") else ""
+        item_name = f"{star}{prefix}{weapon['name']} | {kit['name']}"
+        wear = _wear_name(float_value)
+        reference = 100 + (hash((weapon["def_index"], kit["paint_index"])) % 50000)
+        listings.append(
+            {
+                "id": str(100000000 + i),
+                "type": "buy_now",
+                "price": max(3, int(reference * rng.lognormvariate(0.0, 0.25))),
+                "item": {
+                    "def_index": weapon["def_index"],
+                    "paint_index": kit["paint_index"],
+                    "paint_seed": rng.randint(0, 1000),
+                    "float_value": float_value,
+                    "item_name": item_name,
+                    "market_hash_name": f"{item_name} ({wear})",
+                    "wear_name": wear,
+                    "rarity": rng.randint(1, 7),
+                    "is_stattrak": category == 2,
+                    "is_souvenir": category == 3,
+                    "inspect_link": f"steam://rungame/730/+csgo_econ_action_preview%20A{i}",
+                    "stickers": [],
+                },
+                "_category": category,
+                "_created": now - i * 7.0,
+                "_reference": reference,
+            }
+        )
+    return listings
+
+
+def _public(listing: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in listing.items() if not k.startswith("_")}
+
+
+class FakeUpstream:
+    """ASGI app emulating the CSFloat listings and item-names endpoints."""
+
+    def __init__(
+        self,
+        config: Optional[FakeUpstreamConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config = config or FakeUpstreamConfig()
+        self._clock = clock
+        self._rng = random.Random(config.seed + 1)
+        self._latency = latency_sampler(config.latency, self._rng)
+        self._listings = generate_listings(config.items, config.seed)
+        self._sorted: Dict[str, List[Dict[str, Any]]] = {}
+        popularity = Counter(x["item"]["market_hash_name"] for x in self._listings)
+        self._names = [name for name, _ in popularity.most_common()]
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self.stats: Counter = Counter()
+
+    # -- ASGI -----------------------------------------------------------------
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        status, body, extra = self.handle(scope["path"], query, headers)
+        delay = self._latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response_headers = [(b"content-type", b"application/json")] + [
+            (k.encode("latin-1"), v.encode("latin-1")) for k, v in extra.items()
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        if body and self._rng.random() < self.config.slow_body_rate:
+            self.stats["slow_bodies"] += 1
+            chunks = 8
+            size = math.ceil(len(body) / chunks)
+            for start in range(0, len(body), size):
+                await asyncio.sleep(self.config.slow_body_seconds / chunks)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": body[start : start + size],
+                        "more_body": True,
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.body", "body": body})
+
+    # -- request handling -----------------------------------------------------
+
+    def handle(
+        self, path: str, query: Dict[str, List[str]], headers: Dict[str, str]
+    ) -> Tuple[int, bytes, Dict[str, str]]:
+        """(status, body, headers) for one request; also the synchronous test hook."""
+        if path == STATS_PATH:
+            return 200, json.dumps(dict(self.stats)).encode("utf-8"), {}
+        self.stats["requests"] += 1
+        if path not in (LISTINGS_PATH, ITEM_NAMES_PATH):
+            self.stats["not_found"] += 1
+            return 404, b'{"message":"not found"}', {}
+        retry_after = self._rate_limited(headers.get("authorization", ""))
+        if retry_after is not None:
+            self.stats["rate_limited"] += 1
+            return 429, b'{"message":"too many requests"}', {"Retry-After": str(retry_after)}
+        if self._rng.random() < self.config.error_rate:
+            status = self._rng.choice((500, 502, 503))
+            self.stats[f"errors_{status}"] += 1
+            return status, b'{"message":"upstream error"}', {}
+        if path == ITEM_NAMES_PATH:
+            limit = _int(query, "limit", 50)
+            return 200, json.dumps({"names": self._names[:limit]}).encode("utf-8"), {}
+        payload = self.listings_page(query)
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        if headers.get("if-none-match") == etag:
+            self.stats["not_modified"] += 1
+            return 304, b"", {"ETag": etag}
+        self.stats["listings_pages"] += 1
+        return 200, body, {"ETag": etag}
+
+    def _rate_limited(self, key: str) -> Optional[int]:
+        if self.config.rate_limit <= 0:
+            return None
+        now = self._clock()
+        start, count = self._windows.get(key, (now, 0))
+        if now - start >= self.config.rate_window_seconds:
+            start, count = now, 0
+        if count >= self.config.rate_limit:
+            return max(1, math.ceil(self.config.rate_window_seconds - (now - start)))
+        self._windows[key] = (start, count + 1)
+        return None
+
+    def _ordered(self, sort_by: str) -> List[Dict[str, Any]]:
+        key = sort_by if sort_by in _SORTS else "best_deal"
+        ordered = self._sorted.get(key)
+        if ordered is None:
+            ordered = self._sorted[key] = sorted(self._listings, key=_SORTS[key])
+        return ordered
+
+    def listings_page(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        limit = max(1, min(_int(query, "limit", 50), self.config.max_page_size))
+        offset = _int(query, "cursor", 0)
+        category = _int(query, "category", 0)
+        def_indexes = {int(v) for v in query.get("def_index", []) if v.isdigit()}
+        min_float = _float(query, "min_float", 0.0)
+        max_float = _float(query, "max_float", 1.0)
+        min_price = _float(query, "min_price", 0.0)
+        max_price = _float(query, "max_price", math.inf)
+        names = query.get("market_hash_name")
+        name = names[0] if names else None
+        matches = [
+            x
+            for x in self._ordered((query.get("sort_by") or ["best_deal"])[0])
+            if (not category or x["_category"] == category)
+            and (not def_indexes or x["item"]["def_index"] in def_indexes)
+            and min_float <= x["item"]["float_value"] <= max_float
+            and min_price <= x["price"] <= max_price
+            and (name is None or x["item"]["market_hash_name"] == name)
+        ]
+        page = matches[offset : offset + limit]
+        payload: Dict[str, Any] = {"data": [_public(x) for x in page]}
+        if offset + limit < len(matches):
+            payload["cursor"] = str(offset + limit)
+        return payload
+
+
+def _int(query: Dict[str, List[str]], key: str, default: int) -> int:
+    try:
+        return int(query[key][0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def _float(query: Dict[str, List[str]], key: str, default: float) -> float:
+    try:
+        return float(query[key][0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.cli.fake_upstream",
+        description="Serve a synthetic CSFloat API with injectable latency, errors and 429s.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--items", type=int, default=5000, help="Synthetic listings to serve")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--latency", default="fixed:0", help="fixed:S, uniform:A,B, exp:MEAN or lognormal:MU,SIGMA"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered 5xx")
+    parser.add_argument(
+        "--rate-limit", type=int, default=0, help="Requests per API key per window (0 = off)"
+    )
+    parser.add_argument("--rate-window", type=float, default=60.0, help="Rate window seconds")
+    parser.add_argument(
+        "--slow-body-rate", type=float, default=0.0, help="Fraction of bodies sent slowly"
+    )
+    parser.add_argument(
+        "--slow-body-seconds", type=float, default=2.0, help="Time to trickle a slow body"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    config = FakeUpstreamConfig(
+        items=args.items,
+        seed=args.seed,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_window_seconds=args.rate_window,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_seconds=args.slow_body_seconds,
+    )
+    uvicorn.run(FakeUpstream(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
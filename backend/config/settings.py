@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 from functools import lru_cache
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -12,16 +13,93 @@ class Settings(BaseSettings):
     CSFLOAT_API_KEY: str | None = None
     CSFLOAT_API_URL: str = "https://csfloat.com/api/v1/listings"
     CSFLOAT_ITEM_NAMES_URL: str = "https://csfloat.com/api/v1/item-names"
+    # Additional keys pooled with CSFLOAT_API_KEY (comma-separated or JSON list)
+    CSFLOAT_API_KEYS: str | None = None
+    # Per-key request cap over a rolling minute (0 = no local cap, rely on 429s)
+    CSFLOAT_KEY_MAX_REQUESTS_PER_MINUTE: int = 0
+    CSFLOAT_KEY_COOLDOWN_SECONDS: float = 60.0
+    CSFLOAT_KEY_AUTH_COOLDOWN_SECONDS: float = 900.0
+    # Upstream transport: live, record (append exchanges to the cassette) or
+    # replay (serve the cassette, no network); replay latency is the recorded
+    # latency times the scale (0 = instant)
+    CSFLOAT_TRANSPORT_MODE: str = "live"
+    CSFLOAT_CASSETTE_PATH: str = "data/csfloat_cassette.jsonl.gz"
+    CSFLOAT_REPLAY_LATENCY_SCALE: float = 0.0
 
     # HTTP client
     REQUEST_CONNECT_TIMEOUT: float = 3.05
     REQUEST_READ_TIMEOUT: float = 10.0
+    # Largest X-Request-Timeout / X-Request-Deadline budget a caller may ask for
+    REQUEST_DEADLINE_MAX_SECONDS: float = 120.0
 
     # Cache
     CACHE_TTL_SECONDS: int = 600
     CACHE_MAXSIZE: int = 128
+    # How long an expired listings page can still be revalidated upstream.
+    CACHE_VALIDATOR_TTL_SECONDS: int = 3600
     SINGLE_FLIGHT_WAIT_SECONDS: float = 3.0
 
+    # Local listings store
+    # Fed from every upstream listings response and answers /listings when asked
+    # to; unbounded in-memory, so off by default (ingestion still fills it).
+    LOCAL_STORE_ENABLED: bool = False
+    LOCAL_STORE_INITIAL_CAPACITY: int = 4096
+    LOCAL_STORE_TOMBSTONES: int = 65536
+    DEAL_MIN_PEERS: int = 3
+    DEAL_FLOAT_WEIGHT: float = 0.1
+    # Appends every observed price to disk on the request path; off by default
+    HISTORY_ENABLED: bool = False
+    HISTORY_PATH: str = "data/history"
+    # Default /listings source: "upstream", "local" or "auto" (local when it can answer)
+    LISTINGS_SOURCE: str = "upstream"
+
+    # Background ingestion into the local store (off by default)
+    INGEST_ENABLED: bool = False
+    # Scopes to walk: every category x def_index pair (comma-separated ints)
+    INGEST_CATEGORIES: str = "0"
+    INGEST_DEF_INDEXES: str | None = None
+    INGEST_INTERVAL_SECONDS: float = 60.0
+    INGEST_PAGE_LIMIT: int = 50
+    INGEST_MAX_PAGES_PER_TARGET: int = 200
+    INGEST_CHECKPOINT_PATH: str | None = "data/ingest_checkpoint.json"
+
+    # /export streaming: rows per encoded chunk (local) and page cap (upstream)
+    EXPORT_CHUNK_ROWS: int = 5000
+    EXPORT_MAX_PAGES: int = 2000
+
+    # Item-names catalog: in-memory autocomplete index, refreshed in the
+    # background and persisted so restarts serve suggestions immediately
+    ITEM_NAMES_CATALOG_ENABLED: bool = True
+    ITEM_NAMES_PATH: str = "data/item_names.json"
+    ITEM_NAMES_REFRESH_SECONDS: float = 21600.0
+    ITEM_NAMES_FETCH_LIMIT: int = 50000
+    # Minimum similarity for /listings?resolve_name=true to rewrite market_hash_name
+    ITEM_NAMES_FUZZY_MIN_SCORE: float = 0.5
+
+    # Static item metadata (def indexes, paint kits, collections): None serves
+    # the bundled catalog; max-age is the Cache-Control lifetime of /metadata
+    METADATA_PATH: str | None = None
+    METADATA_MAX_AGE_SECONDS: int = 86400
+
+    # Response compression: preferred encodings (comma-separated, best first),
+    # smallest body worth compressing, and cached serialized listings bodies
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_BODY_CACHE_SIZE: int = 256
+
+    # Watchlists: saved searches evaluated centrally, pushed over SSE/webhooks
+    WATCHLISTS_ENABLED: bool = False
+    WATCHLIST_PATH: str = "data/watchlists.json"
+    WATCHLIST_INTERVAL_SECONDS: float = 15.0
+    WATCHLIST_SSE_HEARTBEAT_SECONDS: float = 15.0
+    # Webhooks may only target these hosts (comma-separated)
+    WATCHLIST_WEBHOOK_HOSTS: str = "localhost,127.0.0.1"
+    WATCHLIST_WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    # Webhooks are POSTed off the evaluator thread: concurrent sends + backlog
+    WATCHLIST_WEBHOOK_WORKERS: int = 4
+    WATCHLIST_WEBHOOK_QUEUE: int = 256
+
     # OpenAI
     OPENAI_API_KEY: str | None = None
     OPENAI_BASE_URL: str | None = None
@@ -40,6 +118,37 @@ class Settings(BaseSettings):
     HTTPX_MAX_CONNECTIONS: int = 50
     HTTPX_POOL_TIMEOUT: float = 3.0
 
+    # Upstream priority scheduling (interactive > prefetch > bulk)
+    # 0 = use HTTPX_MAX_CONNECTIONS
+    UPSTREAM_MAX_CONCURRENCY: int = 0
+    # Max fraction of upstream slots background classes may hold at once
+    UPSTREAM_PREFETCH_MAX_SHARE: float = 0.5
+    UPSTREAM_BULK_MAX_SHARE: float = 0.25
+    # Relative share of spare slots between background classes
+    UPSTREAM_PREFETCH_WEIGHT: int = 3
+    UPSTREAM_BULK_WEIGHT: int = 1
+
+    # Admission control (per-route concurrency + bounded wait queue)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+    # Queue pressure (0..1) at which low-priority routes (/analyze) are shed
+    ADMISSION_SHED_THRESHOLD: float = 0.5
+    ADMISSION_LISTINGS_MAX_CONCURRENT: int = 32
+    ADMISSION_LISTINGS_MAX_QUEUE: int = 64
+    ADMISSION_ITEM_NAMES_MAX_CONCURRENT: int = 8
+    ADMISSION_ITEM_NAMES_MAX_QUEUE: int = 16
+    ADMISSION_ANALYZE_MAX_CONCURRENT: int = 4
+    ADMISSION_ANALYZE_MAX_QUEUE: int = 4
+
+    # Bulkheads: dedicated executors per subsystem (running workers + waiting queue)
+    BULKHEAD_CSFLOAT_WORKERS: int = 16
+    BULKHEAD_CSFLOAT_QUEUE: int = 32
+    BULKHEAD_LLM_WORKERS: int = 4
+    BULKHEAD_LLM_QUEUE: int = 8
+    # 0 = os.cpu_count()
+    BULKHEAD_CPU_WORKERS: int = 0
+    BULKHEAD_CPU_QUEUE: int = 64
+
     # CORS
     CORS_ALLOW_ORIGINS: List[str] = ["*"]
     CORS_ALLOW_CREDENTIALS: bool = True
@@ -52,6 +161,43 @@ class Settings(BaseSettings):
     def requests_timeout(self) -> Tuple[float, float]:
         return (float(self.REQUEST_CONNECT_TIMEOUT), float(self.REQUEST_READ_TIMEOUT))
 
+    @property
+    def csfloat_api_keys(self) -> List[str]:
+        """Pooled API keys from CSFLOAT_API_KEYS (comma-separated or JSON list)."""
+        raw = (self.CSFLOAT_API_KEYS or "").strip()
+        if raw.startswith("["):
+            try:
+                return [str(k).strip() for k in json.loads(raw) if str(k).strip()]
+            except ValueError:
+                pass
+        return [k.strip() for k in raw.split(",") if k.strip()]
+
+    @property
+    def watchlist_webhook_hosts(self) -> List[str]:
+        return [h.strip().lower() for h in self.WATCHLIST_WEBHOOK_HOSTS.split(",") if h.strip()]
+
+    @property
+    def compression_encodings(self) -> List[str]:
+        return [e.strip().lower() for e in self.COMPRESSION_ENCODINGS.split(",") if e.strip()]
+
+    @property
+    def ingest_targets(self) -> List[Dict[str, Any]]:
+        """Ingestion scopes from INGEST_CATEGORIES x INGEST_DEF_INDEXES."""
+
+        def ints(raw: str | None) -> List[int]:
+            return [int(v) for v in (raw or "").split(",") if v.strip().lstrip("-").isdigit()]
+
+        categories = ints(self.INGEST_CATEGORIES) or [0]
+        def_indexes = ints(self.INGEST_DEF_INDEXES)
+        targets: List[Dict[str, Any]] = []
+        for category in categories:
+            base: Dict[str, Any] = {"category": category} if category else {}
+            if not def_indexes:
+                targets.append(base)
+            for def_index in def_indexes:
+                targets.append(dict(base, def_index=[def_index]))
+        return targets
+
     @field_validator("CORS_ALLOW_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: str | List[str]) -> List[str]:  # type: ignore[override]
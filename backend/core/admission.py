@@ -0,0 +1,224 @@
+"""
+Admission control and load shedding for backend routes.
+
+Each guarded route prefix gets a bounded number of concurrent requests and a
+bounded wait queue. When the queue is full, or a request waits longer than the
+route's max wait, the request is rejected right away with 503 + Retry-After
+instead of piling up in the threadpool. Sheddable (low-priority) routes are
+also rejected once overall queue pressure crosses the shed threshold, so they
+give way before the interactive routes start queueing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+from ..config.settings import get_settings
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    prefix: str
+    max_concurrent: int
+    max_queue: int
+    max_wait_seconds: float
+    sheddable: bool = False
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _RouteGate:
+    def __init__(self, policy: RoutePolicy) -> None:
+        self.policy = policy
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected_full = 0
+        self.rejected_timeout = 0
+        self.shed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": len(self.waiters),
+            "max_concurrent": self.policy.max_concurrent,
+            "max_queue": self.policy.max_queue,
+            "sheddable": self.policy.sheddable,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_full,
+            "rejected_wait_timeout": self.rejected_timeout,
+            "shed": self.shed,
+        }
+
+
+class AdmissionController:
+    """Per-route bounded concurrency + bounded queue. Runs on the event loop."""
+
+    def __init__(self, policies: List[RoutePolicy], shed_threshold: float = 0.5) -> None:
+        # Longest prefix first so nested prefixes win.
+        self._gates = [
+            _RouteGate(p) for p in sorted(policies, key=lambda p: len(p.prefix), reverse=True)
+        ]
+        self._shed_threshold = float(shed_threshold)
+
+    def match(self, path: str) -> Optional[_RouteGate]:
+        for gate in self._gates:
+            prefix = gate.policy.prefix
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return gate
+        return None
+
+    def pressure(self) -> float:
+        """Fraction of total queue capacity currently occupied (0..1)."""
+        capacity = sum(g.policy.max_queue for g in self._gates)
+        if capacity <= 0:
+            return 1.0 if any(g.active >= g.policy.max_concurrent for g in self._gates) else 0.0
+        return sum(len(g.waiters) for g in self._gates) / capacity
+
+    @staticmethod
+    def _retry_after(gate: _RouteGate) -> int:
+        return max(1, int(math.ceil(gate.policy.max_wait_seconds)))
+
+    async def acquire(self, gate: _RouteGate) -> None:
+        policy = gate.policy
+        if policy.sheddable and self.pressure() >= self._shed_threshold:
+            gate.shed += 1
+            raise AdmissionRejected(
+                "Server is under heavy load; low-priority requests are temporarily shed.",
+                self._retry_after(gate),
+            )
+        if gate.active < policy.max_concurrent and not gate.waiters:
+            gate.active += 1
+            gate.admitted += 1
+            return
+        if len(gate.waiters) >= policy.max_queue:
+            gate.rejected_full += 1
+            raise AdmissionRejected(
+                "Server is at capacity for this route; please retry shortly.",
+                self._retry_after(gate),
+            )
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        gate.waiters.append(fut)
+        try:
+            await asyncio.wait({fut}, timeout=policy.max_wait_seconds)
+        except asyncio.CancelledError:
+            # Caller went away (e.g. deadline passed): give back a handed-over
+            # slot, or leave the queue.
+            if fut.done() and not fut.cancelled():
+                self.release(gate)
+            else:
+                fut.cancel()
+                if fut in gate.waiters:
+                    gate.waiters.remove(fut)
+            raise
+        if not fut.done():
+            fut.cancel()
+            try:
+                gate.waiters.remove(fut)
+            except ValueError:
+                pass
+            gate.rejected_timeout += 1
+            raise AdmissionRejected(
+                "Request waited too long for capacity; please retry shortly.",
+                self._retry_after(gate),
+            )
+        # Slot was handed over by release(); active already accounts for it.
+        gate.admitted += 1
+
+    def release(self, gate: _RouteGate) -> None:
+        while gate.waiters:
+            fut = gate.waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        gate.active = max(0, gate.active - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pressure": round(self.pressure(), 4),
+            "shed_threshold": self._shed_threshold,
+            "routes": {g.policy.prefix: g.stats() for g in self._gates},
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying an AdmissionController to HTTP requests."""
+
+    def __init__(self, app: Any, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        gate = self.controller.match(scope.get("path", ""))
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire(gate)
+        except AdmissionRejected as e:
+            await _send_overloaded(send, e)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(gate)
+
+
+async def _send_overloaded(send: Any, exc: AdmissionRejected) -> None:
+    body = json.dumps({"error": "overloaded", "message": exc.reason}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(exc.retry_after).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    settings = get_settings()
+    wait = float(settings.ADMISSION_MAX_WAIT_SECONDS)
+    policies = [
+        RoutePolicy(
+            "/listings",
+            settings.ADMISSION_LISTINGS_MAX_CONCURRENT,
+            settings.ADMISSION_LISTINGS_MAX_QUEUE,
+            wait,
+        ),
+        RoutePolicy(
+            "/item-names",
+            settings.ADMISSION_ITEM_NAMES_MAX_CONCURRENT,
+            settings.ADMISSION_ITEM_NAMES_MAX_QUEUE,
+            wait,
+        ),
+        RoutePolicy(
+            "/analyze",
+            settings.ADMISSION_ANALYZE_MAX_CONCURRENT,
+            settings.ADMISSION_ANALYZE_MAX_QUEUE,
+            wait,
+            sheddable=True,
+        ),
+    ]
+    return AdmissionController(policies, shed_threshold=settings.ADMISSION_SHED_THRESHOLD)
@@ -0,0 +1,154 @@
+"""
+Bulkhead executors that isolate blocking work per subsystem.
+
+Sync routes share Starlette's single threadpool, so a burst of slow LLM calls
+can hold every thread and stall listing reads. Each subsystem instead runs its
+blocking calls on its own bounded executor:
+
+- ``csfloat``: upstream CSFloat requests
+- ``llm``: OpenAI / LM Studio calls
+- ``cpu``: CPU-bound aggregation over listings
+
+A bulkhead accepts at most ``max_workers`` running plus ``max_queue`` waiting
+tasks and rejects the rest with CapacityExceededError, so saturation in one
+subsystem is surfaced immediately instead of leaking into the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from ..config.settings import get_settings
+from .exceptions import CapacityExceededError
+
+T = TypeVar("T")
+
+
+class Bulkhead:
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"bulkhead-{name}"
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._peak = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._cancelled = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Schedule ``fn`` on this bulkhead, carrying over the caller's contextvars."""
+        with self._lock:
+            if self._active + self._queued >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise CapacityExceededError(
+                    f"The {self.name} subsystem is saturated; please retry shortly."
+                )
+            self._queued += 1
+        ctx = contextvars.copy_context()
+
+        def task() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._peak = max(self._peak, self._active)
+            ok = False
+            try:
+                result = ctx.run(fn, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        # Cancelled before it started (e.g. the caller's deadline passed):
+        # the task body never ran, so release its queue slot here.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await ``fn`` running on this bulkhead from async code.
+
+        Cancelling the awaiting task drops the job if it has not started yet.
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            capacity = self.max_workers + self.max_queue
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_active": self._peak,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+                "saturation": round((self._active + self._queued) / capacity, 4),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_registry_lock = threading.Lock()
+_registry: Dict[str, Bulkhead] = {}
+
+
+def _sizes(name: str) -> tuple[int, int]:
+    settings = get_settings()
+    if name == "csfloat":
+        return settings.BULKHEAD_CSFLOAT_WORKERS, settings.BULKHEAD_CSFLOAT_QUEUE
+    if name == "llm":
+        return settings.BULKHEAD_LLM_WORKERS, settings.BULKHEAD_LLM_QUEUE
+    if name == "cpu":
+        return settings.BULKHEAD_CPU_WORKERS or (os.cpu_count() or 2), settings.BULKHEAD_CPU_QUEUE
+    raise KeyError(f"Unknown bulkhead: {name}")
+
+
+def get_bulkhead(name: str) -> Bulkhead:
+    """Return the shared bulkhead for ``name`` ("csfloat", "llm" or "cpu")."""
+    with _registry_lock:
+        bulkhead = _registry.get(name)
+        if bulkhead is None:
+            workers, queue = _sizes(name)
+            bulkhead = Bulkhead(name, workers, queue)
+            _registry[name] = bulkhead
+        return bulkhead
+
+
+def bulkhead_stats() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        bulkheads = dict(_registry)
+    return {name: b.stats() for name, b in sorted(bulkheads.items())}
+
+
+def shutdown_bulkheads() -> None:
+    with _registry_lock:
+        bulkheads = list(_registry.values())
+        _registry.clear()
+    for b in bulkheads:
+        b.shutdown()
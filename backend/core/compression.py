@@ -0,0 +1,285 @@
+"""
+Negotiated response compression (zstd, brotli, gzip).
+
+Two paths share one codec table:
+
+- ``BodyCache`` keeps pre-serialized bodies by validator and compresses each
+  one at most once per encoding, so repeated hits of a cached listings page
+  cost a dictionary lookup rather than a serialization plus compression.
+- ``CompressionMiddleware`` compresses everything else: whole bodies above
+  ``min_bytes`` in one shot, and streaming bodies (NDJSON, CSV, SSE, ...)
+  chunk by chunk with a sync flush after each chunk so streaming latency is
+  unchanged.
+
+zstd and brotli need the optional ``zstandard`` / ``brotli`` packages; an
+encoding whose library is missing is never negotiated.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard
+
+    _HAS_ZSTD = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_ZSTD = False
+
+try:
+    import brotli
+
+    _HAS_BROTLI = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_BROTLI = False
+
+from ..config.settings import get_settings
+
+ZSTD = "zstd"
+BROTLI = "br"
+GZIP = "gzip"
+
+_LEVELS = {ZSTD: 3, BROTLI: 5, GZIP: 6}
+# Already-compressed payloads gain nothing from another pass.
+_SKIP_MEDIA_PREFIXES = ("image/", "video/", "audio/", "application/vnd.apache.parquet")
+
+
+def available_encodings(preference: Sequence[str] = (ZSTD, BROTLI, GZIP)) -> List[str]:
+    installed = {ZSTD: _HAS_ZSTD, BROTLI: _HAS_BROTLI, GZIP: True}
+    return [e for e in preference if installed.get(e)]
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], preference: Sequence[str] = (ZSTD, BROTLI, GZIP)
+) -> Optional[str]:
+    """Server-preferred encoding the client accepts with q > 0 (None = identity)."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[fields[0].lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available_encodings(preference):
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=_LEVELS[ZSTD]).compress(data)
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=_LEVELS[BROTLI])
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=_LEVELS[GZIP], mtime=0)
+    raise ValueError(f"Unsupported content encoding {encoding!r}")
+
+
+class StreamCompressor:
+    """Incremental compressor; every ``chunk()`` output is decodable on its own arrival."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == ZSTD:
+            self._zstd = zstandard.ZstdCompressor(level=_LEVELS[ZSTD]).compressobj()
+        elif encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=_LEVELS[BROTLI])
+        elif encoding == GZIP:
+            self._gzip = zlib.compressobj(_LEVELS[GZIP], zlib.DEFLATED, 31)
+        else:
+            raise ValueError(f"Unsupported content encoding {encoding!r}")
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == ZSTD:
+            return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == ZSTD:
+            return self._zstd.flush()
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._gzip.flush()
+
+
+class _CachedBody:
+    __slots__ = ("media_type", "identity", "encoded")
+
+    def __init__(self, media_type: str, identity: bytes) -> None:
+        self.media_type = media_type
+        self.identity = identity
+        self.encoded: Dict[str, bytes] = {}
+
+
+class BodyCache:
+    """LRU of serialized response bodies and their compressed forms, by validator."""
+
+    def __init__(self, maxsize: int = 256, min_bytes: int = 1024) -> None:
+        self._maxsize = max(1, int(maxsize))
+        self._min_bytes = int(min_bytes)
+        self._entries: "OrderedDict[str, _CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "compressions": 0, "bytes_saved": 0}
+
+    def get(self, key: str) -> Optional[_CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, media_type: str, body: bytes) -> _CachedBody:
+        entry = _CachedBody(media_type, body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def encode(self, entry: _CachedBody, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """(body, content-encoding) for ``entry``; small bodies stay identity."""
+        if encoding is None or len(entry.identity) < self._min_bytes:
+            return entry.identity, None
+        data = entry.encoded.get(encoding)
+        if data is None:
+            data = compress(entry.identity, encoding)
+            with self._lock:
+                entry.encoded[encoding] = data
+                self._stats["compressions"] += 1
+        with self._lock:
+            self._stats["bytes_saved"] += len(entry.identity) - len(data)
+        return data, encoding
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, size=len(self._entries), encodings=available_encodings())
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower():
+        return headers
+    rest = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    return rest + [(b"vary", vary + b", Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses the endpoint left uncompressed."""
+
+    def __init__(
+        self, app: Any, min_bytes: int = 1024, preference: Sequence[str] = (ZSTD, BROTLI, GZIP)
+    ) -> None:
+        self.app = app
+        self._min_bytes = int(min_bytes)
+        self._preference = tuple(preference)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        raw = _header(scope.get("headers") or [], b"accept-encoding")
+        encoding = negotiate_encoding(raw.decode("latin-1") if raw else None, self._preference)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Dict[str, Any]] = None
+        streamer: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal start, streamer, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or [])
+                media = (_header(headers, b"content-type") or b"").decode("latin-1")
+                passthrough = (
+                    _header(headers, b"content-encoding") is not None
+                    or message.get("status", 200) in (204, 304)
+                    or media.startswith(_SKIP_MEDIA_PREFIXES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more = bool(message.get("more_body", False))
+            if start is not None:
+                headers = [
+                    (k, v) for k, v in start.get("headers") or [] if k.lower() != b"content-length"
+                ]
+                if not more:
+                    # Whole body in one message: compress only if it pays off.
+                    if len(body) >= self._min_bytes:
+                        body = compress(body, encoding)
+                        headers = _add_vary(headers) + [
+                            (b"content-encoding", encoding.encode("latin-1"))
+                        ]
+                    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                    await send(dict(start, headers=headers))
+                    start = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                streamer = StreamCompressor(encoding)
+                headers = _add_vary(headers) + [(b"content-encoding", encoding.encode("latin-1"))]
+                await send(dict(start, headers=headers))
+                start = None
+            if streamer is None:
+                await send(message)
+                return
+            data = streamer.chunk(body) if body else b""
+            if not more:
+                data += streamer.finish()
+            if data or not more:
+                await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@lru_cache(maxsize=1)
+def get_body_cache() -> BodyCache:
+    settings = get_settings()
+    return BodyCache(settings.COMPRESSION_BODY_CACHE_SIZE, settings.COMPRESSION_MIN_BYTES)
+
+
+def negotiate_request_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """``negotiate_encoding`` with the configured preference (None when disabled)."""
+    settings = get_settings()
+    if not settings.COMPRESSION_ENABLED:
+        return None
+    return negotiate_encoding(accept_encoding, settings.compression_encodings)
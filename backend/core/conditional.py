@@ -0,0 +1,40 @@
+"""
+Entity tags and conditional-request helpers.
+
+A digest is a SHA-1 of the canonical JSON of a result; the ETag of one
+representation of that result adds the media type, so JSON and compact
+encodings of the same data never share a validator.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def content_digest(value: Any) -> str:
+    """Stable SHA-1 of ``value``'s canonical JSON."""
+    blob = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def strong_etag(digest: str, media: str) -> str:
+    suffix = hashlib.sha1(media.encode("utf-8")).hexdigest()[:8]
+    return f'"{digest}-{suffix}"'
+
+
+def if_none_match(header: Optional[str], etag: str) -> bool:
+    """True if an ``If-None-Match`` header matches ``etag`` (weak comparison, RFC 9110)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
@@ -0,0 +1,191 @@
+"""
+Request deadlines propagated from the caller.
+
+The frontend sends ``X-Request-Timeout`` (the budget in seconds, relative to
+when the request arrives, so clock skew between hosts does not matter) with
+every request; ``X-Request-Deadline`` (absolute Unix epoch seconds) is still
+accepted. Either is capped at ``REQUEST_DEADLINE_MAX_SECONDS``.
+DeadlineMiddleware converts it to a monotonic expiry stored in a context
+variable, answers 504 if it passes before the response starts, and cancels the
+route so queued work is dropped. Once the response has started the deadline is
+lifted, so streamed bodies (exports, SSE) are never cut off mid-way. Code
+further down (single-flight waits, scheduler slots,
+upstream httpx timeouts) reads the remaining budget through ``remaining()`` /
+``bounded()`` and fails fast with DeadlineExceededError instead of working on
+a request nobody is waiting for. Bulkheads copy contextvars, so the deadline
+follows the call into worker threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from .exceptions import DeadlineExceededError
+
+DEADLINE_HEADER = "X-Request-Deadline"
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+class _Deadline:
+    """Mutable holder so lifting the deadline is seen by every copied context."""
+
+    __slots__ = ("expiry",)
+
+    def __init__(self, expiry: Optional[float]) -> None:
+        self.expiry = expiry
+
+
+_deadline: ContextVar[Optional[_Deadline]] = ContextVar("request_deadline", default=None)
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_deadline_header(value: Optional[str]) -> Optional[float]:
+    """Convert an epoch-seconds header value into a monotonic expiry."""
+    epoch = _seconds(value)
+    if epoch is None:
+        return None
+    return time.monotonic() + (epoch - time.time())
+
+
+def parse_timeout_header(value: Optional[str]) -> Optional[float]:
+    """Convert a relative budget in seconds into a monotonic expiry."""
+    budget = _seconds(value)
+    if budget is None:
+        return None
+    return time.monotonic() + budget
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when no deadline applies."""
+    deadline = _deadline.get()
+    if deadline is None or deadline.expiry is None:
+        return None
+    return deadline.expiry - time.monotonic()
+
+
+def bounded(timeout: Optional[float]) -> Optional[float]:
+    """Clamp ``timeout`` to the remaining deadline budget (never negative)."""
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(0.0, left)
+    return left if timeout is None else min(float(timeout), left)
+
+
+def check_deadline(stage: str) -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError(f"Request deadline exceeded before {stage}.")
+
+
+@contextmanager
+def deadline_scope(expiry: Optional[float]) -> Iterator[_Deadline]:
+    """Run a block under a monotonic ``expiry`` (None clears the deadline)."""
+    deadline = _Deadline(expiry)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+class DeadlineMiddleware:
+    """ASGI middleware honouring the X-Request-Timeout / X-Request-Deadline headers.
+
+    ``max_seconds`` caps the budget a caller may ask for (None = uncapped).
+    """
+
+    def __init__(self, app: Any, max_seconds: Optional[float] = None) -> None:
+        self.app = app
+        self._max_seconds = max_seconds
+        self._timeout_header = TIMEOUT_HEADER.lower().encode("latin-1")
+        self._deadline_header = DEADLINE_HEADER.lower().encode("latin-1")
+
+    def _expiry(self, scope: Dict[str, Any]) -> Optional[float]:
+        headers = dict(scope.get("headers") or [])
+        expiry = parse_timeout_header(_decode(headers.get(self._timeout_header)))
+        if expiry is None:
+            expiry = parse_deadline_header(_decode(headers.get(self._deadline_header)))
+        if expiry is not None and self._max_seconds is not None:
+            expiry = min(expiry, time.monotonic() + float(self._max_seconds))
+        return expiry
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        expiry = self._expiry(scope)
+        if expiry is None:
+            await self.app(scope, receive, send)
+            return
+
+        started = asyncio.Event()
+
+        with deadline_scope(expiry) as deadline:
+
+            async def send_wrapper(message: Dict[str, Any]) -> None:
+                if message.get("type") == "http.response.start":
+                    # The caller is getting an answer: stop the clock.
+                    deadline.expiry = None
+                    started.set()
+                await send(message)
+
+            budget = expiry - time.monotonic()
+            if budget <= 0:
+                await _send_deadline_exceeded(send)
+                return
+            task = asyncio.ensure_future(self.app(scope, receive, send_wrapper))
+            waiter = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait(
+                    {task, waiter}, timeout=budget, return_when=asyncio.FIRST_COMPLETED
+                )
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                waiter.cancel()
+            if task.done() or started.is_set():
+                await task
+                return
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            if not started.is_set():
+                await _send_deadline_exceeded(send)
+
+
+def _decode(value: Optional[bytes]) -> Optional[str]:
+    return value.decode("latin-1") if value is not None else None
+
+
+async def _send_deadline_exceeded(send: Any) -> None:
+    body = json.dumps(
+        {"error": "deadline_exceeded", "message": "Request deadline exceeded."}
+    ).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -21,3 +21,11 @@ class UpstreamServiceError(BackendError):
 
 class AuthorizationError(BackendError):
     """Raised when authorization fails."""
+
+
+class CapacityExceededError(BackendError):
+    """Raised when a bounded resource (bulkhead, queue) is saturated."""
+
+
+class DeadlineExceededError(BackendError):
+    """Raised when the caller's request deadline has passed."""
@@ -0,0 +1,136 @@
+"""
+Compact wire formats for listing payloads, chosen by ``Accept`` negotiation.
+
+JSON stays the default. Clients may ask for:
+
+- ``application/msgpack``: a columnar MessagePack document
+  ``{"v": 1, "n", "meta", "dict": {field: [labels]}, "cols": {field: [values]}}``
+  where ``name``, ``wear``, ``rarity`` (and ``market_hash_name``) columns hold
+  indexes into ``dict``.
+- ``application/vnd.apache.arrow.stream``: one Arrow IPC record batch with
+  the same columns dictionary-encoded; ``meta`` travels as JSON in the schema
+  metadata.
+
+Only the projected fields (``fields=``) are encoded.
+
+Both are optional dependencies; a format whose library is missing is simply
+never negotiated.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+
+    _HAS_MSGPACK = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_MSGPACK = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+
+    _HAS_PYARROW = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_PYARROW = False
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {"application/x-msgpack": MSGPACK, "application/vnd.msgpack": MSGPACK}
+ITEM_FIELDS: Tuple[str, ...] = ("id", "name", "price", "wear", "rarity", "float_value")
+DICTIONARY_FIELDS: Tuple[str, ...] = ("name", "wear", "rarity", "market_hash_name")
+_STRING_FIELDS = ("id", "inspect_link")
+_INT_FIELDS = ("price", "def_index", "paint_index", "paint_seed")
+
+
+def available_formats() -> List[str]:
+    formats = [JSON]
+    if _HAS_MSGPACK:
+        formats.append(MSGPACK)
+    if _HAS_PYARROW:
+        formats.append(ARROW)
+    return formats
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Best available media type for an Accept header (JSON unless asked otherwise)."""
+    if not accept:
+        return JSON
+    available = available_formats()
+    best, best_q = JSON, -1.0
+    for position, part in enumerate(accept.split(",")):
+        fields = [f.strip() for f in part.split(";")]
+        media = _ALIASES.get(fields[0].lower(), fields[0].lower())
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media in ("*/*", "application/*"):
+            media = JSON
+        # Earlier entries win ties, as listed by the client.
+        if media in available and q > 0 and q > best_q:
+            best, best_q = media, q
+    return best
+
+
+def _dictionary_encode(values: List[Any]) -> Tuple[List[Any], List[Optional[int]]]:
+    labels: List[Any] = []
+    index: Dict[Any, int] = {}
+    codes: List[Optional[int]] = []
+    for value in values:
+        if value is None:
+            codes.append(None)
+            continue
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(labels)
+            labels.append(value)
+        codes.append(code)
+    return labels, codes
+
+
+def _arrow_array(field: str, values: List[Any]) -> Any:
+    if field in DICTIONARY_FIELDS:
+        return pa.array(values, pa.string()).dictionary_encode()
+    if field in _STRING_FIELDS:
+        return pa.array(values, pa.string())
+    if field in _INT_FIELDS:
+        return pa.array(values, pa.int64())
+    if field == "float_value":
+        return pa.array(values, pa.float64())
+    return pa.array(values)
+
+
+def encode_items(
+    items: List[Dict[str, Any]],
+    meta: Optional[Dict[str, Any]],
+    media: str,
+    fields: Tuple[str, ...] = ITEM_FIELDS,
+) -> bytes:
+    """Encode API items (``ItemDTO`` dicts, projected to ``fields``) plus meta as ``media``."""
+    columns = {field: [item.get(field) for item in items] for field in fields}
+    if media == MSGPACK:
+        dictionaries: Dict[str, List[Any]] = {}
+        for field in DICTIONARY_FIELDS:
+            if field in columns:
+                dictionaries[field], columns[field] = _dictionary_encode(columns[field])
+        doc = {"v": 1, "n": len(items), "meta": meta, "dict": dictionaries, "cols": columns}
+        return msgpack.packb(doc, use_bin_type=True)
+    if media == ARROW:
+        batch = pa.RecordBatch.from_arrays(
+            [_arrow_array(f, columns[f]) for f in fields], names=list(fields)
+        )
+        schema = batch.schema.with_metadata({"meta": json.dumps(meta or {})})
+        sink = pa.BufferOutputStream()
+        with pa_ipc.new_stream(sink, schema) as writer:
+            writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+        return sink.getvalue().to_pybytes()
+    raise ValueError(f"Unsupported wire format {media!r}")
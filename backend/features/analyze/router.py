@@ -4,7 +4,13 @@ from fastapi import APIRouter, Body, HTTPException
 from openai import AuthenticationError
 from pydantic import BaseModel
 
-from ...core.exceptions import BackendError, UpstreamServiceError, ValidationError
+from ...core.bulkhead import get_bulkhead
+from ...core.exceptions import (
+    BackendError,
+    CapacityExceededError,
+    UpstreamServiceError,
+    ValidationError,
+)
 from ...models.item_dto import ItemDTO
 from ...services.llm.client import LLMClient
 
@@ -24,10 +30,14 @@ class AnalyzeResponse(BaseModel):
 
 
 @router.post("/", response_model=AnalyzeResponse)
-def analyze_listings(payload: AnalyzeRequest = Body(...)) -> AnalyzeResponse:
+async def analyze_listings(payload: AnalyzeRequest = Body(...)) -> AnalyzeResponse:
     try:
-        result = llm_client.ask_about_listings(
-            payload.question, payload.items, payload.model, payload.max_items
+        result = await get_bulkhead("llm").run(
+            llm_client.ask_about_listings,
+            payload.question,
+            payload.items,
+            payload.model,
+            payload.max_items,
         )
         return AnalyzeResponse(result=result)
     except AuthenticationError:
@@ -37,6 +47,8 @@ def analyze_listings(payload: AnalyzeRequest = Body(...)) -> AnalyzeResponse:
                 "Authentication with the model provider failed. Verify your API key and base URL."
             ),
         )
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
     except UpstreamServiceError as e:
         raise HTTPException(status_code=503, detail=f"Upstream model service unavailable: {str(e)}")
     except ValidationError as e:
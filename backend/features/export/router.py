@@ -0,0 +1,114 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ...config.settings import get_settings
+from ...core.bulkhead import get_bulkhead
+from ...core.exceptions import (
+    BackendError,
+    CapacityExceededError,
+    DeadlineExceededError,
+    UpstreamServiceError,
+    ValidationError,
+)
+from ...services.csfloat.client import CSFloatClient
+from ...services.csfloat.scheduler import Priority
+from ...services.market.export import (
+    EXPORT_FORMATS,
+    check_format,
+    encode,
+    local_chunks,
+    upstream_chunks,
+)
+from ...services.market.store import get_listings_store
+
+router = APIRouter()
+csfloat_client = CSFloatClient()
+
+
+@router.get("/")
+async def export_listings(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet|arrow)$"),
+    source: str = Query("local", pattern="^(local|upstream)$"),
+    sort_by: str = Query("lowest_price"),
+    category: int = Query(0),
+    min_float: float = Query(0.0),
+    max_float: float = Query(1.0),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    def_index: Optional[List[int]] = Query(None),
+    rarity: Optional[int] = Query(None),
+    paint_seed: Optional[List[int]] = Query(None),
+    paint_index: Optional[int] = Query(None),
+    market_hash_name: Optional[str] = Query(None),
+    item_name: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+) -> StreamingResponse:
+    """Stream a query's full result set as CSV, NDJSON, Parquet or Arrow IPC.
+
+    ``source=local`` exports every matching listing in the local store;
+    ``source=upstream`` follows the upstream cursor chain at bulk priority
+    (up to ``EXPORT_MAX_PAGES`` pages), filtering each page locally. Rows are encoded chunk by chunk, so
+    memory stays flat regardless of export size. The first upstream page is
+    fetched before the response starts, so an upstream failure is reported
+    with an error status instead of an empty attachment.
+    """
+    params = {
+        "sort_by": sort_by,
+        "category": category,
+        "min_float": min_float,
+        "max_float": max_float,
+        "min_price": min_price,
+        "max_price": max_price,
+        "def_index": def_index,
+        "rarity": rarity,
+        "paint_seed": paint_seed,
+        "paint_index": paint_index,
+        "market_hash_name": market_hash_name,
+        "item_name": item_name,
+        "type": type,
+    }
+    settings = get_settings()
+    try:
+        check_format(format)
+        if source == "local":
+            store = get_listings_store()
+            # Row order is storage order; sort_by only shapes upstream pages.
+            local_params = {k: v for k, v in params.items() if k != "sort_by"}
+            if not store.supports(local_params):
+                raise ValidationError("This filter cannot be answered from the local store.")
+            chunks = local_chunks(store, local_params, settings.EXPORT_CHUNK_ROWS)
+        else:
+            params["limit"] = 50
+            csfloat = get_bulkhead("csfloat")
+            first_page = await csfloat.run(
+                csfloat_client.fetch_listings_page, dict(params, cursor=None), Priority.BULK
+            )
+            chunks = upstream_chunks(
+                csfloat_client,
+                params,
+                settings.EXPORT_MAX_PAGES,
+                first_page=first_page,
+                bulkhead=csfloat,
+            )
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded: {str(e)}")
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except (UpstreamServiceError, RuntimeError) as e:
+        raise HTTPException(
+            status_code=503, detail=f"Upstream listings service unavailable: {str(e)}"
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        encode(format, chunks),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="listings.{extension}"'},
+    )
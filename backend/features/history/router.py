@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from ...core.bulkhead import get_bulkhead
+from ...core.exceptions import BackendError, CapacityExceededError, ValidationError
+from ...services.market.history import get_price_history
+
+
+class HistoryPoint(BaseModel):
+    ts: int
+    min: int
+    median: float
+    max: int
+    count: int
+
+
+class HistoryResponse(BaseModel):
+    name: str
+    wear: Optional[str] = None
+    observations: int
+    points: List[HistoryPoint]
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=HistoryResponse)
+async def get_history(
+    name: str = Query(..., min_length=1),
+    wear: Optional[str] = Query(None),
+    points: int = Query(100, ge=1, le=2000),
+    start: Optional[int] = Query(None, description="Unix seconds"),
+    end: Optional[int] = Query(None, description="Unix seconds"),
+) -> HistoryResponse:
+    """Observed listing prices (cents) for one item name/wear, downsampled server-side."""
+    try:
+        result = await get_bulkhead("cpu").run(
+            get_price_history().query, name, wear or "", points=points, start=start, end=end
+        )
+        return HistoryResponse(**result)
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
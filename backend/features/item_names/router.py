@@ -1,23 +1,54 @@
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from ...core.exceptions import BackendError, UpstreamServiceError, ValidationError
+from ...config.settings import get_settings
+from ...core.bulkhead import get_bulkhead
+from ...core.exceptions import (
+    BackendError,
+    CapacityExceededError,
+    DeadlineExceededError,
+    UpstreamServiceError,
+    ValidationError,
+)
 from ...services.csfloat.client import CSFloatClient
+from ...services.item_names.catalog import get_item_names_catalog
 
 
 class ItemNamesResponse(BaseModel):
     names: list[str]
 
 
+class ItemNameSuggestions(BaseModel):
+    query: str
+    names: list[str]
+
+
+class ItemNameMatch(BaseModel):
+    name: str
+    score: float
+
+
+class ItemNameMatches(BaseModel):
+    query: str
+    matches: list[ItemNameMatch]
+
+
 router = APIRouter()
 csfloat_client = CSFloatClient()
 
 
 @router.get("/", response_model=ItemNamesResponse)
-def get_item_names(limit: int = Query(50, ge=1, le=500)) -> ItemNamesResponse:
+async def get_item_names(limit: int = Query(50, ge=1, le=500)) -> ItemNamesResponse:
     try:
-        names = csfloat_client.fetch_item_names(limit=limit)
+        catalog = get_item_names_catalog() if get_settings().ITEM_NAMES_CATALOG_ENABLED else None
+        if catalog is not None and len(catalog):
+            return ItemNamesResponse(names=catalog.top(limit))
+        names = await get_bulkhead("csfloat").run(csfloat_client.fetch_item_names, limit=limit)
         return ItemNamesResponse(names=names)
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded: {str(e)}")
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
     except (UpstreamServiceError, RuntimeError) as e:
         raise HTTPException(
             status_code=503, detail=f"Upstream item names service unavailable: {str(e)}"
@@ -28,3 +59,35 @@ def get_item_names(limit: int = Query(50, ge=1, le=500)) -> ItemNamesResponse:
         raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.get("/suggest", response_model=ItemNameSuggestions)
+def suggest_item_names(
+    q: str = Query("", max_length=100), limit: int = Query(10, ge=1, le=50)
+) -> ItemNameSuggestions:
+    """Ranked completions of ``q`` from the in-memory catalog; never calls upstream.
+
+    Any word of a name can be completed ("redl" -> "AK-47 | Redline (...)");
+    names seen more often in listings rank first.
+    """
+    if not get_settings().ITEM_NAMES_CATALOG_ENABLED:
+        raise HTTPException(status_code=404, detail="The item-names catalog is disabled.")
+    return ItemNameSuggestions(query=q, names=get_item_names_catalog().suggest(q, limit))
+
+
+@router.get("/search", response_model=ItemNameMatches)
+def search_item_names(
+    q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50)
+) -> ItemNameMatches:
+    """Typo-tolerant lookup of ``q`` in the in-memory catalog; never calls upstream.
+
+    Wear shorthand is expanded ("ak redlin ft" -> "AK-47 | Redline
+    (Field-Tested)"). Matches are ranked by trigram similarity, then
+    popularity in listings.
+    """
+    if not get_settings().ITEM_NAMES_CATALOG_ENABLED:
+        raise HTTPException(status_code=404, detail="The item-names catalog is disabled.")
+    matches = get_item_names_catalog().search(q, limit)
+    return ItemNameMatches(
+        query=q, matches=[ItemNameMatch(name=name, score=score) for name, score in matches]
+    )
@@ -1,11 +1,30 @@
-from typing import List, Optional
+import json
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
-from ...core.exceptions import BackendError, UpstreamServiceError, ValidationError
+from ...config.settings import get_settings
+from ...core import wire
+from ...core.bulkhead import get_bulkhead
+from ...core.compression import get_body_cache, negotiate_request_encoding
+from ...core.conditional import content_digest, if_none_match, strong_etag
+from ...core.exceptions import (
+    BackendError,
+    CapacityExceededError,
+    DeadlineExceededError,
+    NotFoundError,
+    UpstreamServiceError,
+    ValidationError,
+)
 from ...models.item_dto import ItemDTO, item_to_dto
 from ...services.csfloat.client import CSFloatClient
+from ...services.csfloat.params import listings_cache_key
+from ...services.csfloat.projection import FIELD_GETTERS, parse_fields
+from ...services.item_names.catalog import get_item_names_catalog
+from ...services.market.stats import compute_listing_stats, get_stats_cache, items_to_columns
+from ...services.market.store import get_listings_store
 
 
 class ListingsResponse(BaseModel):
@@ -13,12 +32,311 @@ class ListingsResponse(BaseModel):
     meta: Optional[dict] = None
 
 
+class DealItem(ItemDTO):
+    deal_score: float
+    peer_median: float
+    float_percentile: float
+
+
+class DealsResponse(BaseModel):
+    data: List[DealItem]
+
+
+class ComparableItem(ItemDTO):
+    float_delta: float
+    price_delta: int
+
+
+class ComparablesResponse(BaseModel):
+    listing: ItemDTO
+    comparables: List[ComparableItem]
+
+
+class ListingChangesResponse(BaseModel):
+    version: int
+    since: int
+    reset: bool = False
+    added: List[ItemDTO]
+    repriced: List[ItemDTO]
+    removed: List[str]
+
+
 router = APIRouter()
 csfloat_client = CSFloatClient()
 
 
+@router.get("/changes", response_model=ListingChangesResponse)
+async def get_listing_changes(
+    since: int = Query(0, ge=0),
+    category: int = Query(0),
+    min_float: float = Query(0.0),
+    max_float: float = Query(1.0),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    def_index: Optional[List[int]] = Query(None),
+    rarity: Optional[int] = Query(None),
+    paint_seed: Optional[List[int]] = Query(None),
+    paint_index: Optional[int] = Query(None),
+    market_hash_name: Optional[str] = Query(None),
+    item_name: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+) -> ListingChangesResponse:
+    """Added, repriced and removed listings for a query since snapshot ``since``.
+
+    Versions come from ``meta.version`` of ``/listings`` (or a previous call).
+    With ``reset=true`` the deltas are empty and the client must re-read.
+    """
+    try:
+        params = {
+            "category": category,
+            "min_float": min_float,
+            "max_float": max_float,
+            "min_price": min_price,
+            "max_price": max_price,
+            "def_index": def_index,
+            "rarity": rarity,
+            "paint_seed": paint_seed,
+            "paint_index": paint_index,
+            "market_hash_name": market_hash_name,
+            "item_name": item_name,
+            "type": type,
+        }
+        delta = await get_bulkhead("cpu").run(get_listings_store().changes, params, since)
+        return ListingChangesResponse(
+            version=delta["version"],
+            since=since,
+            reset=delta["reset"],
+            added=[item_to_dto(item) for item in delta["added"]],
+            repriced=[item_to_dto(item) for item in delta["repriced"]],
+            removed=delta["removed"],
+        )
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+def _require_deal_scores() -> None:
+    """Deal scores exist only in the local store, which is opt-in."""
+    settings = get_settings()
+    if not (settings.LOCAL_STORE_ENABLED or settings.INGEST_ENABLED):
+        raise ValidationError(
+            "Local deal scores need the local listings store "
+            "(set LOCAL_STORE_ENABLED or INGEST_ENABLED)."
+        )
+
+
+@router.get("/deals", response_model=DealsResponse)
+async def get_top_deals(
+    limit: int = Query(10, ge=1, le=200),
+    category: int = Query(0),
+    min_float: float = Query(0.0),
+    max_float: float = Query(1.0),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    def_index: Optional[List[int]] = Query(None),
+    rarity: Optional[int] = Query(None),
+    paint_seed: Optional[List[int]] = Query(None),
+    paint_index: Optional[int] = Query(None),
+    market_hash_name: Optional[str] = Query(None),
+    item_name: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+) -> DealsResponse:
+    """Top-K local deals: listings priced furthest below their same-name/wear peers."""
+    try:
+        params = {
+            "category": category,
+            "min_float": min_float,
+            "max_float": max_float,
+            "min_price": min_price,
+            "max_price": max_price,
+            "def_index": def_index,
+            "rarity": rarity,
+            "paint_seed": paint_seed,
+            "paint_index": paint_index,
+            "market_hash_name": market_hash_name,
+            "item_name": item_name,
+            "type": type,
+        }
+        _require_deal_scores()
+        deals = await get_bulkhead("cpu").run(get_listings_store().top_deals, params, limit)
+        return DealsResponse(data=[DealItem(**deal) for deal in deals])
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.get("/stats")
+async def get_listing_stats(
+    bins: int = Query(10, ge=1, le=100),
+    limit: int = Query(50, ge=1, le=50),
+    sort_by: str = Query("best_deal"),
+    category: int = Query(0),
+    min_float: float = Query(0.0),
+    max_float: float = Query(1.0),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    def_index: Optional[List[int]] = Query(None),
+    rarity: Optional[int] = Query(None),
+    paint_seed: Optional[List[int]] = Query(None),
+    paint_index: Optional[int] = Query(None),
+    user_id: Optional[str] = Query(None),
+    collection: Optional[str] = Query(None),
+    market_hash_name: Optional[str] = Query(None),
+    item_name: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    stickers: Optional[str] = Query(None),
+    source: Optional[str] = Query(None, pattern="^(upstream|local|auto)$"),
+) -> Dict[str, Any]:
+    """Aggregate statistics for a listings query.
+
+    Computed over every matching listing in the local store, or over the
+    (cached) upstream page otherwise. Results are cached under the listings
+    cache key (plus the store version for local results).
+    """
+    try:
+        params = {
+            "limit": limit,
+            "sort_by": sort_by,
+            "category": category,
+            "min_float": min_float,
+            "max_float": max_float,
+            "min_price": min_price,
+            "max_price": max_price,
+            "def_index": def_index,
+            "rarity": rarity,
+            "paint_seed": paint_seed,
+            "paint_index": paint_index,
+            "user_id": user_id,
+            "collection": collection,
+            "market_hash_name": market_hash_name,
+            "item_name": item_name,
+            "type": type,
+            "stickers": stickers,
+        }
+        mode = source or get_settings().LISTINGS_SOURCE
+        store = get_listings_store()
+        cache = get_stats_cache()
+        cpu = get_bulkhead("cpu")
+        # Aggregates cover every match, so only the filters (not sort_by)
+        # decide whether the local store can answer.
+        scope = {k: v for k, v in params.items() if k not in ("limit", "sort_by")}
+        local = store.supports(scope)
+        if mode == "local" and not local:
+            raise ValidationError("This filter cannot be answered from the local listings store.")
+        if mode == "local" or (mode == "auto" and len(store) and local):
+            # The local store answers the full filter set, not only the
+            # normalized ranges, so the key carries every filter.
+            key = f"local:{store.version}:{json.dumps(scope, sort_keys=True)}:{bins}"
+            stats = await cpu.run(
+                cache.get_or_compute,
+                key,
+                lambda: compute_listing_stats(store.columns(params), bins),
+            )
+            return {"source": "local", "stats": stats}
+        items, cache_status = await get_bulkhead("csfloat").run(
+            csfloat_client.fetch_listings, params
+        )
+        key = f"upstream:{listings_cache_key(params)}:{bins}"
+        if cache_status == "MISS":
+            cache.invalidate(key)
+        stats = await cpu.run(
+            cache.get_or_compute,
+            key,
+            lambda: compute_listing_stats(items_to_columns(items), bins),
+        )
+        return {"source": "upstream", "cache": cache_status, "stats": stats}
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded: {str(e)}")
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except (UpstreamServiceError, RuntimeError) as e:
+        raise HTTPException(
+            status_code=503, detail=f"Upstream listings service unavailable: {str(e)}"
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+def _serialize(
+    items: List[Dict[str, Any]],
+    meta: Dict[str, Any],
+    media: str,
+    fields: Optional[Tuple[str, ...]],
+) -> bytes:
+    if media != wire.JSON:
+        return wire.encode_items(items, meta, media, fields or wire.ITEM_FIELDS)
+    if fields:
+        return json.dumps({"data": items, "meta": meta}, separators=(",", ":")).encode("utf-8")
+    result = ListingsResponse(data=[item_to_dto(item) for item in items], meta=meta)
+    return result.model_dump_json().encode("utf-8")
+
+
+def _negotiated(
+    request: Request,
+    items: List[Dict[str, Any]],
+    meta: Dict[str, Any],
+    digest: str,
+    fields: Optional[Tuple[str, ...]],
+) -> Response:
+    """Serve ``items`` as JSON or, if the client accepts one, a compact wire format.
+
+    Every representation carries a strong ETag built from the result digest,
+    ``meta`` (version, source, totals; not the cache status), its media type
+    and field set; a matching ``If-None-Match`` is answered with 304. With ``fields`` only the projected keys are serialized. Bodies
+    are serialized and compressed once per (ETag, meta) and then served from
+    the body cache.
+    """
+    media = wire.negotiate(request.headers.get("accept"))
+    variant = f"{media};fields={','.join(fields)}" if fields else media
+    # The cache status changes without the representation changing.
+    state = {k: v for k, v in meta.items() if k != "cache"}
+    headers = {
+        "ETag": strong_etag(content_digest({"data": digest, "meta": state}), variant),
+        "Vary": "Accept, Accept-Encoding",
+        "Cache-Control": "private, no-cache",
+    }
+    if if_none_match(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    bodies = get_body_cache()
+    key = f"{headers['ETag']}|{json.dumps(meta, sort_keys=True)}"
+    entry = bodies.get(key)
+    if entry is None:
+        entry = bodies.put(key, media, _serialize(items, meta, media, fields))
+    encoding = negotiate_request_encoding(request.headers.get("accept-encoding"))
+    body, encoding = bodies.encode(entry, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=entry.media_type, headers=headers)
+
+
+def _resolve_market_hash_name(market_hash_name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Closest catalog name to ``market_hash_name`` when it differs from the input."""
+    settings = get_settings()
+    if not market_hash_name or not settings.ITEM_NAMES_CATALOG_ENABLED:
+        return None
+    match = get_item_names_catalog().resolve(market_hash_name, settings.ITEM_NAMES_FUZZY_MIN_SCORE)
+    if match is None or match[0] == market_hash_name:
+        return None
+    return {"query": market_hash_name, "market_hash_name": match[0], "score": match[1]}
+
+
 @router.get("/", response_model=ListingsResponse)
-def get_listings(
+async def get_listings(
+    request: Request,
     limit: int = Query(10, ge=1, le=50),
     sort_by: str = Query("best_deal"),
     category: int = Query(0),
@@ -37,8 +355,19 @@ def get_listings(
     item_name: Optional[str] = Query(None),
     type: Optional[str] = Query(None),
     stickers: Optional[str] = Query(None),
-) -> ListingsResponse:
+    source: Optional[str] = Query(None, pattern="^(upstream|local|auto)$"),
+    fields: Optional[str] = Query(
+        None, description=f"Comma-separated item fields to return: {', '.join(FIELD_GETTERS)}"
+    ),
+    resolve_name: bool = Query(
+        False, description="Rewrite a misspelled market_hash_name to the closest catalog name"
+    ),
+) -> Response:
     try:
+        projection = parse_fields(fields)
+        resolved = _resolve_market_hash_name(market_hash_name) if resolve_name else None
+        if resolved is not None:
+            market_hash_name = resolved["market_hash_name"]
         params = {
             "limit": limit,
             "sort_by": sort_by,
@@ -58,10 +387,39 @@ def get_listings(
             "item_name": item_name,
             "type": type,
             "stickers": stickers,
+            "fields": projection,
         }
-        items, cache_status = csfloat_client.fetch_listings(params)
-        item_dtos = [item_to_dto(item) for item in items]
-        return ListingsResponse(data=item_dtos, meta={"cache": cache_status})
+        mode = source or get_settings().LISTINGS_SOURCE
+        store = get_listings_store()
+        # local_deal is computed here, so it is never sent upstream.
+        if sort_by == "local_deal":
+            _require_deal_scores()
+            mode = "local"
+        if mode == "local" or (mode == "auto" and len(store) and store.supports(params)):
+            items, total = await get_bulkhead("cpu").run(store.query, params)
+            digest = content_digest({"data": items, "total_matches": total})
+            meta = {
+                "cache": "LOCAL",
+                "source": "local",
+                "total_matches": total,
+                "version": store.version,
+            }
+        else:
+            fetch = csfloat_client.fetch_listings
+            if projection:
+                fetch = partial(fetch, fields=projection)
+            items, cache_status = await get_bulkhead("csfloat").run(fetch, params)
+            # The upstream digest covers the items; _negotiated adds meta.
+            digest = csfloat_client.listings_digest(params, items) or content_digest(items)
+            meta = {"cache": cache_status, "version": store.version}
+        if resolved is not None:
+            meta["resolved"] = resolved
+        # Serialization (msgpack/Arrow included) fails through the same handlers.
+        return _negotiated(request, items, meta, digest, projection)
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=f"Deadline exceeded: {str(e)}")
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
     except (UpstreamServiceError, RuntimeError) as e:
         raise HTTPException(
             status_code=503, detail=f"Upstream listings service unavailable: {str(e)}"
@@ -72,3 +430,22 @@ def get_listings(
         raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+
+@router.get("/{listing_id}/comparables", response_model=ComparablesResponse)
+async def get_comparables(listing_id: str, k: int = Query(10, ge=1, le=100)) -> ComparablesResponse:
+    """The ``k`` local listings of the same item and wear nearest in float and price."""
+    try:
+        result = await get_bulkhead("cpu").run(get_listings_store().comparables, listing_id, k)
+        return ComparablesResponse(
+            listing=item_to_dto(result["listing"]),
+            comparables=[ComparableItem(**item) for item in result["comparables"]],
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Not found: {str(e)}")
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
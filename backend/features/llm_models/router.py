@@ -3,7 +3,13 @@ from typing import List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from ...core.exceptions import BackendError, UpstreamServiceError, ValidationError
+from ...core.bulkhead import get_bulkhead
+from ...core.exceptions import (
+    BackendError,
+    CapacityExceededError,
+    UpstreamServiceError,
+    ValidationError,
+)
 from ...services.llm.registry import LLMModelInfo, list_models
 
 router = APIRouter()
@@ -21,13 +27,15 @@ class LlmModelsResponse(BaseModel):
 
 
 @router.get("/models", response_model=LlmModelsResponse)
-def list_llm_models() -> LlmModelsResponse:
+async def list_llm_models() -> LlmModelsResponse:
     try:
-        entries: List[LLMModelInfo] = list_models()
+        entries: List[LLMModelInfo] = await get_bulkhead("llm").run(list_models)
         options: List[LlmModelOption] = [
             LlmModelOption(label=e.display, value=f"{e.provider}:{e.key}") for e in entries
         ]
         return LlmModelsResponse(models=options)
+    except CapacityExceededError as e:
+        raise HTTPException(status_code=503, detail=f"Service busy: {str(e)}")
     except UpstreamServiceError as e:
         raise HTTPException(
             status_code=503, detail=f"Upstream LLM model service unavailable: {str(e)}"
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from ...config.settings import get_settings
+from ...core.compression import GZIP, negotiate_encoding
+from ...core.conditional import if_none_match
+from ...services.metadata.catalog import get_metadata_catalog
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metadata(request: Request) -> Response:
+    """Weapon def indexes, paint kits (with float caps) and collections.
+
+    The catalog is static between deployments, so it is sent with a
+    long-lived ``Cache-Control`` and a strong ETag. Clients accepting gzip get
+    the bundled compressed file byte for byte.
+    """
+    try:
+        catalog = get_metadata_catalog()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=500, detail=f"Metadata catalog unavailable: {str(e)}")
+    headers = {
+        "ETag": catalog.etag,
+        "Cache-Control": f"public, max-age={get_settings().METADATA_MAX_AGE_SECONDS}",
+        "Vary": "Accept-Encoding",
+    }
+    if if_none_match(request.headers.get("if-none-match"), catalog.etag):
+        return Response(status_code=304, headers=headers)
+    if negotiate_encoding(request.headers.get("accept-encoding"), (GZIP,)):
+        headers["Content-Encoding"] = GZIP
+        return Response(content=catalog.compressed, media_type="application/json", headers=headers)
+    return Response(content=catalog.document, media_type="application/json", headers=headers)
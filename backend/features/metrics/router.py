@@ -0,0 +1,49 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from ...config.settings import get_settings
+from ...core.admission import get_admission_controller
+from ...core.bulkhead import bulkhead_stats
+from ...core.compression import get_body_cache
+from ...services.csfloat.cassette import LIVE, get_cassette
+from ...services.csfloat.key_pool import get_key_pool
+from ...services.csfloat.scheduler import get_upstream_scheduler
+from ...services.item_names.catalog import get_item_names_catalog
+from ...services.market.history import get_price_history
+from ...services.market.ingestion import get_ingestion_service
+from ...services.market.stats import get_stats_cache
+from ...services.market.store import get_listings_store
+from ...services.watchlists.engine import get_watchlist_engine
+
+router = APIRouter()
+
+
+@router.get("/")
+def get_metrics() -> Dict[str, Any]:
+    """
+    Operational metrics for upstream traffic.
+    Raw API keys are never exposed; keys are reported by position (key-1, key-2, ...).
+    """
+    return {
+        "csfloat": {
+            "keys": get_key_pool().stats(),
+            "scheduler": get_upstream_scheduler().stats(),
+            "cassette": (
+                get_cassette().stats() if get_settings().CSFLOAT_TRANSPORT_MODE != LIVE else None
+            ),
+        },
+        "admission": get_admission_controller().stats(),
+        "bulkheads": bulkhead_stats(),
+        "local_store": get_listings_store().stats(),
+        "stats_cache": get_stats_cache().stats(),
+        "body_cache": get_body_cache().stats(),
+        "ingestion": get_ingestion_service().stats() if get_settings().INGEST_ENABLED else None,
+        "history": get_price_history().stats() if get_settings().HISTORY_ENABLED else None,
+        "item_names": (
+            get_item_names_catalog().stats() if get_settings().ITEM_NAMES_CATALOG_ENABLED else None
+        ),
+        "watchlists": (
+            get_watchlist_engine().stats() if get_settings().WATCHLISTS_ENABLED else None
+        ),
+    }
@@ -0,0 +1,65 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from ...config.settings import get_settings
+from ...core.exceptions import BackendError, NotFoundError, ValidationError
+from ...models.watchlist import Watchlist, WatchlistCreate
+from ...services.watchlists.events import get_event_broker, sse_events
+from ...services.watchlists.registry import get_watchlist_registry
+
+
+class WatchlistsResponse(BaseModel):
+    watchlists: List[Watchlist]
+
+
+router = APIRouter()
+
+
+@router.get("/", response_model=WatchlistsResponse)
+def list_watchlists() -> WatchlistsResponse:
+    return WatchlistsResponse(watchlists=get_watchlist_registry().list())
+
+
+@router.post("/", response_model=Watchlist)
+def create_watchlist(spec: WatchlistCreate) -> Watchlist:
+    if not get_settings().WATCHLISTS_ENABLED:
+        raise HTTPException(status_code=404, detail="The watchlists engine is disabled.")
+    try:
+        return get_watchlist_registry().create(spec)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"Validation error: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
+
+
+@router.get("/events")
+async def watchlist_events(
+    watchlist_id: Optional[List[str]] = Query(None),
+) -> StreamingResponse:
+    """Server-Sent Events stream of watchlist matches (all watchlists unless filtered)."""
+    if not get_settings().WATCHLISTS_ENABLED:
+        raise HTTPException(status_code=404, detail="The watchlists engine is disabled.")
+    stream = sse_events(
+        get_event_broker(),
+        set(watchlist_id) if watchlist_id else None,
+        get_settings().WATCHLIST_SSE_HEARTBEAT_SECONDS,
+    )
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/{watchlist_id}")
+def delete_watchlist(watchlist_id: str) -> dict:
+    try:
+        get_watchlist_registry().delete(watchlist_id)
+        return {"deleted": watchlist_id}
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Not found: {str(e)}")
+    except BackendError as e:
+        raise HTTPException(status_code=500, detail=f"Internal backend error: {str(e)}")
@@ -7,11 +7,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config.settings import get_settings
+from .core.admission import AdmissionMiddleware, get_admission_controller
+from .core.bulkhead import shutdown_bulkheads
+from .core.compression import CompressionMiddleware
+from .core.deadline import DeadlineMiddleware
 from .features.analyze.router import router as analyze_router
+from .features.export.router import router as export_router
+from .features.history.router import router as history_router
 from .features.item_names.router import router as item_names_router
 from .features.listings.router import router as listings_router
 from .features.llm_models.router import router as llm_models_router
-from .services.csfloat.client import CSFloatClient
+from .features.metadata.router import router as metadata_router
+from .features.metrics.router import router as metrics_router
+from .features.watchlists.router import router as watchlists_router
+from .services.csfloat.cassette import RECORD, get_cassette, upstream_transport
+from .services.csfloat.client import CSFloatClient, register_listings_observer
+from .services.item_names.catalog import get_item_names_catalog
+from .services.market.history import get_price_history
+from .services.market.ingestion import get_ingestion_service
+from .services.market.store import get_listings_store
+from .services.watchlists.engine import get_watchlist_engine
 
 
 @asynccontextmanager
@@ -26,6 +41,10 @@ async def lifespan(app: FastAPI):
     except Exception:
         http2_enabled = False
 
+    limits = httpx.Limits(
+        max_keepalive_connections=int(settings.HTTPX_MAX_KEEPALIVE),
+        max_connections=int(settings.HTTPX_MAX_CONNECTIONS),
+    )
     client = httpx.Client(
         http2=http2_enabled,
         timeout=httpx.Timeout(
@@ -34,22 +53,57 @@ async def lifespan(app: FastAPI):
             write=float(settings.REQUEST_READ_TIMEOUT),
             pool=float(settings.HTTPX_POOL_TIMEOUT),
         ),
-        limits=httpx.Limits(
-            max_keepalive_connections=int(settings.HTTPX_MAX_KEEPALIVE),
-            max_connections=int(settings.HTTPX_MAX_CONNECTIONS),
-        ),
+        limits=limits,
+        transport=upstream_transport(http2_enabled, limits),
     )
     csfloat_client = CSFloatClient()
     csfloat_client.set_http_client(client)
+    if settings.LOCAL_STORE_ENABLED:
+        register_listings_observer(get_listings_store().upsert)
+    if settings.HISTORY_ENABLED:
+        register_listings_observer(get_price_history().record)
+    catalog = get_item_names_catalog() if settings.ITEM_NAMES_CATALOG_ENABLED else None
+    if catalog is not None:
+        register_listings_observer(catalog.observe)
+        catalog.start()
+    ingestion = get_ingestion_service() if settings.INGEST_ENABLED else None
+    if ingestion is not None:
+        ingestion.start()
+    watchlists = get_watchlist_engine() if settings.WATCHLISTS_ENABLED else None
+    if watchlists is not None:
+        watchlists.start()
     try:
         yield
     finally:
+        if watchlists is not None:
+            watchlists.stop()
+        if ingestion is not None:
+            ingestion.stop()
+        if catalog is not None:
+            catalog.stop()
         client.close()
+        if settings.CSFLOAT_TRANSPORT_MODE == RECORD:
+            # Write the gzip trailer so the cassette reads back cleanly.
+            get_cassette().close()
+        shutdown_bulkheads()
 
 
 app = FastAPI(lifespan=lifespan)
 
 _settings = get_settings()
+if _settings.COMPRESSION_ENABLED:
+    # Innermost: compresses what endpoints return uncompressed; /listings
+    # bodies arrive pre-compressed from the body cache and pass through.
+    app.add_middleware(
+        CompressionMiddleware,
+        min_bytes=_settings.COMPRESSION_MIN_BYTES,
+        preference=_settings.compression_encodings,
+    )
+if _settings.ADMISSION_ENABLED:
+    # Added before CORS so rejections still carry CORS headers.
+    app.add_middleware(AdmissionMiddleware, controller=get_admission_controller())
+# Outside admission so queue waits are bounded by the caller's deadline too.
+app.add_middleware(DeadlineMiddleware, max_seconds=_settings.REQUEST_DEADLINE_MAX_SECONDS)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=list(_settings.CORS_ALLOW_ORIGINS or ["*"]),
@@ -60,8 +114,13 @@ app.add_middleware(
 
 app.include_router(listings_router, prefix="/listings")
 app.include_router(item_names_router, prefix="/item-names")
+app.include_router(metadata_router, prefix="/metadata", tags=["Metadata"])
 app.include_router(analyze_router, prefix="/analyze")
 app.include_router(llm_models_router, prefix="/llm")
+app.include_router(history_router, prefix="/history")
+app.include_router(export_router, prefix="/export", tags=["Export"])
+app.include_router(watchlists_router, prefix="/watchlists", tags=["Watchlists"])
+app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
 
 
 @app.exception_handler(HTTPException)
@@ -4,6 +4,7 @@ from pydantic import BaseModel
 
 
 class ItemDTO(BaseModel):
+    id: Optional[str] = None
     name: Optional[str]
     price: Optional[int]
     wear: Optional[str]
@@ -14,6 +15,7 @@ class ItemDTO(BaseModel):
 def item_to_dto(item: Union[Dict[str, Any], Any]) -> ItemDTO:
     if isinstance(item, dict):
         return ItemDTO(
+            id=item.get("id"),
             name=item.get("name"),
             price=item.get("price"),
             wear=item.get("wear"),
@@ -22,6 +24,7 @@ def item_to_dto(item: Union[Dict[str, Any], Any]) -> ItemDTO:
         )
     else:
         return ItemDTO(
+            id=getattr(item, "id", None),
             name=getattr(item, "name", None),
             price=getattr(item, "price", None),
             wear=getattr(item, "wear", None),
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .listing_query_params import ListingQueryParams
+
+
+class WatchlistCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    params: ListingQueryParams = Field(default_factory=ListingQueryParams)
+    webhook_url: Optional[str] = None
+
+
+class Watchlist(WatchlistCreate):
+    id: str
+    created_at: float
@@ -0,0 +1,216 @@
+"""
+Record-and-replay transports for upstream CSFloat traffic.
+
+In ``record`` mode every upstream exchange is appended to a cassette: one
+JSON object per line in a gzip stream (flushed per record, so a crash loses
+at most the last exchange). In ``replay`` mode the cassette answers requests
+with no network, optionally sleeping for the recorded latency.
+
+Requests are matched on method, URL and sorted query string, plus any
+conditional headers (If-None-Match / If-Modified-Since) so recorded 304s
+replay as 304s; a conditional request with no conditional recording falls
+back to the plain one. Repeated requests replay their recordings in order,
+cycling. API keys are never written: only a whitelist of response headers
+is kept, and request headers are not stored at all.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from ...config.settings import get_settings
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (LIVE, RECORD, REPLAY)
+
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+_KEPT_RESPONSE_HEADERS = ("content-type", "etag", "last-modified", "retry-after", "cache-control")
+
+
+def request_key(request: httpx.Request) -> Tuple[str, str]:
+    """(plain key, conditional key) identifying ``request`` in a cassette."""
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.url.params.multi_items()))
+    base = f"{request.method} {request.url.copy_with(query=None)}?{query}"
+    conditions = [
+        f"{name}={request.headers[name]}" for name in CONDITIONAL_HEADERS if name in request.headers
+    ]
+    return base, f"{base}|{';'.join(conditions)}" if conditions else base
+
+
+class Cassette:
+    """Recorded upstream exchanges, loaded from and appended to one file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._writer: Optional[gzip.GzipFile] = None
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["key"], []).append(entry)
+        except EOFError:
+            # A recorder that never closed its stream: keep what was flushed.
+            pass
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        _, key = request_key(request)
+        content = response.content
+        entry: Dict[str, Any] = {
+            "key": key,
+            "status": response.status_code,
+            "headers": {
+                k: response.headers[k] for k in _KEPT_RESPONSE_HEADERS if k in response.headers
+            },
+            "elapsed": round(elapsed, 4),
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._writer = gzip.GzipFile(self.path, "ab")
+            self._writer.write(line)
+            self._writer.flush()
+            self._entries.setdefault(key, []).append(entry)
+            self._stats["recorded"] += 1
+
+    def lookup(self, request: httpx.Request) -> Optional[Dict[str, Any]]:
+        base, key = request_key(request)
+        with self._lock:
+            for candidate in (key, base):
+                entries = self._entries.get(candidate)
+                if entries:
+                    i = self._cursors.get(candidate, 0)
+                    self._cursors[candidate] = i + 1
+                    self._stats["replayed"] += 1
+                    return entries[i % len(entries)]
+            self._stats["misses"] += 1
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, path=self.path, entries=len(self))
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Forwards to ``inner`` and writes each exchange to the cassette."""
+
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = self._inner.handle_request(request)
+        try:
+            response.read()
+        finally:
+            response.close()
+        self._cassette.record(request, response, time.monotonic() - start)
+        # The body is already decoded, so drop the encoding/length headers.
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+        self._cassette.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serves requests from a cassette; unrecorded requests fail like a dead network.
+
+    ``latency_scale`` multiplies the recorded latency (0 replays instantly,
+    1 at recorded speed).
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency_scale: float = 0.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._cassette = cassette
+        self._latency_scale = float(latency_scale)
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._cassette.lookup(request)
+        if entry is None:
+            raise httpx.ConnectError(
+                f"No recorded response for {request.method} {request.url}", request=request
+            )
+        delay = float(entry.get("elapsed") or 0.0) * self._latency_scale
+        if delay > 0:
+            self._sleep(delay)
+        if "body_b64" in entry:
+            content = base64.b64decode(entry["body_b64"])
+        else:
+            content = entry.get("body", "").encode("utf-8")
+        return httpx.Response(
+            entry["status"], headers=entry.get("headers") or {}, content=content, request=request
+        )
+
+
+@lru_cache(maxsize=1)
+def get_cassette() -> Cassette:
+    return Cassette(get_settings().CSFLOAT_CASSETTE_PATH)
+
+
+def upstream_transport(
+    http2: bool = False, limits: Optional[httpx.Limits] = None
+) -> Optional[httpx.BaseTransport]:
+    """Transport for ``CSFLOAT_TRANSPORT_MODE``; None means httpx's default (live)."""
+    settings = get_settings()
+    mode = settings.CSFLOAT_TRANSPORT_MODE
+    if mode not in MODES:
+        raise ValueError(f"CSFLOAT_TRANSPORT_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    if mode == RECORD:
+        inner = httpx.HTTPTransport(http2=http2, limits=limits or httpx.Limits())
+        return RecordingTransport(inner, get_cassette())
+    if mode == REPLAY:
+        return ReplayTransport(get_cassette(), settings.CSFLOAT_REPLAY_LATENCY_SCALE)
+    return None
@@ -4,7 +4,7 @@ import logging
 import os
 import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 from cachetools import TTLCache
@@ -17,11 +17,76 @@ except Exception:  # pragma: no cover - optional dependency
     _HAS_H2 = False
 
 from ...config.settings import get_settings
-from ...core.exceptions import BackendError, UpstreamServiceError, ValidationError
-from .params import normalize_listings_params
+from ...core.conditional import content_digest
+from ...core.deadline import bounded, check_deadline, remaining
+from ...core.exceptions import (
+    BackendError,
+    DeadlineExceededError,
+    UpstreamServiceError,
+    ValidationError,
+)
+from .cassette import upstream_transport
+from .key_pool import APIKeyPool, get_key_pool, parse_retry_after
+from .params import listing_page_params, listings_cache_key, normalize_listings_params
+from .projection import DEFAULT_FIELDS, project_listings
+from .scheduler import Priority, UpstreamScheduler, get_upstream_scheduler
 
 _settings = get_settings()
 
+# Callbacks receiving every raw upstream listings page (e.g. the local store).
+ListingsObserver = Callable[[List[Dict[str, Any]]], object]
+_listings_observers: List[ListingsObserver] = []
+_observers_lock = threading.Lock()
+
+
+def register_listings_observer(observer: ListingsObserver) -> None:
+    with _observers_lock:
+        if observer not in _listings_observers:
+            _listings_observers.append(observer)
+
+
+def unregister_listings_observer(observer: ListingsObserver) -> None:
+    with _observers_lock:
+        if observer in _listings_observers:
+            _listings_observers.remove(observer)
+
+
+def is_listings_observer(observer: ListingsObserver) -> bool:
+    with _observers_lock:
+        return observer in _listings_observers
+
+
+class CachedPage:
+    """One upstream listings page: raw listings, their digest and upstream validators.
+
+    Projections are computed from the raw listings on first use and memoized
+    per field set, so every field set is served from the same cached page.
+    """
+
+    __slots__ = ("raw", "digest", "etag", "last_modified", "_projections")
+
+    def __init__(
+        self,
+        raw: List[Dict[str, Any]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self.raw = raw
+        self.digest = content_digest(raw)
+        self.etag = etag
+        self.last_modified = last_modified
+        self._projections: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+
+    def project(self, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        key = fields or DEFAULT_FIELDS
+        items = self._projections.get(key)
+        if items is None:
+            items = self._projections[key] = project_listings(self.raw, key)
+        return items
+
+    def owns(self, items: List[Dict[str, Any]]) -> bool:
+        return any(items is projected for projected in self._projections.values())
+
 
 class CSFloatClient:
     def __init__(self) -> None:
@@ -30,11 +95,19 @@ class CSFloatClient:
         self._listings_cache: TTLCache = TTLCache(
             maxsize=self._settings.CACHE_MAXSIZE, ttl=self._settings.CACHE_TTL_SECONDS
         )
+        # Outlives the TTL cache so expired entries can be revalidated with a
+        # conditional request instead of refetched.
+        self._validators: TTLCache = TTLCache(
+            maxsize=self._settings.CACHE_MAXSIZE,
+            ttl=self._settings.CACHE_VALIDATOR_TTL_SECONDS,
+        )
         self._cache_lock: threading.Lock = threading.Lock()
         self._inflight: Dict[str, threading.Event] = {}
         self._cache_hits: int = 0
         self._cache_misses: int = 0
-        self.api_key: Optional[str] = self._settings.CSFLOAT_API_KEY or os.getenv("CSFLOAT_API_KEY")
+        self._revalidations: int = 0
+        self._key_pool: APIKeyPool = get_key_pool()
+        self._scheduler: UpstreamScheduler = get_upstream_scheduler()
         self.api_url: str = self._settings.CSFLOAT_API_URL or os.getenv(
             "CSFLOAT_API_URL", "https://csfloat.com/api/v1/listings"
         )
@@ -42,6 +115,10 @@ class CSFloatClient:
         self._http_client: Optional[httpx.Client] = None
 
     def _create_default_client(self) -> httpx.Client:
+        limits = httpx.Limits(
+            max_keepalive_connections=int(self._settings.HTTPX_MAX_KEEPALIVE),
+            max_connections=int(self._settings.HTTPX_MAX_CONNECTIONS),
+        )
         return httpx.Client(
             http2=self._http2_enabled,
             timeout=httpx.Timeout(
@@ -50,10 +127,9 @@ class CSFloatClient:
                 write=float(self._settings.REQUEST_READ_TIMEOUT),
                 pool=float(self._settings.HTTPX_POOL_TIMEOUT),
             ),
-            limits=httpx.Limits(
-                max_keepalive_connections=int(self._settings.HTTPX_MAX_KEEPALIVE),
-                max_connections=int(self._settings.HTTPX_MAX_CONNECTIONS),
-            ),
+            limits=limits,
+            # Record/replay cassette when CSFLOAT_TRANSPORT_MODE asks for one.
+            transport=upstream_transport(self._http2_enabled, limits),
         )
 
     def set_http_client(self, client: httpx.Client) -> None:
@@ -64,14 +140,114 @@ class CSFloatClient:
             self._http_client = self._create_default_client()
         return self._http_client
 
-    def fetch_listings(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], str]:
-        """Fetch listings with a small in-memory TTL cache. Returns (items, cache_status) where cache_status is "HIT" or "MISS"."""
-        headers = {"Authorization": self.api_key} if self.api_key else {}
-        filtered_params: dict = normalize_listings_params(params)
+    def _request_timeout(self) -> Any:
+        """Per-request httpx timeout clamped to the caller's remaining deadline."""
+        left = remaining()
+        if left is None:
+            return httpx.USE_CLIENT_DEFAULT
+        left = max(0.001, left)
+        read = min(float(self._settings.REQUEST_READ_TIMEOUT), left)
+        return httpx.Timeout(
+            connect=min(float(self._settings.REQUEST_CONNECT_TIMEOUT), left),
+            read=read,
+            write=read,
+            pool=min(float(self._settings.HTTPX_POOL_TIMEOUT), left),
+        )
+
+    def _upstream_get(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        """GET from CSFloat using a pooled API key and a scheduler slot.
+
+        Interactive calls wait at most HTTPX_POOL_TIMEOUT for a slot; background
+        classes wait until spare capacity frees up. Both waits and the request
+        itself are clamped to the caller's deadline, if any.
+        """
+        check_deadline("the upstream request")
+        wait = (
+            float(self._settings.HTTPX_POOL_TIMEOUT) if priority == Priority.INTERACTIVE else None
+        )
         try:
-            cache_key = json.dumps(filtered_params, sort_keys=True, separators=(",", ":"))
-        except Exception:
-            cache_key = str(sorted(filtered_params.items()))
+            with self._scheduler.slot(priority, timeout=bounded(wait)):
+                return self._send_with_key_rotation(url, params, headers)
+        except (UpstreamServiceError, httpx.TimeoutException):
+            check_deadline("the upstream response")
+            raise
+
+    def _send_with_key_rotation(
+        self, url: str, params: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Send a GET with a pooled API key.
+
+        A 429/401/403 cools the key down and the request is retried once on each
+        remaining key; the last response is returned if every key is refused.
+        """
+        client = self._get_http_client()
+        tried: List[int] = []
+        response: Optional[httpx.Response] = None
+        while True:
+            try:
+                lease = self._key_pool.acquire(exclude=tried)
+            except UpstreamServiceError:
+                # The remaining keys are benched: surface upstream's last answer.
+                if response is None:
+                    raise
+                return response
+            headers = dict(extra_headers or {})
+            if lease.key:
+                headers["Authorization"] = lease.key
+            status_code: Optional[int] = None
+            retry_after: Optional[float] = None
+            try:
+                response = client.get(
+                    url, params=params, headers=headers, timeout=self._request_timeout()
+                )
+                status_code = response.status_code
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            finally:
+                self._key_pool.release(lease, status_code, retry_after)
+            tried.append(lease.index)
+            if status_code not in (401, 403, 429) or len(tried) >= len(self._key_pool):
+                return response
+            self.logger.warning(
+                json.dumps(
+                    {
+                        "event": "key_rejected",
+                        "status_code": status_code,
+                        "retry_after": retry_after,
+                    }
+                )
+            )
+
+    def _notify_observers(self, listings: List[Dict[str, Any]]) -> None:
+        with _observers_lock:
+            observers = list(_listings_observers)
+        for observer in observers:
+            try:
+                observer(listings)
+            except Exception as e:
+                self.logger.error(json.dumps({"event": "observer_error", "error": str(e)}))
+
+    def fetch_listings(
+        self,
+        params: Dict[str, Any],
+        priority: Priority = Priority.INTERACTIVE,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Fetch listings with a small in-memory TTL cache. Returns (items, cache_status) where cache_status is "HIT", "MISS" or "REVALIDATED".
+
+        Expired entries whose upstream response carried an ETag or
+        Last-Modified are revalidated with a conditional request; a 304 reuses
+        the previous items ("REVALIDATED"). Raw listings are cached, so
+        ``fields`` (see ``projection.parse_fields``) selects the projection
+        without another upstream call.
+        """
+        filtered_params: dict = normalize_listings_params(params)
+        cache_key = listings_cache_key(params)
         key_id = hashlib.sha1(cache_key.encode("utf-8")).hexdigest()[:8]
 
         wait_seconds = float(self._settings.SINGLE_FLIGHT_WAIT_SECONDS)
@@ -89,7 +265,8 @@ class CSFloatClient:
                             }
                         )
                     )
-                    return self._listings_cache[cache_key], "HIT"
+                    page: CachedPage = self._listings_cache[cache_key]
+                    return page.project(fields), "HIT"
                 ev = self._inflight.get(cache_key)
                 if ev is None:
                     ev = threading.Event()
@@ -109,12 +286,38 @@ class CSFloatClient:
             self.logger.info(
                 json.dumps({"event": "cache_wait", "key": key_id, "wait_seconds": wait_seconds})
             )
-            ev.wait(timeout=wait_seconds)
+            ev.wait(timeout=bounded(wait_seconds))
+            check_deadline("the in-flight fetch finished")
+
+        with self._cache_lock:
+            cached: Optional[CachedPage] = self._validators.get(cache_key)
+        conditional: Dict[str, str] = {}
+        if cached is not None and cached.etag:
+            conditional["If-None-Match"] = cached.etag
+        if cached is not None and cached.last_modified:
+            conditional["If-Modified-Since"] = cached.last_modified
 
         start = time.perf_counter()
         try:
-            client = self._get_http_client()
-            response = client.get(self.api_url, params=filtered_params, headers=headers)
+            response = self._upstream_get(
+                self.api_url, filtered_params, priority, headers=conditional or None
+            )
+            if response.status_code == 304 and cached is not None:
+                with self._cache_lock:
+                    self._revalidations += 1
+                    self._listings_cache[cache_key] = cached
+                    self._validators[cache_key] = cached
+                self.logger.info(
+                    json.dumps(
+                        {
+                            "event": "revalidated",
+                            "key": key_id,
+                            "duration_ms": int((time.perf_counter() - start) * 1000),
+                            "items": len(cached.raw),
+                        }
+                    )
+                )
+                return cached.project(fields), "REVALIDATED"
             response.raise_for_status()
             resp_json = response.json()
             listings = resp_json.get("data", [])
@@ -122,32 +325,13 @@ class CSFloatClient:
                 raise ValidationError(
                     f"CSFloat API 'data' field is not a list. Response: {resp_json}"
                 )
-            items: List[Dict[str, Any]] = []
-            for listing in listings:
-                item = listing.get("item", {})
-                rarity_raw = item.get("rarity")
-                rarity_label = None
-                if isinstance(rarity_raw, int):
-                    rarity_label = {
-                        1: "Common",
-                        2: "Uncommon",
-                        3: "Rare",
-                        4: "Mythical",
-                        5: "Legendary",
-                        6: "Ancient",
-                        7: "Immortal",
-                    }.get(rarity_raw)
-                elif isinstance(rarity_raw, str):
-                    rarity_label = rarity_raw
-                items.append(
-                    {
-                        "name": item.get("item_name"),
-                        "price": listing.get("price"),
-                        "wear": item.get("wear_name"),
-                        "rarity": rarity_label,
-                        "float_value": item.get("float_value"),
-                    }
-                )
+            self._notify_observers(listings)
+            page = CachedPage(
+                listings,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            items = page.project(fields)
             duration_ms = int((time.perf_counter() - start) * 1000)
             self.logger.info(
                 json.dumps(
@@ -161,7 +345,8 @@ class CSFloatClient:
                 )
             )
             with self._cache_lock:
-                self._listings_cache[cache_key] = items
+                self._listings_cache[cache_key] = page
+                self._validators[cache_key] = page
             return items, "MISS"
         except httpx.HTTPStatusError as e:
             duration_ms = int((time.perf_counter() - start) * 1000)
@@ -176,6 +361,28 @@ class CSFloatClient:
                 )
             )
             raise UpstreamServiceError(f"Upstream CSFloat API error: {str(e)}") from e
+        except DeadlineExceededError as e:
+            self.logger.warning(
+                json.dumps(
+                    {
+                        "event": "deadline_exceeded",
+                        "key": key_id,
+                        "error": str(e),
+                    }
+                )
+            )
+            raise
+        except UpstreamServiceError as e:
+            self.logger.error(
+                json.dumps(
+                    {
+                        "event": "fetch_error",
+                        "key": key_id,
+                        "error": str(e),
+                    }
+                )
+            )
+            raise
         except ValidationError as e:
             self.logger.error(
                 json.dumps(
@@ -206,6 +413,43 @@ class CSFloatClient:
                 if ev2 is not None:
                     ev2.set()
 
+    def fetch_listings_page(
+        self, params: Dict[str, Any], priority: Priority = Priority.PREFETCH
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one raw upstream listings page, bypassing the cache.
+
+        Returns (raw_listings, next_cursor); next_cursor is None on the last page.
+        Used by background ingestion and crawls to walk the cursor chain.
+        """
+        page_params = listing_page_params(params)
+        start = time.perf_counter()
+        try:
+            response = self._upstream_get(self.api_url, page_params, priority)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise UpstreamServiceError(f"Upstream CSFloat API error: {str(e)}") from e
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise ValidationError(f"CSFloat API returned a non-JSON page: {str(e)}") from e
+        listings = body.get("data", []) if isinstance(body, dict) else body
+        if not isinstance(listings, list):
+            raise ValidationError(f"CSFloat API 'data' field is not a list. Response: {body}")
+        self._notify_observers(listings)
+        cursor = body.get("cursor") if isinstance(body, dict) else None
+        self.logger.info(
+            json.dumps(
+                {
+                    "event": "page_ok",
+                    "priority": priority.name.lower(),
+                    "duration_ms": int((time.perf_counter() - start) * 1000),
+                    "items": len(listings),
+                    "has_next": bool(cursor),
+                }
+            )
+        )
+        return listings, cursor if isinstance(cursor, str) and cursor else None
+
     def get_cache_stats(self) -> Dict[str, Any]:
         with self._cache_lock:
             return {
@@ -213,22 +457,37 @@ class CSFloatClient:
                 "keys": list(self._listings_cache.keys()),
                 "hits": self._cache_hits,
                 "misses": self._cache_misses,
+                "revalidations": self._revalidations,
+                "validators": len(self._validators),
                 "ttl_seconds": self._settings.CACHE_TTL_SECONDS,
             }
 
+    def listings_digest(self, params: Dict[str, Any], items: List[Dict[str, Any]]) -> Optional[str]:
+        """Digest of the raw page ``items`` were projected from, if still cached."""
+        with self._cache_lock:
+            cached: Optional[CachedPage] = self._validators.get(listings_cache_key(params))
+        return cached.digest if cached is not None and cached.owns(items) else None
+
+    def get_key_stats(self) -> List[Dict[str, Any]]:
+        return self._key_pool.stats()
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        return self._scheduler.stats()
+
     def invalidate_cache(self) -> None:
         with self._cache_lock:
             self._listings_cache.clear()
+            self._validators.clear()
             for ev in self._inflight.values():
                 ev.set()
             self._inflight.clear()
 
-    def fetch_item_names(self, limit: int = 50) -> List[str]:
+    def fetch_item_names(
+        self, limit: int = 50, priority: Priority = Priority.INTERACTIVE
+    ) -> List[str]:
         """Fetch item names from CSFloat item-names endpoint."""
         url = self._settings.CSFLOAT_ITEM_NAMES_URL
-        headers = {"Authorization": self.api_key} if self.api_key else {}
-        client = self._get_http_client()
-        response = client.get(url, params={"limit": limit}, headers=headers)
+        response = self._upstream_get(url, {"limit": limit}, priority)
         response.raise_for_status()
         data = response.json()
         names = data.get("names", [])
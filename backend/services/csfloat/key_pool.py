@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ...config.settings import get_settings
+from ...core.exceptions import UpstreamServiceError
+
+RATE_WINDOW_SECONDS = 60.0
+
+
+@dataclass
+class _KeyState:
+    key: Optional[str]
+    label: str
+    in_flight: int = 0
+    recent: Deque[float] = field(default_factory=deque)
+    cooldown_until: float = 0.0
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    unauthorized: int = 0
+    last_used: float = 0.0
+
+
+@dataclass(frozen=True)
+class KeyLease:
+    """A key handed out by the pool for exactly one upstream request."""
+
+    key: Optional[str]
+    index: int
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a delta-seconds ``Retry-After`` header; HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        seconds = float(value.strip())
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
+
+
+class APIKeyPool:
+    """Thread-safe pool of CSFloat API keys.
+
+    - Hands out the least-loaded key (fewest in-flight, then fewest requests in
+      the last minute, then least recently used).
+    - Keys answered with 429 cool down for ``Retry-After`` (or the default
+      cool-down); keys answered with 401/403 cool down for the auth cool-down.
+      The last key not cooling down is never benched: its requests keep
+      reaching upstream, which then reports its own status.
+    - When no key is configured a single anonymous slot is used so accounting
+      still works for unauthenticated requests.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        *,
+        max_requests_per_minute: int = 0,
+        cooldown_seconds: float = 60.0,
+        auth_cooldown_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        unique: List[str] = []
+        for k in keys:
+            k = (k or "").strip()
+            if k and k not in unique:
+                unique.append(k)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._max_per_minute = max(0, int(max_requests_per_minute))
+        self._cooldown_seconds = float(cooldown_seconds)
+        self._auth_cooldown_seconds = float(auth_cooldown_seconds)
+        if unique:
+            self._states = [_KeyState(key=k, label=f"key-{i + 1}") for i, k in enumerate(unique)]
+        else:
+            self._states = [_KeyState(key=None, label="anonymous")]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def _trim(self, state: _KeyState, now: float) -> None:
+        cutoff = now - RATE_WINDOW_SECONDS
+        while state.recent and state.recent[0] <= cutoff:
+            state.recent.popleft()
+
+    def _available(self, state: _KeyState, now: float) -> bool:
+        if state.cooldown_until > now:
+            return False
+        if self._max_per_minute and len(state.recent) >= self._max_per_minute:
+            return False
+        return True
+
+    def _others_cooling(self, index: int, now: float) -> bool:
+        return all(s.cooldown_until > now for i, s in enumerate(self._states) if i != index)
+
+    def acquire(self, exclude: Optional[List[int]] = None) -> KeyLease:
+        """Reserve the least-loaded available key; raise if every key is unavailable."""
+        skip = set(exclude or [])
+        with self._lock:
+            now = self._clock()
+            best: Optional[int] = None
+            for i, state in enumerate(self._states):
+                if i in skip:
+                    continue
+                self._trim(state, now)
+                if not self._available(state, now):
+                    continue
+                if best is None:
+                    best = i
+                    continue
+                cur = self._states[best]
+                if (state.in_flight, len(state.recent), state.last_used) < (
+                    cur.in_flight,
+                    len(cur.recent),
+                    cur.last_used,
+                ):
+                    best = i
+            if best is None:
+                raise UpstreamServiceError(
+                    "All CSFloat API keys are cooling down or rate limited; retry shortly."
+                )
+            state = self._states[best]
+            state.in_flight += 1
+            state.requests += 1
+            state.recent.append(now)
+            state.last_used = now
+            return KeyLease(key=state.key, index=best)
+
+    def release(
+        self,
+        lease: KeyLease,
+        status_code: Optional[int],
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Return a key to the pool and account the upstream outcome."""
+        with self._lock:
+            state = self._states[lease.index]
+            state.in_flight = max(0, state.in_flight - 1)
+            now = self._clock()
+            if status_code == 429:
+                state.rate_limited += 1
+                state.failures += 1
+                wait = retry_after if retry_after is not None else self._cooldown_seconds
+                if not self._others_cooling(lease.index, now):
+                    state.cooldown_until = max(state.cooldown_until, now + wait)
+            elif status_code in (401, 403):
+                state.unauthorized += 1
+                state.failures += 1
+                if not self._others_cooling(lease.index, now):
+                    state.cooldown_until = max(
+                        state.cooldown_until, now + self._auth_cooldown_seconds
+                    )
+            elif status_code is None or status_code >= 500:
+                state.failures += 1
+            else:
+                state.successes += 1
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-key metrics; raw keys are never included."""
+        with self._lock:
+            now = self._clock()
+            out: List[Dict[str, Any]] = []
+            for state in self._states:
+                self._trim(state, now)
+                out.append(
+                    {
+                        "key": state.label,
+                        "in_flight": state.in_flight,
+                        "requests_last_minute": len(state.recent),
+                        "requests": state.requests,
+                        "successes": state.successes,
+                        "failures": state.failures,
+                        "rate_limited": state.rate_limited,
+                        "unauthorized": state.unauthorized,
+                        "cooling_down": state.cooldown_until > now,
+                        "cooldown_remaining_seconds": round(
+                            max(0.0, state.cooldown_until - now), 3
+                        ),
+                    }
+                )
+            return out
+
+
+@lru_cache(maxsize=1)
+def get_key_pool() -> APIKeyPool:
+    settings = get_settings()
+    keys: List[str] = []
+    primary = settings.CSFLOAT_API_KEY or os.getenv("CSFLOAT_API_KEY")
+    if primary:
+        keys.append(primary)
+    keys.extend(settings.csfloat_api_keys)
+    return APIKeyPool(
+        keys,
+        max_requests_per_minute=settings.CSFLOAT_KEY_MAX_REQUESTS_PER_MINUTE,
+        cooldown_seconds=settings.CSFLOAT_KEY_COOLDOWN_SECONDS,
+        auth_cooldown_seconds=settings.CSFLOAT_KEY_AUTH_COOLDOWN_SECONDS,
+    )
@@ -1,3 +1,4 @@
+import json
 from typing import Any, Dict
 
 
@@ -41,3 +42,35 @@ def normalize_listings_params(params: Dict[str, Any]) -> Dict[str, Any]:
 
     # ...existing logic from csfloat_params.py continues...
     return normalized
+
+
+def listings_cache_key(params: Dict[str, Any]) -> str:
+    """
+    Canonical cache key for a listings query: the normalized params as compact,
+    key-sorted JSON. Shared by the listings cache and everything derived from it.
+    """
+    filtered = normalize_listings_params(params)
+    try:
+        return json.dumps(filtered, sort_keys=True, separators=(",", ":"))
+    except Exception:
+        return str(sorted(filtered.items()))
+
+
+PAGE_SCOPE_KEYS = ("cursor", "limit", "sort_by", "category", "def_index")
+
+
+def listing_page_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build params for walking the upstream listings cursor chain.
+    - Range params are normalized by normalize_listings_params
+    - Scope/paging params (cursor, limit, sort_by, category, def_index) are kept
+      when set, since a cursor is only valid together with the query it came from
+    """
+    raw = dict(params or {})
+    page = normalize_listings_params(raw)
+    for key in PAGE_SCOPE_KEYS:
+        value = raw.get(key)
+        if value is None or value == "" or value == []:
+            continue
+        page[key] = value
+    return page
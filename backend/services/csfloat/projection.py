@@ -0,0 +1,113 @@
+"""
+Projection of raw CSFloat listings into API items.
+
+``projector(fields)`` compiles the getters of a field set once (cached per
+field set), so projecting a page is a single pass of prebound lookups and a
+lean request never pays for fields it did not ask for.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...core.exceptions import ValidationError
+
+RARITY_LABELS: Dict[int, str] = {
+    1: "Common",
+    2: "Uncommon",
+    3: "Rare",
+    4: "Mythical",
+    5: "Legendary",
+    6: "Ancient",
+    7: "Immortal",
+}
+
+Listing = Dict[str, Any]
+Projector = Callable[[Listing], Dict[str, Any]]
+
+
+def rarity_label(raw: Any) -> Optional[str]:
+    if isinstance(raw, int):
+        return RARITY_LABELS.get(raw)
+    return raw if isinstance(raw, str) else None
+
+
+def _listing_id(listing: Listing, item: Dict[str, Any]) -> Optional[str]:
+    value = listing.get("id")
+    return str(value) if value is not None else None
+
+
+def _stickers(listing: Listing, item: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    stickers = item.get("stickers")
+    if not isinstance(stickers, list):
+        return None
+    return [
+        {"name": s.get("name"), "slot": s.get("slot"), "wear": s.get("wear")}
+        for s in stickers
+        if isinstance(s, dict)
+    ]
+
+
+def _from_item(key: str) -> Callable[[Listing, Dict[str, Any]], Any]:
+    return lambda listing, item: item.get(key)
+
+
+def _from_listing(key: str) -> Callable[[Listing, Dict[str, Any]], Any]:
+    return lambda listing, item: listing.get(key)
+
+
+# field -> getter(listing, listing["item"])
+FIELD_GETTERS: Dict[str, Callable[[Listing, Dict[str, Any]], Any]] = {
+    "id": _listing_id,
+    "name": _from_item("item_name"),
+    "price": _from_listing("price"),
+    "wear": _from_item("wear_name"),
+    "rarity": lambda listing, item: rarity_label(item.get("rarity")),
+    "float_value": _from_item("float_value"),
+    "market_hash_name": _from_item("market_hash_name"),
+    "def_index": _from_item("def_index"),
+    "paint_index": _from_item("paint_index"),
+    "paint_seed": _from_item("paint_seed"),
+    "stickers": _stickers,
+    "inspect_link": _from_item("inspect_link"),
+}
+DEFAULT_FIELDS: Tuple[str, ...] = ("id", "name", "price", "wear", "rarity", "float_value")
+
+
+def parse_fields(spec: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a ``fields=`` value (comma-separated, any order) into a canonical tuple.
+
+    ``None`` means the default projection. Unknown fields raise ValidationError.
+    """
+    if spec is None or not spec.strip():
+        return None
+    requested = {f.strip() for f in spec.split(",") if f.strip()}
+    unknown = sorted(requested - FIELD_GETTERS.keys())
+    if unknown:
+        raise ValidationError(f"Unknown fields {unknown}; choose from {sorted(FIELD_GETTERS)}")
+    # Canonical order keeps one projector (and one ETag) per field set.
+    fields = tuple(f for f in FIELD_GETTERS if f in requested)
+    return None if fields == DEFAULT_FIELDS else fields
+
+
+@lru_cache(maxsize=64)
+def projector(fields: Tuple[str, ...] = DEFAULT_FIELDS) -> Projector:
+    getters = tuple((field, FIELD_GETTERS[field]) for field in fields)
+
+    def project(listing: Listing) -> Dict[str, Any]:
+        item = listing.get("item") or {}
+        return {field: get(listing, item) for field, get in getters}
+
+    return project
+
+
+def project_listings(
+    listings: List[Listing], fields: Optional[Tuple[str, ...]] = None
+) -> List[Dict[str, Any]]:
+    project = projector(fields or DEFAULT_FIELDS)
+    return [project(listing) for listing in listings]
+
+
+# Flatten one raw CSFloat listing into the default API item shape.
+listing_to_item: Projector = projector(DEFAULT_FIELDS)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from ...config.settings import get_settings
+from ...core.exceptions import UpstreamServiceError
+
+
+class Priority(IntEnum):
+    """Upstream traffic classes, most important first."""
+
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BULK = 2
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.granted = False
+
+
+class UpstreamScheduler:
+    """Weighted priority gate in front of the upstream connection pool.
+
+    - At most ``max_concurrency`` upstream requests run at once.
+    - Interactive requests are always served first when a slot frees up.
+    - Prefetch and bulk traffic only get spare slots, share them by weight, and
+      are capped to a fraction of the pool so interactive requests always find
+      headroom without queueing behind background work.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        *,
+        prefetch_share: float = 0.5,
+        bulk_share: float = 0.25,
+        prefetch_weight: int = 3,
+        bulk_weight: int = 1,
+    ) -> None:
+        self._max = max(1, int(max_concurrency))
+        self._caps: Dict[Priority, int] = {
+            Priority.INTERACTIVE: self._max,
+            Priority.PREFETCH: max(1, int(self._max * prefetch_share)),
+            Priority.BULK: max(1, int(self._max * bulk_share)),
+        }
+        self._weights: Dict[Priority, int] = {
+            Priority.PREFETCH: max(1, int(prefetch_weight)),
+            Priority.BULK: max(1, int(bulk_weight)),
+        }
+        self._credit: Dict[Priority, int] = {Priority.PREFETCH: 0, Priority.BULK: 0}
+        self._lock = threading.Lock()
+        self._in_use: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._queues: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in Priority}
+        self._granted: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._timeouts: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._wait_seconds: Dict[Priority, float] = {p: 0.0 for p in Priority}
+
+    def _free(self) -> int:
+        return self._max - sum(self._in_use.values())
+
+    def _eligible(self, priority: Priority) -> bool:
+        return bool(self._queues[priority]) and self._in_use[priority] < self._caps[priority]
+
+    def _pick_background(self) -> Optional[Priority]:
+        # Smooth weighted round-robin over background classes that have waiters.
+        candidates = [p for p in (Priority.PREFETCH, Priority.BULK) if self._eligible(p)]
+        if not candidates:
+            return None
+        total = 0
+        for p in candidates:
+            self._credit[p] += self._weights[p]
+            total += self._weights[p]
+        chosen = max(candidates, key=lambda p: self._credit[p])
+        self._credit[chosen] -= total
+        return chosen
+
+    def _grant(self, priority: Priority) -> None:
+        waiter = self._queues[priority].popleft()
+        waiter.granted = True
+        self._in_use[priority] += 1
+        self._granted[priority] += 1
+        waiter.event.set()
+
+    def _dispatch(self) -> None:
+        while self._free() > 0:
+            if self._queues[Priority.INTERACTIVE]:
+                self._grant(Priority.INTERACTIVE)
+                continue
+            chosen = self._pick_background()
+            if chosen is None:
+                return
+            self._grant(chosen)
+
+    def acquire(self, priority: Priority, timeout: Optional[float] = None) -> None:
+        """Block until a slot is granted for ``priority``.
+
+        Raises UpstreamServiceError when ``timeout`` elapses first.
+        """
+        waiter = _Waiter()
+        start = time.perf_counter()
+        with self._lock:
+            self._queues[priority].append(waiter)
+            self._dispatch()
+        if not waiter.event.wait(timeout=timeout):
+            with self._lock:
+                if not waiter.granted:
+                    self._queues[priority].remove(waiter)
+                    self._timeouts[priority] += 1
+                    raise UpstreamServiceError(
+                        f"Upstream capacity saturated; {priority.name.lower()} request "
+                        f"waited {timeout:.2f}s for a connection slot."
+                    )
+        with self._lock:
+            self._wait_seconds[priority] += time.perf_counter() - start
+
+    def release(self, priority: Priority) -> None:
+        with self._lock:
+            self._in_use[priority] = max(0, self._in_use[priority] - 1)
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, priority: Priority, timeout: Optional[float] = None) -> Iterator[None]:
+        self.acquire(priority, timeout=timeout)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            classes: Dict[str, Any] = {}
+            for p in Priority:
+                granted = self._granted[p]
+                classes[p.name.lower()] = {
+                    "in_use": self._in_use[p],
+                    "queued": len(self._queues[p]),
+                    "cap": self._caps[p],
+                    "granted": granted,
+                    "timeouts": self._timeouts[p],
+                    "avg_wait_ms": (
+                        round(self._wait_seconds[p] / granted * 1000, 3) if granted else 0.0
+                    ),
+                }
+            return {"max_concurrency": self._max, "classes": classes}
+
+
+@lru_cache(maxsize=1)
+def get_upstream_scheduler() -> UpstreamScheduler:
+    settings = get_settings()
+    max_concurrency = settings.UPSTREAM_MAX_CONCURRENCY or settings.HTTPX_MAX_CONNECTIONS
+    return UpstreamScheduler(
+        max_concurrency,
+        prefetch_share=settings.UPSTREAM_PREFETCH_MAX_SHARE,
+        bulk_share=settings.UPSTREAM_BULK_MAX_SHARE,
+        prefetch_weight=settings.UPSTREAM_PREFETCH_WEIGHT,
+        bulk_weight=settings.UPSTREAM_BULK_WEIGHT,
+    )
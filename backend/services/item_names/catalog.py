@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from ...config.settings import get_settings
+from ..csfloat.client import CSFloatClient
+from ..csfloat.scheduler import Priority
+
+_SEPARATORS = re.compile(r"[^0-9a-z★]+")
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase ``text`` and collapse punctuation ("AK-47 | Redline" -> "ak 47 redline")."""
+    return " ".join(_SEPARATORS.split(text.lower())).strip()
+
+
+class PrefixIndex:
+    """Ranked prefix completion over a fixed list of names.
+
+    Every word start of every normalized name is a key ("ak 47 redline",
+    "47 redline", "redline"), so "redl" completes "AK-47 | Redline". The top
+    ``depth`` levels of the trie over those keys are materialized as a dict
+    from prefix to its best ``top_k`` names; that covers the short, hot
+    prefixes typed first. Longer prefixes select a range of the sorted keys
+    with two bisections and rank only that range; those results are memoized
+    (the index is immutable) so a repeated keystroke costs one dict lookup.
+    """
+
+    MEMO_SIZE = 4096
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        *,
+        depth: int = 3,
+        top_k: int = 20,
+    ) -> None:
+        self.names = list(names)
+        self._depth = depth
+        self._top_k = top_k
+        weights = weights if weights is not None else [0.0] * len(self.names)
+        order = sorted(
+            range(len(self.names)), key=lambda i: (-weights[i], len(self.names[i]), self.names[i])
+        )
+        # rank[i]: position of name i in the global ranking (lower is better).
+        self._rank = [0] * len(self.names)
+        for position, i in enumerate(order):
+            self._rank[i] = position
+        entries = []
+        for i, name in enumerate(self.names):
+            norm = normalize_name(name)
+            for start in [0] + [m.end() for m in re.finditer(" ", norm)]:
+                entries.append((norm[start:], i))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = [i for _, i in entries]
+        top: Dict[str, List[int]] = {}
+        for key, i in entries:
+            for d in range(1, min(depth, len(key)) + 1):
+                top.setdefault(key[:d], []).append(i)
+        self._top = {p: self._best(set(ids), top_k) for p, ids in top.items()}
+        self._top[""] = order[:top_k]
+        self._memo: Dict[str, List[int]] = {}
+
+    def _best(self, ids: Iterable[int], limit: int) -> List[int]:
+        return heapq.nsmallest(limit, ids, key=self._rank.__getitem__)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        p = normalize_name(prefix)
+        if len(p) <= self._depth and limit <= self._top_k:
+            return [self.names[i] for i in self._top.get(p, [])[:limit]]
+        memo_key = f"{limit}:{p}"
+        ids = self._memo.get(memo_key)
+        if ids is None:
+            lo = bisect_left(self._keys, p)
+            hi = bisect_left(self._keys, p + "\uffff", lo)
+            ids = self._best(set(self._ids[lo:hi]), limit)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[memo_key] = ids
+        return [self.names[i] for i in ids]
+
+
+# Shorthand users type for wears and name prefixes, expanded before matching.
+ABBREVIATIONS = {
+    "fn": "factory new",
+    "mw": "minimal wear",
+    "ft": "field tested",
+    "ww": "well worn",
+    "bs": "battle scarred",
+    "st": "stattrak",
+    "souv": "souvenir",
+}
+
+
+def expand_query(text: str) -> str:
+    """Normalize ``text`` and expand wear/prefix shorthand ("ak redlin ft" -> "... field tested")."""
+    return " ".join(ABBREVIATIONS.get(word, word) for word in normalize_name(text).split())
+
+
+def trigrams(norm: str) -> Set[str]:
+    """Trigrams of each word of a normalized string, padded so word edges count."""
+    grams: Set[str] = set()
+    for word in norm.split():
+        padded = f" {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Typo-tolerant lookup of names by trigram similarity.
+
+    Each name's trigrams go into an inverted index of compact posting arrays.
+    A query walks its trigrams' postings rarest first, counting shared
+    trigrams per name, and stops after ``max_scan`` posting entries: rare
+    trigrams carry the signal, and the common ones ("ed ", " st") that grow
+    with the catalog are the ones skipped, so lookup cost stays bounded. The
+    best ``candidates`` by shared count are rescored exactly (Dice
+    coefficient) plus a small popularity bonus.
+    """
+
+    MEMO_SIZE = 4096
+    POPULARITY_WEIGHT = 0.1
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        weights: Optional[Sequence[float]] = None,
+        *,
+        max_scan: int = 50000,
+        candidates: int = 64,
+    ) -> None:
+        self.names = list(names)
+        self._max_scan = max_scan
+        self._candidates = candidates
+        self._norms = [normalize_name(name) for name in self.names]
+        self._exact = {norm: i for i, norm in reversed(list(enumerate(self._norms)))}
+        weights = weights if weights is not None else [0.0] * len(self.names)
+        top = max(weights, default=0.0)
+        scale = math.log1p(top) if top > 0 else 1.0
+        self._bonus = [self.POPULARITY_WEIGHT * math.log1p(max(w, 0.0)) / scale for w in weights]
+        self._sizes = array("H")
+        postings: Dict[str, List[int]] = {}
+        for i, norm in enumerate(self._norms):
+            grams = trigrams(norm)
+            self._sizes.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: array("I", ids) for gram, ids in postings.items()}
+        self._memo: Dict[str, List[Tuple[int, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _rank(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+        lists = sorted((self._postings[gram] for gram in grams if gram in self._postings), key=len)
+        shared: Counter = Counter()
+        scanned = 0
+        for ids in lists:
+            if scanned and scanned + len(ids) > self._max_scan:
+                break
+            shared.update(ids)
+            scanned += len(ids)
+        scored = []
+        for i, _ in shared.most_common(self._candidates):
+            common = len(grams & trigrams(self._norms[i]))
+            dice = 2.0 * common / (len(grams) + self._sizes[i])
+            scored.append((i, round(dice + self._bonus[i], 4)))
+        return heapq.nsmallest(limit, scored, key=lambda s: (-s[1], len(self.names[s[0]])))
+
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Names most similar to ``text`` as (name, score), best first."""
+        query = expand_query(text)
+        memo_key = f"{limit}:{query}"
+        ranked = self._memo.get(memo_key)
+        if ranked is None:
+            ranked = self._rank(query, limit)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[memo_key] = ranked
+        return [(self.names[i], score) for i, score in ranked]
+
+    def resolve(self, text: str, min_score: float = 0.5) -> Optional[Tuple[str, float]]:
+        """The canonical name ``text`` refers to, or None when nothing is close enough."""
+        exact = self._exact.get(normalize_name(text))
+        if exact is not None:
+            return self.names[exact], 1.0
+        best = self.search(text, 1)
+        if best and best[0][1] >= min_score:
+            return best[0]
+        return None
+
+
+class ItemNamesCatalog:
+    """The upstream item-names catalog, kept in memory and on disk.
+
+    Names are refreshed from CSFloat in the background every
+    ``refresh_seconds`` at prefetch priority and persisted as JSON, so a
+    restart serves suggestions immediately. Market hash names seen in
+    listings pages add to the catalog and count as popularity, which ranks
+    completions and fuzzy matches. The prefix and trigram indexes are rebuilt
+    off the request path and swapped in whole.
+    """
+
+    def __init__(
+        self,
+        client: Optional[CSFloatClient],
+        path: Optional[str],
+        *,
+        refresh_seconds: float = 21600.0,
+        fetch_limit: int = 50000,
+        rebuild_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.logger = logging.getLogger("item_names.catalog")
+        self._client = client
+        self._path = path
+        self._refresh_seconds = float(refresh_seconds)
+        self._fetch_limit = int(fetch_limit)
+        self._rebuild_seconds = float(rebuild_seconds)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._names: Dict[str, None] = {}
+        self._popularity: Counter = Counter()
+        self._fetched_at = 0.0
+        self._dirty = False
+        self._index = PrefixIndex([])
+        self._fuzzy = TrigramIndex([])
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, Any] = {"refreshes": 0, "rebuilds": 0, "errors": 0}
+        self._load()
+
+    # -- persistence ----------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self._path or not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if not isinstance(raw, dict):
+                raise ValueError("expected a JSON object")
+        except (OSError, ValueError) as e:
+            # A truncated or corrupt file must not keep the app from starting;
+            # the next refresh rewrites it.
+            self.logger.warning(
+                json.dumps({"event": "item_names_unreadable", "path": self._path, "error": str(e)})
+            )
+            return
+        self._names = dict.fromkeys(raw.get("names") or [])
+        self._popularity = Counter(raw.get("popularity") or {})
+        self._fetched_at = float(raw.get("fetched_at") or 0.0)
+        self.rebuild()
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            doc = {
+                "fetched_at": self._fetched_at,
+                "names": list(self._names),
+                "popularity": dict(self._popularity),
+            }
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(doc, f)
+        os.replace(tmp, self._path)
+
+    # -- updates --------------------------------------------------------------
+
+    def observe(self, listings: List[Dict[str, Any]]) -> None:
+        """Listings observer: count market hash names and learn unseen ones."""
+        raw = [(listing.get("item") or {}).get("market_hash_name") for listing in listings]
+        seen: List[str] = [name for name in raw if isinstance(name, str) and name]
+        if not seen:
+            return
+        with self._lock:
+            self._popularity.update(seen)
+            for name in seen:
+                if name not in self._names:
+                    self._names[name] = None
+            self._dirty = True
+
+    def rebuild(self) -> None:
+        with self._lock:
+            names = list(self._names)
+            weights = [float(self._popularity.get(name, 0)) for name in names]
+            self._dirty = False
+        self._index = PrefixIndex(names, weights)
+        self._fuzzy = TrigramIndex(names, weights)
+        self._stats["rebuilds"] += 1
+
+    def refresh(self) -> int:
+        """Fetch the upstream catalog, persist it and rebuild. Returns the catalog size."""
+        if self._client is None:
+            return len(self._index)
+        names = self._client.fetch_item_names(limit=self._fetch_limit, priority=Priority.PREFETCH)
+        with self._lock:
+            for name in names:
+                if isinstance(name, str) and name and name not in self._names:
+                    self._names[name] = None
+            self._fetched_at = self._clock()
+        self.rebuild()
+        self._save()
+        self._stats["refreshes"] += 1
+        return len(self._index)
+
+    # -- reads ----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def index(self) -> PrefixIndex:
+        return self._index
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        return self._index.complete(query, limit)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        return self._fuzzy.search(query, limit)
+
+    def resolve(self, query: str, min_score: float = 0.5) -> Optional[Tuple[str, float]]:
+        return self._fuzzy.resolve(query, min_score)
+
+    def top(self, limit: int) -> List[str]:
+        return self._index.complete("", limit)
+
+    def stale(self) -> bool:
+        return self._clock() - self._fetched_at >= self._refresh_seconds
+
+    # -- background loop ------------------------------------------------------
+
+    def _tick(self) -> None:
+        try:
+            if self.stale():
+                self.refresh()
+            elif self._dirty:
+                self.rebuild()
+        except Exception as e:
+            # Anything (a malformed upstream body included) must not end the thread.
+            self._stats["errors"] += 1
+            self.logger.exception(
+                json.dumps({"event": "item_names_refresh_error", "error": str(e)})
+            )
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._tick()
+            self._stop.wait(self._rebuild_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="item-names-catalog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            names=len(self._index),
+            fetched_at=self._fetched_at or None,
+            running=self._thread is not None and self._thread.is_alive(),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_item_names_catalog() -> ItemNamesCatalog:
+    settings = get_settings()
+    return ItemNamesCatalog(
+        CSFloatClient(),
+        settings.ITEM_NAMES_PATH,
+        refresh_seconds=settings.ITEM_NAMES_REFRESH_SECONDS,
+        fetch_limit=settings.ITEM_NAMES_FETCH_LIMIT,
+    )
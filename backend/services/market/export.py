@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+
+    _HAS_PYARROW = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_PYARROW = False
+
+from ...core.bulkhead import Bulkhead
+from ...core.exceptions import ValidationError
+from ..csfloat.client import CSFloatClient
+from ..csfloat.projection import listing_to_item
+from ..csfloat.scheduler import Priority
+from .store import ListingsStore, filter_listings
+
+EXPORT_COLUMNS: Tuple[str, ...] = ("id", "name", "price", "wear", "rarity", "float_value")
+
+# format -> (media type, file extension)
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+Chunks = Iterable[List[Dict[str, Any]]]
+# (raw listings, next cursor) as returned by CSFloatClient.fetch_listings_page.
+Page = Tuple[List[Dict[str, Any]], Optional[str]]
+
+
+def check_format(fmt: str) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise ValidationError(f"Unsupported export format {fmt!r}")
+    if fmt in ("parquet", "arrow") and not _HAS_PYARROW:
+        raise ValidationError(f"{fmt} export requires pyarrow (pip install pyarrow)")
+
+
+# -- sources ------------------------------------------------------------------
+
+
+def local_chunks(store: ListingsStore, params: Dict[str, Any], chunk_size: int) -> Chunks:
+    return store.iter_items(params, chunk_size)
+
+
+def upstream_chunks(
+    client: CSFloatClient,
+    params: Dict[str, Any],
+    max_pages: int,
+    *,
+    first_page: Optional[Page] = None,
+    bulkhead: Optional[Bulkhead] = None,
+) -> Chunks:
+    """Follow the upstream cursor chain at bulk priority, one page per chunk.
+
+    Upstream pages are requested with the cursor-scope parameters only, so
+    every page is filtered locally with the store's predicate (name, rarity,
+    paint, type, ...) before it is exported.
+
+    ``first_page`` is the chain's first page when the caller fetched it
+    already (before the response started, so a failure still gets an error
+    status). With ``bulkhead`` the remaining pages are fetched on it.
+    """
+    page_params = dict(params, cursor=None)
+    for page in range(max(1, int(max_pages))):
+        if page == 0 and first_page is not None:
+            raw, cursor = first_page
+        elif bulkhead is not None:
+            future = bulkhead.submit(client.fetch_listings_page, page_params, Priority.BULK)
+            raw, cursor = future.result()
+        else:
+            raw, cursor = client.fetch_listings_page(page_params, Priority.BULK)
+        raw = filter_listings(raw, params)
+        if raw:
+            yield [listing_to_item(listing) for listing in raw]
+        if not cursor:
+            return
+        page_params["cursor"] = cursor
+
+
+# -- encoders -----------------------------------------------------------------
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose bytes are drained after every chunk."""
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        data = bytes(b)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def _csv_stream(chunks: Chunks) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        writer.writerows([item.get(c) for c in EXPORT_COLUMNS] for item in chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _ndjson_stream(chunks: Chunks) -> Iterator[bytes]:
+    # One JSON object per line; a chunk is flushed (and compressed) as a unit.
+    for chunk in chunks:
+        lines = [
+            json.dumps({c: item.get(c) for c in EXPORT_COLUMNS}, separators=(",", ":"))
+            for item in chunk
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _arrow_schema() -> Any:
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("name", pa.string()),
+            ("price", pa.int64()),
+            ("wear", pa.string()),
+            ("rarity", pa.string()),
+            ("float_value", pa.float64()),
+        ]
+    )
+
+
+def _to_batch(schema: Any, chunk: List[Dict[str, Any]]) -> Any:
+    return pa.RecordBatch.from_pydict(
+        {c: [item.get(c) for item in chunk] for c in EXPORT_COLUMNS}, schema=schema
+    )
+
+
+def _arrow_stream(chunks: Chunks) -> Iterator[bytes]:
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    with pa_ipc.new_stream(pa.PythonFile(sink, mode="w"), schema) as writer:
+        yield sink.drain()
+        for chunk in chunks:
+            writer.write_batch(_to_batch(schema, chunk))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def _parquet_stream(chunks: Chunks) -> Iterator[bytes]:
+    # One row group per chunk; the footer is written when the writer closes.
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(_to_batch(schema, chunk))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def encode(fmt: str, chunks: Chunks) -> Iterator[bytes]:
+    """Incrementally encode listing chunks; memory stays bounded by one chunk."""
+    check_format(fmt)
+    encoder = {
+        "csv": _csv_stream,
+        "ndjson": _ndjson_stream,
+        "arrow": _arrow_stream,
+        "parquet": _parquet_stream,
+    }[fmt]
+    for data in encoder(chunks):
+        if data:
+            yield data
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...config.settings import get_settings
+from ...core.exceptions import ValidationError
+
+# One fixed-width little-endian record per price observation.
+RECORD_DTYPE = np.dtype([("ts", "<i8"), ("price", "<i8"), ("float_value", "<f4")])
+INDEX_FILE = "index.json"
+
+
+def _bucket_key(name: str, wear: str) -> str:
+    return f"{name}|{wear}"
+
+
+class PriceHistoryStore:
+    """Append-only price time series, one memory-mapped file per name/wear bucket.
+
+    Observations are appended as fixed-width records (timestamp, price in
+    cents, float value), so a bucket file is a flat array readable with
+    ``np.memmap`` without parsing. A listing is recorded when first seen and
+    whenever its price changes; repeated sightings at the same price are
+    skipped via a bounded last-price map.
+
+    Records are appended in observation order, so timestamps are sorted and
+    range queries use ``searchsorted`` on the memory-mapped column.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_tracked_listings: int = 200_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.logger = logging.getLogger("market.history")
+        self._dir = directory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._max_tracked = max(1, int(max_tracked_listings))
+        self._last_price: "OrderedDict[str, int]" = OrderedDict()
+        self._index: Dict[str, Dict[str, str]] = {}
+        self._appended = 0
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            self._load_index(index_path)
+
+    def _load_index(self, path: str) -> None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if not isinstance(index, dict):
+                raise ValueError("expected a JSON object")
+        except (OSError, ValueError) as e:
+            # A truncated or corrupt index must not keep the app from starting.
+            # Bucket file names derive from the bucket key, so buckets recorded
+            # again are reattached to their existing files.
+            self.logger.warning(
+                json.dumps(
+                    {"event": "price_history_index_unreadable", "path": path, "error": str(e)}
+                )
+            )
+            return
+        self._index = index
+
+    def _save_index(self) -> None:
+        path = os.path.join(self._dir, INDEX_FILE)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, path)
+
+    def _file_for(self, key: str, name: str, wear: str) -> str:
+        entry = self._index.get(key)
+        if entry is None:
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+            entry = {"name": name, "wear": wear, "file": f"{digest}.bin"}
+            self._index[key] = entry
+            self._save_index()
+        return os.path.join(self._dir, entry["file"])
+
+    def _changed(self, listing_id: Optional[str], price: int) -> bool:
+        if listing_id is None:
+            return True
+        if self._last_price.get(listing_id) == price:
+            self._last_price.move_to_end(listing_id)
+            return False
+        self._last_price[listing_id] = price
+        self._last_price.move_to_end(listing_id)
+        while len(self._last_price) > self._max_tracked:
+            self._last_price.popitem(last=False)
+        return True
+
+    def record(self, listings: List[Dict[str, Any]]) -> int:
+        """Append new or repriced raw CSFloat listings. Returns records written."""
+        now = int(self._clock())
+        buckets: Dict[Tuple[str, str], List[Tuple[int, int, float]]] = {}
+        with self._lock:
+            for listing in listings:
+                item = listing.get("item") or {}
+                name = item.get("item_name") or item.get("market_hash_name")
+                price = listing.get("price")
+                if not name or not isinstance(price, (int, float)):
+                    continue
+                listing_id = listing.get("id")
+                if not self._changed(
+                    str(listing_id) if listing_id is not None else None, int(price)
+                ):
+                    continue
+                fv = item.get("float_value")
+                wear = item.get("wear_name") or ""
+                buckets.setdefault((name, wear), []).append(
+                    (now, int(price), float(fv) if fv is not None else np.nan)
+                )
+            written = 0
+            for (name, wear), rows in buckets.items():
+                path = self._file_for(_bucket_key(name, wear), name, wear)
+                with open(path, "ab") as f:
+                    f.write(np.array(rows, dtype=RECORD_DTYPE).tobytes())
+                written += len(rows)
+            self._appended += written
+        return written
+
+    def _records(self, name: str, wear: str) -> np.ndarray:
+        with self._lock:
+            entry = self._index.get(_bucket_key(name, wear))
+        if entry is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        path = os.path.join(self._dir, entry["file"])
+        count = os.path.getsize(path) // RECORD_DTYPE.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        # Only whole records; a concurrent append may have a partial tail.
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+    def query(
+        self,
+        name: str,
+        wear: str = "",
+        *,
+        points: int = 100,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Min/median/max price per time bin, downsampled to at most ``points`` bins."""
+        if points < 1:
+            raise ValidationError("points must be at least 1")
+        records = self._records(name, wear)
+        ts = records["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+        window_ts = np.asarray(ts[lo:hi])
+        prices = np.asarray(records["price"][lo:hi])
+        series: List[Dict[str, Any]] = []
+        if window_ts.size:
+            first = int(start if start is not None else window_ts[0])
+            last = int(end if end is not None else window_ts[-1])
+            edges = np.linspace(first, last + 1, points + 1)
+            bounds = np.searchsorted(window_ts, edges, side="left")
+            for i in range(points):
+                a, b = int(bounds[i]), int(bounds[i + 1])
+                if a == b:
+                    continue
+                chunk = prices[a:b]
+                series.append(
+                    {
+                        "ts": int(edges[i]),
+                        "min": int(chunk.min()),
+                        "median": float(np.median(chunk)),
+                        "max": int(chunk.max()),
+                        "count": b - a,
+                    }
+                )
+        return {
+            "name": name,
+            "wear": wear or None,
+            "observations": int(window_ts.size),
+            "points": series,
+        }
+
+    def buckets(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return [{"name": e["name"], "wear": e["wear"]} for e in self._index.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "buckets": len(self._index),
+                "tracked_listings": len(self._last_price),
+                "appended": self._appended,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_price_history() -> PriceHistoryStore:
+    return PriceHistoryStore(get_settings().HISTORY_PATH)
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from ...config.settings import get_settings
+from ..csfloat.client import CSFloatClient, is_listings_observer
+from ..csfloat.scheduler import Priority
+from .store import ListingsStore, get_listings_store
+
+# Consecutive failed sweeps stretch the wait up to this multiple of the interval.
+MAX_BACKOFF_FACTOR = 8
+
+
+def _target_key(target: Dict[str, Any]) -> str:
+    return json.dumps(target, sort_keys=True, separators=(",", ":"))
+
+
+class IngestionService:
+    """Background poller keeping the local listings store fresh.
+
+    Each sweep walks every configured target (a category/def_index scope)
+    through the upstream cursor chain at prefetch priority, upserting every
+    page into the store. When a target's chain is exhausted, listings owned by
+    that target in its previous sweep that were not seen again are expired,
+    and listings reported in a non-listed state are dropped immediately.
+
+    Progress is checkpointed so a restarted process resumes mid-chain instead
+    of starting the sweep over and can still expire what it ingested before
+    the restart. Every page rewrites only the position (target, cursor, sweep
+    counter) in the checkpoint JSON file and appends the page's new listing
+    ids to a ``.seen.jsonl`` sidecar, so the per-page cost does not grow with
+    the chain. The ids each target owns are written to a ``.owned.json``
+    sidecar once, when the target's chain is finished.
+    """
+
+    def __init__(
+        self,
+        client: CSFloatClient,
+        store: ListingsStore,
+        targets: List[Dict[str, Any]],
+        *,
+        checkpoint_path: Optional[str] = None,
+        interval_seconds: float = 60.0,
+        page_limit: int = 50,
+        max_pages_per_target: int = 200,
+        sort_by: str = "most_recent",
+    ) -> None:
+        self.logger = logging.getLogger("market.ingestion")
+        self._client = client
+        self._store = store
+        self._targets = [dict(t) for t in targets] or [{}]
+        self._checkpoint_path = checkpoint_path
+        self._interval = float(interval_seconds)
+        self._page_limit = int(page_limit)
+        self._max_pages = int(max_pages_per_target)
+        self._sort_by = sort_by
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Listing ids each target saw in its last complete sweep, and in the current one.
+        self._owned: Dict[str, Set[str]] = {}
+        self._seen: Dict[str, Set[str]] = {}
+        self._position: Dict[str, Any] = {"target": 0, "cursor": None, "sweep": 0}
+        self._stats: Dict[str, Any] = {
+            "sweeps": 0,
+            "pages": 0,
+            "listings_seen": 0,
+            "expired": 0,
+            "errors": 0,
+            "last_error": None,
+            "last_sweep_seconds": None,
+        }
+        self._load_checkpoint()
+
+    # -- checkpointing ------------------------------------------------------
+
+    def _sidecar(self, suffix: str) -> str:
+        return f"{self._checkpoint_path}.{suffix}"
+
+    def _read_json(self, path: str) -> Optional[Any]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(
+                json.dumps({"event": "checkpoint_unreadable", "path": path, "error": str(e)})
+            )
+            return None
+
+    def _write_json(self, path: str, payload: Any) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def _load_checkpoint(self) -> None:
+        if not self._checkpoint_path:
+            return
+        data = self._read_json(self._checkpoint_path)
+        if not isinstance(data, dict):
+            return
+        target = int(data.get("target", 0))
+        if data.get("targets") != [_target_key(t) for t in self._targets]:
+            # Configuration changed; positions no longer line up.
+            return
+        self._position = {
+            "target": target if 0 <= target < len(self._targets) else 0,
+            "cursor": data.get("cursor"),
+            "sweep": int(data.get("sweep", 0)),
+        }
+        owned = self._read_json(self._sidecar("owned.json"))
+        if isinstance(owned, dict):
+            self._owned = {k: set(v) for k, v in owned.items()}
+        self._load_seen(_target_key(self._targets[self._position["target"]]))
+
+    def _load_seen(self, key: str) -> None:
+        path = self._sidecar("seen.jsonl")
+        if not os.path.exists(path):
+            return
+        seen: Set[str] = set()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-append.
+                        break
+                    # Lines of a target finished before the log was cleared.
+                    if entry.get("target") == key:
+                        seen.update(entry.get("ids") or ())
+        except OSError as e:
+            self.logger.warning(json.dumps({"event": "checkpoint_unreadable", "error": str(e)}))
+            return
+        if seen:
+            self._seen[key] = seen
+
+    def _save_checkpoint(self) -> None:
+        if not self._checkpoint_path:
+            return
+        payload = dict(self._position)
+        payload["targets"] = [_target_key(t) for t in self._targets]
+        self._write_json(self._checkpoint_path, payload)
+
+    def _append_seen(self, key: str, ids: List[str]) -> None:
+        if not self._checkpoint_path or not ids:
+            return
+        path = self._sidecar("seen.jsonl")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"target": key, "ids": ids}) + "\n")
+
+    def _clear_seen(self) -> None:
+        if self._checkpoint_path and os.path.exists(self._sidecar("seen.jsonl")):
+            os.remove(self._sidecar("seen.jsonl"))
+
+    # -- sweeping -----------------------------------------------------------
+
+    def _ingest_page(self, key: str, listings: List[Dict[str, Any]]) -> None:
+        live: List[Dict[str, Any]] = []
+        gone: List[str] = []
+        for entry in listings:
+            if entry.get("state", "listed") == "listed":
+                live.append(entry)
+            elif "id" in entry:
+                gone.append(str(entry["id"]))
+        # Skip the upsert when the store already receives every upstream page.
+        if not is_listings_observer(self._store.upsert):
+            self._store.upsert(live)
+        expired = self._store.remove(gone) if gone else 0
+        self._store.refresh_deal_scores()
+        seen = self._seen.setdefault(key, set())
+        fresh = [str(entry["id"]) for entry in live if "id" in entry]
+        fresh = [listing_id for listing_id in dict.fromkeys(fresh) if listing_id not in seen]
+        seen.update(fresh)
+        self._append_seen(key, fresh)
+        with self._lock:
+            self._stats["pages"] += 1
+            self._stats["listings_seen"] += len(live)
+            self._stats["expired"] += expired
+
+    def _finish_target(self, key: str) -> None:
+        seen = self._seen.pop(key, set())
+        stale = self._owned.get(key, set()) - seen
+        expired = self._store.remove(stale) if stale else 0
+        self._owned[key] = seen
+        if self._checkpoint_path:
+            self._write_json(
+                self._sidecar("owned.json"), {k: sorted(v) for k, v in self._owned.items()}
+            )
+        with self._lock:
+            self._stats["expired"] += expired
+
+    def run_once(self) -> None:
+        """Run (or resume) one full sweep over all targets."""
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            index = int(self._position["target"])
+            target = self._targets[index]
+            key = _target_key(target)
+            params = dict(target, limit=self._page_limit, sort_by=self._sort_by)
+            pages = 0
+            while not self._stop.is_set():
+                params["cursor"] = self._position["cursor"]
+                listings, cursor = self._client.fetch_listings_page(params, Priority.PREFETCH)
+                self._ingest_page(key, listings)
+                pages += 1
+                if not cursor or pages >= self._max_pages:
+                    break
+                self._position["cursor"] = cursor
+                self._save_checkpoint()
+            if self._stop.is_set():
+                return
+            self._finish_target(key)
+            self._position["cursor"] = None
+            if index + 1 < len(self._targets):
+                self._position["target"] = index + 1
+                self._save_checkpoint()
+                self._clear_seen()
+                continue
+            self._position["target"] = 0
+            self._position["sweep"] = int(self._position["sweep"]) + 1
+            self._save_checkpoint()
+            self._clear_seen()
+            with self._lock:
+                self._stats["sweeps"] += 1
+                self._stats["last_sweep_seconds"] = round(time.perf_counter() - started, 3)
+            return
+
+    def _loop(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                failures = 0
+            except Exception as e:
+                # Anything (a malformed page included) must not end the thread.
+                failures += 1
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+                self.logger.exception(
+                    json.dumps({"event": "ingest_error", "error": str(e), "failures": failures})
+                )
+            factor = min(2 ** max(0, failures - 1), MAX_BACKOFF_FACTOR)
+            self._stop.wait(self._interval * factor)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="listings-ingestion", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+        out.update(
+            {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "targets": len(self._targets),
+                "position": dict(self._position),
+            }
+        )
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_ingestion_service() -> IngestionService:
+    settings = get_settings()
+    return IngestionService(
+        CSFloatClient(),
+        get_listings_store(),
+        settings.ingest_targets,
+        checkpoint_path=settings.INGEST_CHECKPOINT_PATH,
+        interval_seconds=settings.INGEST_INTERVAL_SECONDS,
+        page_limit=settings.INGEST_PAGE_LIMIT,
+        max_pages_per_target=settings.INGEST_MAX_PAGES_PER_TARGET,
+    )
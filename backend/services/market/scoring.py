@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+def deal_scores(
+    groups: np.ndarray,
+    prices: np.ndarray,
+    floats: np.ndarray,
+    *,
+    min_peers: int = 3,
+    float_weight: float = 0.1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Score listings against their peers (same market hash name, i.e. name + wear).
+
+    Returns ``(score, peer_median, float_percentile)`` aligned with the inputs:
+
+    - ``peer_median``: median price of the listing's group.
+    - ``float_percentile``: rank of the listing's float within its group,
+      0.0 for the lowest float and 1.0 for the highest (0.5 when unknown).
+    - ``score``: ``1 - price / peer_median`` (the discount to peers) plus
+      ``float_weight * (0.5 - float_percentile)``, so cheaper and cleaner
+      listings score higher. NaN for groups with fewer than ``min_peers``.
+
+    Fully vectorized: one lexsort per key, group boundaries from ``np.unique``.
+    """
+    n = groups.size
+    score = np.full(n, np.nan)
+    median = np.full(n, np.nan)
+    pct = np.full(n, 0.5)
+    if n == 0:
+        return score, median, pct
+
+    # Peer median price: sort by (group, price) and pick the middle element(s).
+    order = np.lexsort((prices, groups))
+    g_sorted = groups[order]
+    p_sorted = prices[order].astype(np.float64)
+    _, starts, counts = np.unique(g_sorted, return_index=True, return_counts=True)
+    mid = (p_sorted[starts + (counts - 1) // 2] + p_sorted[starts + counts // 2]) / 2.0
+    per_row = np.repeat(np.arange(starts.size), counts)
+    median[order] = mid[per_row]
+    peers = np.empty(n, dtype=np.int64)
+    peers[order] = counts[per_row]
+
+    # Float percentile within the group; unknown floats stay neutral.
+    known = ~np.isnan(floats)
+    if known.any():
+        idx = np.flatnonzero(known)
+        f_order = idx[np.lexsort((floats[idx], groups[idx]))]
+        fg = groups[f_order]
+        _, f_starts, f_counts = np.unique(fg, return_index=True, return_counts=True)
+        f_group = np.repeat(np.arange(f_starts.size), f_counts)
+        rank = np.arange(f_order.size) - f_starts[f_group]
+        denom = np.maximum(f_counts[f_group] - 1, 1)
+        pct[f_order] = np.where(f_counts[f_group] > 1, rank / denom, 0.5)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discount = 1.0 - prices / median
+    score = discount + float_weight * (0.5 - pct)
+    score[(peers < min_peers) | ~(median > 0)] = np.nan
+    return score, median, pct
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import numpy as np
+from cachetools import TTLCache
+
+from ...config.settings import get_settings
+
+PERCENTILES = (10, 25, 50, 75, 90)
+UNKNOWN = "Unknown"
+
+
+def items_to_columns(items: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Transformed listing items (``{price, wear, rarity, float_value}``) as arrays."""
+    rows = list(items)
+    return {
+        "price": np.array([i.get("price") or 0 for i in rows], dtype=np.int64),
+        "float_value": np.array(
+            [np.nan if i.get("float_value") is None else i["float_value"] for i in rows],
+            dtype=np.float64,
+        ),
+        "wear": np.array([i.get("wear") or UNKNOWN for i in rows], dtype=object),
+        "rarity": np.array([i.get("rarity") or UNKNOWN for i in rows], dtype=object),
+    }
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    qs = np.percentile(values, PERCENTILES)
+    return {f"p{p}": round(float(q), 4) for p, q in zip(PERCENTILES, qs)}
+
+
+def _summary(values: np.ndarray) -> Optional[Dict[str, Any]]:
+    if values.size == 0:
+        return None
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": round(float(values.mean()), 4),
+        "percentiles": _percentiles(values),
+    }
+
+
+def compute_listing_stats(columns: Dict[str, np.ndarray], bins: int = 10) -> Dict[str, Any]:
+    """Price percentiles overall and per wear, float distribution and rarity counts.
+
+    ``columns`` holds equal-length arrays ``price`` (cents), ``float_value``
+    (NaN when unknown), ``wear`` and ``rarity`` (labels).
+    """
+    prices = columns["price"]
+    floats = columns["float_value"]
+    floats = floats[~np.isnan(floats)]
+
+    by_wear: Dict[str, Any] = {}
+    wears, wear_idx = np.unique(columns["wear"].astype(str), return_inverse=True)
+    for code, wear in enumerate(wears):
+        by_wear[str(wear)] = _summary(prices[wear_idx == code])
+
+    rarities, rarity_counts = np.unique(columns["rarity"].astype(str), return_counts=True)
+    counts, edges = np.histogram(floats, bins=bins, range=(0.0, 1.0))
+    float_stats = _summary(floats) or {"count": 0}
+    float_stats["histogram"] = {
+        "edges": [round(float(e), 6) for e in edges],
+        "counts": [int(c) for c in counts],
+    }
+    return {
+        "count": int(prices.size),
+        "price": _summary(prices),
+        "price_by_wear": by_wear,
+        "float": float_stats,
+        "rarity_counts": {str(r): int(c) for r, c in zip(rarities, rarity_counts)},
+    }
+
+
+class StatsCache:
+    """TTL cache of computed stats, keyed like the listings cache they derive from."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def get_stats_cache() -> StatsCache:
+    settings = get_settings()
+    return StatsCache(settings.CACHE_MAXSIZE, settings.CACHE_TTL_SECONDS)
@@ -0,0 +1,659 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ...config.settings import get_settings
+from ...core.exceptions import NotFoundError, ValidationError
+from ..csfloat.params import normalize_listings_params
+from ..csfloat.projection import DEFAULT_FIELDS, RARITY_LABELS
+from .scoring import deal_scores
+
+WEAR_NAMES: Tuple[str, ...] = (
+    "",
+    "Factory New",
+    "Minimal Wear",
+    "Field-Tested",
+    "Well-Worn",
+    "Battle-Scarred",
+)
+WEAR_CODES: Dict[str, int] = {name: code for code, name in enumerate(WEAR_NAMES) if name}
+TYPE_CODES: Dict[str, int] = {"buy_now": 1, "auction": 2}
+# Code -> label lookup arrays for vectorized label columns.
+_WEAR_LABELS = np.array([name or "Unknown" for name in WEAR_NAMES], dtype=object)
+_RARITY_LABELS = np.array(
+    ["Unknown"] + [RARITY_LABELS.get(code, "Unknown") for code in range(1, 128)], dtype=object
+)
+
+# sort_by -> (column, descending). Everything else is answered upstream.
+LOCAL_SORTS: Dict[str, Tuple[str, bool]] = {
+    "lowest_price": ("price", False),
+    "highest_price": ("price", True),
+    "lowest_float": ("float_value", False),
+    "highest_float": ("float_value", True),
+    "most_recent": ("created_at", True),
+    "local_deal": ("deal_score", True),
+}
+# Filters the upstream supports that the local store cannot evaluate.
+_UNSUPPORTED_FILTERS = ("cursor", "user_id", "collection", "stickers")
+# Comparables: float-nearest candidates ranked per k (at least the minimum).
+COMPARABLES_WINDOW_PER_K = 8
+COMPARABLES_MIN_WINDOW = 64
+# Item fields (see projection.FIELD_GETTERS) the snapshot keeps columns for.
+LOCAL_FIELDS: Tuple[str, ...] = DEFAULT_FIELDS + ("def_index", "paint_index", "paint_seed")
+
+_COLUMNS: Dict[str, Tuple[Any, Any]] = {
+    # name: (dtype, fill value for empty / unknown)
+    "price": (np.int64, 0),
+    "float_value": (np.float64, np.nan),
+    "rarity": (np.int8, 0),
+    "wear": (np.int8, 0),
+    "category": (np.int8, 0),
+    "type": (np.int8, 0),
+    "def_index": (np.int32, -1),
+    "paint_index": (np.int32, -1),
+    "paint_seed": (np.int32, -1),
+    "name_id": (np.int32, -1),
+    "created_at": (np.int64, 0),
+    # Snapshot version in which the row was inserted / last repriced.
+    "version_added": (np.int64, 0),
+    "version_changed": (np.int64, 0),
+    # Derived by refresh_deal_scores() for rows in dirty peer groups.
+    "deal_score": (np.float64, np.nan),
+    "peer_median": (np.float64, np.nan),
+    "float_percentile": (np.float64, np.nan),
+}
+
+
+# Columns filter_listings() builds for a page: the predicate inputs only.
+_PAGE_COLUMNS: Tuple[str, ...] = (
+    "price",
+    "float_value",
+    "rarity",
+    "wear",
+    "category",
+    "type",
+    "def_index",
+    "paint_index",
+    "paint_seed",
+    "name_id",
+)
+
+
+def _parse_timestamp(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value:
+        try:
+            return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+        except ValueError:
+            return 0
+    return 0
+
+
+def _as_int(value: Any, default: int) -> int:
+    try:
+        return int(value) if value is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _listing_values(listing: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of one raw listing, except its name and versions."""
+    fv = item.get("float_value")
+    rarity = item.get("rarity")
+    return {
+        "price": _as_int(listing.get("price"), 0),
+        "float_value": float(fv) if fv is not None else np.nan,
+        "rarity": rarity if isinstance(rarity, int) else 0,
+        "wear": WEAR_CODES.get(item.get("wear_name") or "", 0),
+        "category": 3 if item.get("is_souvenir") else 2 if item.get("is_stattrak") else 1,
+        "type": TYPE_CODES.get(listing.get("type") or "", 0),
+        "def_index": _as_int(item.get("def_index"), -1),
+        "paint_index": _as_int(item.get("paint_index"), -1),
+        "paint_seed": _as_int(item.get("paint_seed"), -1),
+    }
+
+
+def _filter_columns(
+    cols: Dict[str, np.ndarray],
+    mask: np.ndarray,
+    params: Dict[str, Any],
+    name_ids: Dict[str, int],
+    name_items: List[Optional[str]],
+) -> np.ndarray:
+    """Narrow ``mask`` to the rows of ``cols`` matching ``params``.
+
+    ``name_ids`` and ``name_items`` resolve the interned ``name_id`` column
+    (market hash name -> id, id -> item name).
+    """
+    # Same range normalization (and price units) as the upstream request.
+    ranges = normalize_listings_params(params)
+    if "min_price" in ranges:
+        mask &= cols["price"] >= ranges["min_price"]
+    if "max_price" in ranges:
+        mask &= cols["price"] <= ranges["max_price"]
+    # Listings without a float (stickers, cases) only drop out of
+    # ranges narrower than the full 0..1 wear scale.
+    fv = cols["float_value"]
+    if ranges.get("min_float", 0.0) > 0.0:
+        mask &= fv >= ranges["min_float"]
+    if ranges.get("max_float", 1.0) < 1.0:
+        mask &= fv <= ranges["max_float"]
+    if params.get("rarity"):
+        mask &= cols["rarity"] == int(params["rarity"])
+    if params.get("category"):
+        mask &= cols["category"] == int(params["category"])
+    if params.get("type"):
+        mask &= cols["type"] == TYPE_CODES.get(str(params["type"]), -1)
+    if params.get("def_index"):
+        mask &= np.isin(cols["def_index"], [int(v) for v in params["def_index"]])
+    if params.get("paint_index") is not None:
+        mask &= cols["paint_index"] == int(params["paint_index"])
+    if params.get("paint_seed"):
+        mask &= np.isin(cols["paint_seed"], [int(v) for v in params["paint_seed"]])
+    if params.get("market_hash_name"):
+        mask &= cols["name_id"] == name_ids.get(params["market_hash_name"], -2)
+    if params.get("item_name"):
+        ids = [i for i, name in enumerate(name_items) if name == params["item_name"]]
+        mask &= np.isin(cols["name_id"], ids)
+    return mask
+
+
+class ListingsStore:
+    """In-memory columnar snapshot of CSFloat listings.
+
+    Each listing occupies one row across NumPy column arrays (price in cents,
+    float value, rarity/wear/category/type codes, def_index, paint_index,
+    paint_seed and an interned market hash name id). Queries are answered with
+    vectorized boolean masks and ``argpartition`` top-K selection, so range and
+    sort queries over tens of thousands of rows take milliseconds.
+
+    Rows freed by removals are reused, so a listing keeps its row for as long
+    as it stays in the store.
+
+    Every upsert or removal that changes the snapshot bumps a monotonically
+    increasing version. Rows remember the version they were added and last
+    repriced in, and removed rows leave a tombstone (their column values) in a
+    bounded ring, so ``changes(params, since)`` can answer "what changed for
+    this query since version N" without a full re-read.
+
+    Deal scores (see ``scoring.deal_scores``) are kept per row and refreshed
+    incrementally: upserts and removals mark their peer group (market hash
+    name) dirty, and only dirty groups are rescored.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        tombstone_capacity: int = 65536,
+        *,
+        deal_min_peers: int = 3,
+        deal_float_weight: float = 0.1,
+    ) -> None:
+        self._lock = threading.RLock()
+        self._capacity = max(16, int(capacity))
+        self._cols: Dict[str, np.ndarray] = {
+            name: np.full(self._capacity, fill, dtype=dtype)
+            for name, (dtype, fill) in _COLUMNS.items()
+        }
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._ids: List[Optional[str]] = [None] * self._capacity
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._next_row = 0
+        self._names: List[str] = []
+        self._name_items: List[Optional[str]] = []
+        self._name_ids: Dict[str, int] = {}
+        self._version = 0
+        self._deal_min_peers = int(deal_min_peers)
+        self._deal_float_weight = float(deal_float_weight)
+        self._dirty_groups: Set[int] = set()
+        # name_id -> (sorted float values, rows); rebuilt lazily per stale group.
+        self._float_index: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._tomb_capacity = max(1, int(tombstone_capacity))
+        self._tombs: Dict[str, np.ndarray] = {
+            name: np.full(self._tomb_capacity, fill, dtype=dtype)
+            for name, (dtype, fill) in _COLUMNS.items()
+        }
+        self._tomb_ids: List[Optional[str]] = [None] * self._tomb_capacity
+        self._tomb_count = 0
+        # Highest version whose tombstone was overwritten; older `since` needs a reset.
+        self._tomb_floor = 0
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    # -- ingestion ----------------------------------------------------------
+
+    def _grow(self) -> None:
+        new_capacity = self._capacity * 2
+        for name, (dtype, fill) in _COLUMNS.items():
+            col = np.full(new_capacity, fill, dtype=dtype)
+            col[: self._capacity] = self._cols[name]
+            self._cols[name] = col
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: self._capacity] = self._alive
+        self._alive = alive
+        self._ids.extend([None] * (new_capacity - self._capacity))
+        self._capacity = new_capacity
+
+    def _intern(self, market_hash_name: Optional[str], item_name: Optional[str]) -> int:
+        if not market_hash_name:
+            market_hash_name = item_name
+        if not market_hash_name:
+            return -1
+        name_id = self._name_ids.get(market_hash_name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(market_hash_name)
+            self._name_items.append(item_name or market_hash_name)
+            self._name_ids[market_hash_name] = name_id
+        return name_id
+
+    def _allocate(self, listing_id: str) -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._next_row >= self._capacity:
+                self._grow()
+            row = self._next_row
+            self._next_row += 1
+        self._rows[listing_id] = row
+        self._ids[row] = listing_id
+        self._alive[row] = True
+        return row
+
+    def upsert(self, listings: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or update raw CSFloat listings (``{"id", "price", "item": {...}}``).
+
+        Returns counts of added, updated and repriced rows. Listings without an
+        id are skipped.
+        """
+        added = updated = repriced = 0
+        with self._lock:
+            cols = self._cols
+            version = self._version + 1
+            for listing in listings:
+                listing_id = listing.get("id")
+                if listing_id is None:
+                    continue
+                listing_id = str(listing_id)
+                item = listing.get("item") or {}
+                row = self._rows.get(listing_id)
+                values = _listing_values(listing, item)
+                price = values["price"]
+                if row is None:
+                    row = self._allocate(listing_id)
+                    added += 1
+                    cols["version_added"][row] = version
+                    cols["version_changed"][row] = version
+                else:
+                    updated += 1
+                    if int(cols["price"][row]) != price:
+                        repriced += 1
+                        cols["version_changed"][row] = version
+                for name, value in values.items():
+                    cols[name][row] = value
+                name_id = self._intern(item.get("market_hash_name"), item.get("item_name"))
+                self._dirty_groups.update((int(cols["name_id"][row]), name_id))
+                self._float_index.pop(int(cols["name_id"][row]), None)
+                self._float_index.pop(name_id, None)
+                cols["name_id"][row] = name_id
+                cols["created_at"][row] = _parse_timestamp(listing.get("created_at"))
+            if added or repriced:
+                self._version = version
+        return {"added": added, "updated": updated, "repriced": repriced}
+
+    def _tombstone(self, listing_id: str, row: int) -> None:
+        slot = self._tomb_count % self._tomb_capacity
+        if self._tomb_count >= self._tomb_capacity:
+            self._tomb_floor = int(self._tombs["version_changed"][slot])
+        for name, col in self._cols.items():
+            self._tombs[name][slot] = col[row]
+        # Tombstones reuse version_changed as the removal version.
+        self._tombs["version_changed"][slot] = self._version
+        self._tomb_ids[slot] = listing_id
+        self._tomb_count += 1
+
+    def remove(self, listing_ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for listing_id in listing_ids:
+                row = self._rows.pop(str(listing_id), None)
+                if row is None:
+                    continue
+                if not removed:
+                    self._version += 1
+                self._tombstone(str(listing_id), row)
+                self._dirty_groups.add(int(self._cols["name_id"][row]))
+                self._float_index.pop(int(self._cols["name_id"][row]), None)
+                self._alive[row] = False
+                self._ids[row] = None
+                self._free.append(row)
+                removed += 1
+        return removed
+
+    # -- queries ------------------------------------------------------------
+
+    @staticmethod
+    def supports(params: Dict[str, Any]) -> bool:
+        """Whether ``params`` can be answered from the local snapshot."""
+        for key in _UNSUPPORTED_FILTERS:
+            if params.get(key):
+                return False
+        if not set(params.get("fields") or ()) <= set(LOCAL_FIELDS):
+            return False
+        return (params.get("sort_by") or "lowest_price") in LOCAL_SORTS
+
+    def _mask(self, params: Dict[str, Any]) -> np.ndarray:
+        n = self._next_row
+        cols = {name: col[:n] for name, col in self._cols.items()}
+        return self._filter(cols, self._alive[:n].copy(), params)
+
+    def _filter(
+        self, cols: Dict[str, np.ndarray], mask: np.ndarray, params: Dict[str, Any]
+    ) -> np.ndarray:
+        return _filter_columns(cols, mask, params, self._name_ids, self._name_items)
+
+    def _top_k(self, rows: np.ndarray, sort_by: str, k: int) -> np.ndarray:
+        column, descending = LOCAL_SORTS[sort_by]
+        keys = self._cols[column][rows].astype(np.float64)
+        # Missing values (NaN floats) always sort last.
+        keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+        if k < len(rows):
+            part = np.argpartition(keys, k - 1)[:k]
+            rows, keys = rows[part], keys[part]
+        order = np.lexsort((rows, keys))
+        return rows[order]
+
+    def row_to_item(self, row: int, fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """Row as an API item; ``fields`` (a subset of LOCAL_FIELDS) selects the keys."""
+        cols = self._cols
+        name_id = int(cols["name_id"][row])
+        rarity = int(cols["rarity"][row])
+        fv = float(cols["float_value"][row])
+        item = {
+            "id": self._ids[row],
+            "name": self._name_items[name_id] if name_id >= 0 else None,
+            "price": int(cols["price"][row]),
+            "wear": WEAR_NAMES[int(cols["wear"][row])] or None,
+            "rarity": RARITY_LABELS.get(rarity),
+            "float_value": None if np.isnan(fv) else fv,
+        }
+        if not fields:
+            return item
+        for name in ("def_index", "paint_index", "paint_seed"):
+            if name in fields:
+                value = int(cols[name][row])
+                item[name] = value if value >= 0 else None
+        return {name: item[name] for name in fields}
+
+    def query(self, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
+        """Filter and sort the snapshot. Returns (items, total_matches)."""
+        if not self.supports(params):
+            raise ValidationError(
+                "This filter, sort_by or field cannot be answered from the local listings store."
+            )
+        sort_by = params.get("sort_by") or "lowest_price"
+        limit = max(1, _as_int(params.get("limit"), 50))
+        with self._lock:
+            if sort_by == "local_deal":
+                self.refresh_deal_scores()
+            rows = np.flatnonzero(self._mask(params))
+            total = int(rows.size)
+            if total == 0:
+                return [], 0
+            top = self._top_k(rows, sort_by, limit)
+            fields = params.get("fields")
+            return [self.row_to_item(int(r), fields) for r in top], total
+
+    def refresh_deal_scores(self) -> int:
+        """Rescore every row in dirty peer groups. Returns rows rescored."""
+        with self._lock:
+            self._dirty_groups.discard(-1)
+            if not self._dirty_groups:
+                return 0
+            n = self._next_row
+            cols = self._cols
+            groups = np.fromiter(self._dirty_groups, dtype=np.int32)
+            self._dirty_groups.clear()
+            rows = np.flatnonzero(self._alive[:n] & np.isin(cols["name_id"][:n], groups))
+            score, median, pct = deal_scores(
+                cols["name_id"][rows],
+                cols["price"][rows],
+                cols["float_value"][rows],
+                min_peers=self._deal_min_peers,
+                float_weight=self._deal_float_weight,
+            )
+            cols["deal_score"][rows] = score
+            cols["peer_median"][rows] = median
+            cols["float_percentile"][rows] = pct
+            return int(rows.size)
+
+    def top_deals(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """Highest-scoring listings matching ``params``, with their score breakdown."""
+        params = dict(params, sort_by="local_deal")
+        if not self.supports(params):
+            raise ValidationError("This filter cannot be answered from the local listings store.")
+        with self._lock:
+            self.refresh_deal_scores()
+            cols = self._cols
+            mask = self._mask(params) & ~np.isnan(cols["deal_score"][: self._next_row])
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                return []
+            out = []
+            for row in self._top_k(rows, "local_deal", max(1, int(limit))):
+                item = self.row_to_item(int(row))
+                item["deal_score"] = round(float(cols["deal_score"][row]), 6)
+                item["peer_median"] = float(cols["peer_median"][row])
+                item["float_percentile"] = round(float(cols["float_percentile"][row]), 6)
+                out.append(item)
+            return out
+
+    def _group_float_index(self, name_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        index = self._float_index.get(name_id)
+        if index is None:
+            n = self._next_row
+            cols = self._cols
+            rows = np.flatnonzero(
+                self._alive[:n]
+                & (cols["name_id"][:n] == name_id)
+                & ~np.isnan(cols["float_value"][:n])
+            )
+            order = np.argsort(cols["float_value"][rows], kind="stable")
+            index = (cols["float_value"][rows][order], rows[order])
+            self._float_index[name_id] = index
+        return index
+
+    def comparables(self, listing_id: str, k: int = 10) -> Dict[str, Any]:
+        """The ``k`` listings of the same market hash name closest in float and price.
+
+        A bisect into the per-name float-sorted index picks a window of the
+        float-nearest candidates (``COMPARABLES_WINDOW_PER_K`` per requested
+        neighbour), which are then ranked by Euclidean distance over float and
+        price, each scaled by its standard deviation within the window. Ties go
+        to the smaller float difference. A lookup costs O(log n + window) once
+        the index is built.
+        """
+        with self._lock:
+            row = self._rows.get(str(listing_id))
+            if row is None:
+                raise NotFoundError(f"Listing {listing_id} is not in the local store.")
+            cols = self._cols
+            target = self.row_to_item(row)
+            fv = float(cols["float_value"][row])
+            price = int(cols["price"][row])
+            if np.isnan(fv):
+                return {"listing": target, "comparables": []}
+            floats, rows = self._group_float_index(int(cols["name_id"][row]))
+            pos = int(np.searchsorted(floats, fv))
+            window = max(COMPARABLES_MIN_WINDOW, COMPARABLES_WINDOW_PER_K * int(k))
+            lo, hi = max(0, pos - window), min(floats.size, pos + window)
+            cand_floats = floats[lo:hi]
+            cand_rows = rows[lo:hi]
+            keep = cand_rows != row
+            cand_floats, cand_rows = cand_floats[keep], cand_rows[keep]
+            if cand_rows.size == 0:
+                return {"listing": target, "comparables": []}
+            cand_prices = cols["price"][cand_rows].astype(np.float64)
+            float_delta = cand_floats - fv
+            price_delta = cand_prices - price
+            float_scale = float(np.std(np.append(cand_floats, fv))) or 1.0
+            price_scale = float(np.std(np.append(cand_prices, price))) or 1.0
+            distance = np.hypot(float_delta / float_scale, price_delta / price_scale)
+            order = np.lexsort((np.abs(float_delta), distance))[: int(k)]
+            out = []
+            for i in order:
+                item = self.row_to_item(int(cand_rows[i]))
+                item["float_delta"] = round(float(float_delta[i]), 10)
+                item["price_delta"] = int(price_delta[i])
+                out.append(item)
+            return {"listing": target, "comparables": out}
+
+    def iter_items(
+        self, params: Dict[str, Any], chunk_size: int = 5000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Every listing matching ``params``, in row order, ``chunk_size`` at a time.
+
+        The lock is only held per chunk, so ingestion keeps running during a
+        long export; listings removed mid-export are skipped.
+        """
+        with self._lock:
+            ids = [self._ids[int(r)] for r in np.flatnonzero(self._mask(params))]
+        for start in range(0, len(ids), max(1, int(chunk_size))):
+            with self._lock:
+                chunk = []
+                for listing_id in ids[start : start + chunk_size]:
+                    row = self._rows.get(listing_id) if listing_id is not None else None
+                    if row is not None:
+                        chunk.append(self.row_to_item(row))
+            if chunk:
+                yield chunk
+
+    def columns(self, params: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Price, float, wear and rarity of every listing matching ``params``.
+
+        Wear and rarity come back as labels, for grouped aggregation.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._mask(params))
+            cols = self._cols
+            return {
+                "price": cols["price"][rows].copy(),
+                "float_value": cols["float_value"][rows].copy(),
+                "wear": _WEAR_LABELS[cols["wear"][rows]],
+                "rarity": _RARITY_LABELS[cols["rarity"][rows]],
+            }
+
+    def changes(self, params: Dict[str, Any], since: int) -> Dict[str, Any]:
+        """Listings matching ``params`` that changed after version ``since``.
+
+        Returns ``{version, reset, added, repriced, removed}``. ``removed`` holds
+        ids of listings deleted since then or repriced out of the query's
+        ranges; clients apply it before ``added``/``repriced``. ``reset`` is
+        set (with empty deltas) when ``since`` is older than the retained
+        tombstones or newer than the store, and the caller must re-read.
+        """
+        with self._lock:
+            version = self._version
+            if since < self._tomb_floor or since > version:
+                return {
+                    "version": version,
+                    "reset": True,
+                    "added": [],
+                    "repriced": [],
+                    "removed": [],
+                }
+            n = self._next_row
+            cols = {name: col[:n] for name, col in self._cols.items()}
+            alive = self._alive[:n]
+            matches = self._filter(cols, alive.copy(), params)
+            fresh = cols["version_added"] > since
+            changed = alive & ~fresh & (cols["version_changed"] > since)
+            added = np.flatnonzero(matches & fresh)
+            repriced = np.flatnonzero(matches & changed)
+            left = np.flatnonzero(changed & ~matches)
+
+            t = min(self._tomb_count, self._tomb_capacity)
+            tombs = {name: col[:t] for name, col in self._tombs.items()}
+            dead = self._filter(tombs, tombs["version_changed"] > since, params)
+            removed = [self._tomb_ids[int(i)] for i in np.flatnonzero(dead)]
+            removed += [self._ids[int(r)] for r in left]
+            return {
+                "version": version,
+                "reset": False,
+                "added": [self.row_to_item(int(r)) for r in added],
+                "repriced": [self.row_to_item(int(r)) for r in repriced],
+                "removed": sorted({str(i) for i in removed if i is not None}),
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._version,
+                "tombstones": min(self._tomb_count, self._tomb_capacity),
+                "listings": len(self._rows),
+                "capacity": self._capacity,
+                "free_rows": len(self._free),
+                "dirty_deal_groups": len(self._dirty_groups),
+                "names": len(self._names),
+            }
+
+
+def unfilterable(params: Dict[str, Any]) -> List[str]:
+    """Filters set in ``params`` that ``filter_listings`` cannot evaluate."""
+    return [key for key in _UNSUPPORTED_FILTERS if key != "cursor" and params.get(key)]
+
+
+def filter_listings(listings: List[Dict[str, Any]], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Raw listings matching ``params``, in their original order.
+
+    Applies the same predicate as local store queries (ranges in upstream
+    units, name, rarity, paint, type, ...), for pages fetched upstream with
+    only the cursor-scope parameters. Listings without an id never match.
+    Columns are built for the page alone, so the cost scales with its length.
+    """
+    n = len(listings)
+    cols = {name: np.full(n, _COLUMNS[name][1], dtype=_COLUMNS[name][0]) for name in _PAGE_COLUMNS}
+    mask = np.zeros(n, dtype=bool)
+    name_ids: Dict[str, int] = {}
+    name_items: List[Optional[str]] = []
+    for row, listing in enumerate(listings):
+        if listing.get("id") is None:
+            continue
+        mask[row] = True
+        item = listing.get("item") or {}
+        for name, value in _listing_values(listing, item).items():
+            cols[name][row] = value
+        item_name = item.get("item_name")
+        market_hash_name = item.get("market_hash_name") or item_name
+        if market_hash_name:
+            if market_hash_name not in name_ids:
+                name_ids[market_hash_name] = len(name_items)
+                name_items.append(item_name or market_hash_name)
+            cols["name_id"][row] = name_ids[market_hash_name]
+    mask = _filter_columns(cols, mask, params, name_ids, name_items)
+    return [listings[int(row)] for row in np.flatnonzero(mask)]
+
+
+@lru_cache(maxsize=1)
+def get_listings_store() -> ListingsStore:
+    settings = get_settings()
+    return ListingsStore(
+        capacity=settings.LOCAL_STORE_INITIAL_CAPACITY,
+        tombstone_capacity=settings.LOCAL_STORE_TOMBSTONES,
+        deal_min_peers=settings.DEAL_MIN_PEERS,
+        deal_float_weight=settings.DEAL_FLOAT_WEIGHT,
+    )
@@ -0,0 +1,93 @@
+"""
+Static item metadata: weapon def indexes, paint kits, collections, float caps.
+
+The catalog ships with the backend as gzip-compressed JSON
+(``item_metadata.json.gz``) and is loaded on first use. The compressed bundle
+is served as-is to clients that accept gzip, so the endpoint never
+re-serializes it; the filter pickers read the document client-side.
+
+The bundled file is a sample dataset: the stock weapons plus a handful of
+well-known paint kits and collections, enough for the pickers' common cases
+(each picker keeps a free-text fallback for the rest). Point
+``METADATA_PATH`` at another ``.json.gz`` with the same shape (``weapons``,
+``paint_kits``, ``collections``) generated from the full item schema to
+serve a complete catalog.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...config.settings import get_settings
+
+BUNDLED_PATH = os.path.join(os.path.dirname(__file__), "item_metadata.json.gz")
+
+
+class MetadataCatalog:
+    """One compressed metadata bundle with its ETag and decompressed form.
+
+    Lookup tables (def_index -> weapon, paint_index -> paint kit, collection
+    key -> collection, and (def_index, paint_index) -> collection keys) are
+    built once at load, so server-side callers never scan the lists.
+    """
+
+    def __init__(self, compressed: bytes) -> None:
+        self.compressed = compressed
+        self.etag = f'"{hashlib.sha1(compressed).hexdigest()}"'
+        self._document: Optional[bytes] = None
+        doc = json.loads(self.document)
+        self.version = doc.get("version")
+        self._counts = {
+            kind: len(doc.get(kind) or []) for kind in ("weapons", "paint_kits", "collections")
+        }
+        self.weapons: Dict[int, Dict[str, Any]] = {
+            int(w["def_index"]): w for w in doc.get("weapons") or []
+        }
+        self.paint_kits: Dict[int, Dict[str, Any]] = {
+            int(k["paint_index"]): k for k in doc.get("paint_kits") or []
+        }
+        self.collections: Dict[str, Dict[str, Any]] = {
+            c["key"]: c for c in doc.get("collections") or []
+        }
+        self._item_collections: Dict[Tuple[int, int], List[str]] = {}
+        for key, collection in self.collections.items():
+            for def_index, paint_index in collection.get("items") or []:
+                pair = (int(def_index), int(paint_index))
+                self._item_collections.setdefault(pair, []).append(key)
+
+    @classmethod
+    def load(cls, path: str) -> "MetadataCatalog":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @property
+    def document(self) -> bytes:
+        """The uncompressed JSON bundle, decompressed once on first use."""
+        if self._document is None:
+            self._document = gzip.decompress(self.compressed)
+        return self._document
+
+    def weapon_name(self, def_index: int) -> Optional[str]:
+        weapon = self.weapons.get(def_index)
+        return weapon["name"] if weapon else None
+
+    def paint_kit_name(self, paint_index: int) -> Optional[str]:
+        kit = self.paint_kits.get(paint_index)
+        return kit["name"] if kit else None
+
+    def collections_for(self, def_index: int, paint_index: int) -> List[str]:
+        """Keys of the collections containing this weapon/paint kit pair."""
+        return list(self._item_collections.get((def_index, paint_index), ()))
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._counts, version=self.version, bytes=len(self.compressed))
+
+
+@lru_cache(maxsize=1)
+def get_metadata_catalog() -> MetadataCatalog:
+    return MetadataCatalog.load(get_settings().METADATA_PATH or BUNDLED_PATH)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, wait
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from ...config.settings import get_settings
+from ...core.bulkhead import Bulkhead
+from ...core.exceptions import BackendError, CapacityExceededError
+from ...models.watchlist import Watchlist
+from ..csfloat.client import CSFloatClient
+from ..csfloat.params import listing_page_params
+from ..csfloat.projection import listing_to_item
+from ..csfloat.scheduler import Priority
+from ..market.store import filter_listings
+from .events import EventBroker, get_event_broker
+from .registry import WatchlistRegistry, get_watchlist_registry
+
+
+class WatchlistEngine:
+    """Evaluates every saved search on one shared schedule.
+
+    Watchlists with identical searches (see ``watch_key``) are evaluated once
+    per tick. Upstream is asked only for the cursor-scope parameters (ranges,
+    category, def_index, sort, limit) at prefetch priority, one request per
+    distinct scope per tick; every search then applies its remaining filters
+    (name, rarity, paint, type, ...) to that page locally, with the same
+    predicate as local store queries. Each result is diffed against the
+    previous evaluation of that search: listings not seen before
+    are ``new`` and listings whose price dropped are ``repriced``. Every
+    watcher of the request gets one event, published to SSE subscribers and
+    POSTed to its webhook if it has one. The first evaluation of a request
+    only records a baseline.
+
+    Webhooks are sent on a bounded executor (``webhook_workers`` at a time,
+    ``webhook_queue`` waiting; beyond that they are dropped and counted), so a
+    slow receiver never stalls evaluation. An exception in one tick is logged
+    and counted, and the next tick runs as scheduled.
+    """
+
+    def __init__(
+        self,
+        client: CSFloatClient,
+        registry: WatchlistRegistry,
+        broker: EventBroker,
+        *,
+        interval_seconds: float = 15.0,
+        webhook_client: Optional[httpx.Client] = None,
+        webhook_timeout: float = 5.0,
+        webhook_workers: int = 4,
+        webhook_queue: int = 256,
+    ) -> None:
+        self.logger = logging.getLogger("watchlists.engine")
+        self._client = client
+        self._registry = registry
+        self._broker = broker
+        self._interval = float(interval_seconds)
+        self._webhook_client = webhook_client or httpx.Client(timeout=webhook_timeout)
+        self._webhooks = Bulkhead("webhooks", webhook_workers, webhook_queue)
+        self._pending: Set[Future] = set()
+        self._previous: Dict[str, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._event_seq = 0
+        self._stats: Dict[str, Any] = {
+            "ticks": 0,
+            "evaluations": 0,
+            "events": 0,
+            "webhooks_sent": 0,
+            "webhook_errors": 0,
+            "webhooks_dropped": 0,
+            "errors": 0,
+            "last_error": None,
+        }
+
+    def _diff(self, key: str, items: List[Dict[str, Any]]) -> Optional[Dict[str, List]]:
+        current = {item["id"]: item.get("price") for item in items if item.get("id")}
+        previous = self._previous.get(key)
+        self._previous[key] = current
+        if previous is None:
+            return None
+        new = [i for i in items if i.get("id") and i["id"] not in previous]
+        repriced = [
+            i
+            for i in items
+            if i.get("id") in previous
+            and isinstance(i.get("price"), int)
+            and isinstance(previous[i["id"]], int)
+            and i["price"] < previous[i["id"]]
+        ]
+        return {"new": new, "repriced": repriced}
+
+    def _deliver(self, watchlist: Watchlist, diff: Dict[str, List]) -> None:
+        with self._lock:
+            self._event_seq += 1
+            seq = self._event_seq
+            self._stats["events"] += 1
+        event = {
+            "event_id": seq,
+            "watchlist_id": watchlist.id,
+            "name": watchlist.name,
+            "ts": time.time(),
+            "new": diff["new"],
+            "repriced": diff["repriced"],
+        }
+        self._broker.publish(event)
+        if not watchlist.webhook_url:
+            return
+        try:
+            future = self._webhooks.submit(
+                self._post_webhook, watchlist.id, watchlist.webhook_url, event
+            )
+        except CapacityExceededError:
+            with self._lock:
+                self._stats["webhooks_dropped"] += 1
+            self.logger.warning(json.dumps({"event": "webhook_dropped", "watchlist": watchlist.id}))
+            return
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._webhook_done)
+
+    def _post_webhook(self, watchlist_id: str, url: str, event: Dict[str, Any]) -> None:
+        try:
+            self._webhook_client.post(url, json=event).raise_for_status()
+            with self._lock:
+                self._stats["webhooks_sent"] += 1
+        except httpx.HTTPError as e:
+            with self._lock:
+                self._stats["webhook_errors"] += 1
+            self.logger.warning(
+                json.dumps({"event": "webhook_error", "watchlist": watchlist_id, "error": str(e)})
+            )
+
+    def _webhook_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush_webhooks(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued webhooks; False if some are still pending at ``timeout``."""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def run_once(self) -> int:
+        """Evaluate every distinct saved search once; returns evaluations made."""
+        groups = self._registry.grouped()
+        # Forget baselines of requests nobody watches anymore.
+        for key in list(self._previous):
+            if key not in groups:
+                del self._previous[key]
+        evaluations = 0
+        pages: Dict[str, List[Dict[str, Any]]] = {}
+        for key, (params, watchers) in groups.items():
+            if self._stop.is_set():
+                break
+            page_params = listing_page_params(params)
+            page_key = json.dumps(page_params, sort_keys=True, separators=(",", ":"))
+            try:
+                if page_key not in pages:
+                    pages[page_key], _ = self._client.fetch_listings_page(
+                        page_params, Priority.PREFETCH
+                    )
+            except BackendError as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+                self.logger.error(json.dumps({"event": "watch_eval_error", "error": str(e)}))
+                continue
+            evaluations += 1
+            raw = filter_listings(pages[page_key], params)
+            diff = self._diff(key, [listing_to_item(listing) for listing in raw])
+            if diff and (diff["new"] or diff["repriced"]):
+                for watchlist in watchers:
+                    self._deliver(watchlist, diff)
+        with self._lock:
+            self._stats["ticks"] += 1
+            self._stats["evaluations"] += evaluations
+        return evaluations
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                    self._stats["last_error"] = str(e)
+                self.logger.exception(json.dumps({"event": "watch_tick_error", "error": str(e)}))
+            self._stop.wait(self._interval)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="watchlist-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.flush_webhooks(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+        out.update(
+            {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "watchlists": len(self._registry.list()),
+                "distinct_queries": len(self._previous),
+                "broker": self._broker.stats(),
+                "webhook_executor": self._webhooks.stats(),
+            }
+        )
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_watchlist_engine() -> WatchlistEngine:
+    settings = get_settings()
+    return WatchlistEngine(
+        CSFloatClient(),
+        get_watchlist_registry(),
+        get_event_broker(),
+        interval_seconds=settings.WATCHLIST_INTERVAL_SECONDS,
+        webhook_timeout=settings.WATCHLIST_WEBHOOK_TIMEOUT_SECONDS,
+        webhook_workers=settings.WATCHLIST_WEBHOOK_WORKERS,
+        webhook_queue=settings.WATCHLIST_WEBHOOK_QUEUE,
+    )
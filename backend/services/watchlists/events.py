@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+
+class Subscription:
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, watchlist_ids: Optional[Set[str]], max_queue: int
+    ) -> None:
+        self.loop = loop
+        self.watchlist_ids = watchlist_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        return self.watchlist_ids is None or event.get("watchlist_id") in self.watchlist_ids
+
+    def _put(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow consumer loses events rather than stalling the engine.
+            self.dropped += 1
+
+
+class EventBroker:
+    """Fans watchlist events out from the engine thread to async subscribers."""
+
+    def __init__(self, max_queue: int = 100) -> None:
+        self._max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        self._published = 0
+
+    def subscribe(self, watchlist_ids: Optional[Set[str]] = None) -> Subscription:
+        """Register a subscriber; must be called from the consuming event loop."""
+        sub = Subscription(asyncio.get_running_loop(), watchlist_ids, self._max_queue)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """Thread-safe; returns the number of subscribers the event was queued for."""
+        with self._lock:
+            targets = [s for s in self._subscribers if s.wants(event)]
+            self._published += 1
+        delivered = 0
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, event)
+                delivered += 1
+            except RuntimeError:
+                # The subscriber's loop is closed; it will never read again.
+                self.unsubscribe(sub)
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._published,
+                "dropped": sum(s.dropped for s in self._subscribers),
+            }
+
+
+async def sse_events(
+    broker: EventBroker, watchlist_ids: Optional[Set[str]], heartbeat_seconds: float
+) -> AsyncIterator[str]:
+    """Server-Sent Events stream of watchlist matches, with keepalive comments."""
+    sub = broker.subscribe(watchlist_ids)
+    try:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            data = json.dumps(event, separators=(",", ":"))
+            yield f"id: {event.get('event_id', '')}\nevent: match\ndata: {data}\n\n"
+    finally:
+        broker.unsubscribe(sub)
+
+
+@lru_cache(maxsize=1)
+def get_event_broker() -> EventBroker:
+    return EventBroker()
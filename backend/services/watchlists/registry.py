@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import pydantic
+
+from ...config.settings import get_settings
+from ...core.exceptions import NotFoundError, ValidationError
+from ...models.watchlist import Watchlist, WatchlistCreate
+from ..csfloat.params import normalize_listings_params
+from ..market.store import unfilterable
+
+
+def watch_params(watchlist: Watchlist) -> Dict[str, Any]:
+    """Every filter of a saved search, with ranges normalized like upstream requests."""
+    raw = watchlist.params.model_dump()
+    params = {k: v for k, v in raw.items() if v is not None and v != "" and v != []}
+    params.update(normalize_listings_params(raw))
+    params.pop("cursor", None)
+    return params
+
+
+def watch_key(watchlist: Watchlist) -> str:
+    """Canonical form of a saved search; equal keys share one evaluation."""
+    return json.dumps(watch_params(watchlist), sort_keys=True, separators=(",", ":"))
+
+
+class WatchlistRegistry:
+    """Saved searches persisted as a JSON list (atomic rewrite on every change)."""
+
+    def __init__(self, path: Optional[str], webhook_hosts: Sequence[str] = ()) -> None:
+        self.logger = logging.getLogger("watchlists.registry")
+        self._path = path
+        self._webhook_hosts = {h.lower() for h in webhook_hosts}
+        self._lock = threading.Lock()
+        self._items: Dict[str, Watchlist] = {}
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def _load(self, path: str) -> None:
+        items: Dict[str, Watchlist] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for raw in json.load(f):
+                    watchlist = Watchlist(**raw)
+                    items[watchlist.id] = watchlist
+        except (OSError, ValueError, TypeError, pydantic.ValidationError) as e:
+            # A truncated or corrupt file must not keep the app from starting.
+            self.logger.warning(
+                json.dumps({"event": "watchlists_file_unreadable", "path": path, "error": str(e)})
+            )
+            return
+        self._items = items
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([w.model_dump() for w in self._items.values()], f)
+        os.replace(tmp, self._path)
+
+    def _check_webhook(self, url: Optional[str]) -> None:
+        if not url:
+            return
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValidationError("webhook_url must be an http(s) URL")
+        if parsed.hostname.lower() not in self._webhook_hosts:
+            raise ValidationError(
+                f"webhook_url host {parsed.hostname!r} is not allowed (WATCHLIST_WEBHOOK_HOSTS)"
+            )
+
+    def create(self, spec: WatchlistCreate) -> Watchlist:
+        self._check_webhook(spec.webhook_url)
+        unsupported = unfilterable(spec.params.model_dump())
+        if unsupported:
+            raise ValidationError(f"Watchlists cannot filter on {', '.join(unsupported)}")
+        watchlist = Watchlist(id=uuid.uuid4().hex[:12], created_at=time.time(), **spec.model_dump())
+        with self._lock:
+            self._items[watchlist.id] = watchlist
+            self._save()
+        return watchlist
+
+    def delete(self, watchlist_id: str) -> None:
+        with self._lock:
+            if self._items.pop(watchlist_id, None) is None:
+                raise NotFoundError(f"Watchlist {watchlist_id} does not exist.")
+            self._save()
+
+    def list(self) -> List[Watchlist]:
+        with self._lock:
+            return list(self._items.values())
+
+    def grouped(self) -> Dict[str, Tuple[Dict[str, Any], List[Watchlist]]]:
+        """Watchlists grouped by watch_key -> (search params, watchers)."""
+        groups: Dict[str, Tuple[Dict[str, Any], List[Watchlist]]] = {}
+        for watchlist in self.list():
+            key = watch_key(watchlist)
+            if key not in groups:
+                groups[key] = (json.loads(key), [])
+            groups[key][1].append(watchlist)
+        return groups
+
+
+@lru_cache(maxsize=1)
+def get_watchlist_registry() -> WatchlistRegistry:
+    settings = get_settings()
+    return WatchlistRegistry(settings.WATCHLIST_PATH, settings.watchlist_webhook_hosts)
@@ -0,0 +1,372 @@
+"""
+End-to-end load benchmarks for the backend.
+
+Starts the local CSFloat simulator (``backend.cli.fake_upstream``) together
+with a fake OpenAI-compatible chat endpoint in this process, launches the
+backend under uvicorn pointed at both, and drives ``/listings``,
+``/item-names/suggest`` and ``/analyze`` at a fixed concurrency. Request keys
+follow a Zipf distribution over ``--keys`` distinct queries, so a few hot
+keys dominate as they do with real users.
+
+Each scenario reports throughput, p50/p95/p99 latency, the status mix, the
+``/listings`` cache hit ratio and how many upstream (or LLM) calls it cost.
+The JSON result records the commit and configuration; pass ``--baseline`` to
+print the change against an earlier result.
+
+Usage:
+    python -m benchmarks.run --requests 2000 --concurrency 16 --zipf 1.1
+    # or: make bench ARGS="--scenarios listings --upstream-latency exp:0.05"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import uvicorn
+
+from backend.cli.fake_upstream import (
+    ITEM_NAMES_PATH,
+    LISTINGS_PATH,
+    STATS_PATH,
+    FakeUpstream,
+    FakeUpstreamConfig,
+    latency_sampler,
+)
+
+from .workload import Sample, ZipfKeys, compare, summarize
+
+SCENARIOS = ("listings", "item_names", "analyze")
+BENCH_MODEL = "openai:bench-model"
+
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[Tuple[int, Optional[str]]]]
+
+
+class FakeLLM:
+    """Minimal OpenAI-compatible ``/v1/chat/completions`` with configurable latency."""
+
+    def __init__(self, latency: str = "fixed:0.05", seed: int = 0) -> None:
+        self._latency = latency_sampler(latency, random.Random(seed))
+        self.calls = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        more = True
+        while more:
+            message = await receive()
+            more = message.get("more_body", False)
+        self.calls += 1
+        await asyncio.sleep(self._latency())
+        body = json.dumps(
+            {
+                "id": f"chatcmpl-bench-{self.calls}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "bench-model",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "1. Cheapest listing."},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class BenchUpstream:
+    """One ASGI app for both stand-ins: ``/v1/...`` goes to the LLM, the rest to CSFloat."""
+
+    def __init__(self, csfloat: FakeUpstream, llm: FakeLLM) -> None:
+        self.csfloat = csfloat
+        self.llm = llm
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/v1/"):
+            await self.llm(scope, receive, send)
+        else:
+            await self.csfloat(scope, receive, send)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def _serve_in_thread(app: Any, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off")
+    )
+    threading.Thread(target=server.run, name="bench-upstream", daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Fake upstream did not start")
+        time.sleep(0.05)
+    return server
+
+
+def _start_backend(port: int, upstream: str, data_dir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        CSFLOAT_API_URL=f"{upstream}{LISTINGS_PATH}",
+        CSFLOAT_ITEM_NAMES_URL=f"{upstream}{ITEM_NAMES_PATH}",
+        CSFLOAT_API_KEY="bench-key",
+        CSFLOAT_TRANSPORT_MODE="live",
+        HTTP2_ENABLED="false",
+        OPENAI_API_KEY="bench-key",
+        OPENAI_BASE_URL=f"{upstream}/v1",
+        LLM_PROVIDER="openai",
+        ITEM_NAMES_PATH=os.path.join(data_dir, "item_names.json"),
+        HISTORY_PATH=os.path.join(data_dir, "history"),
+        INGEST_ENABLED="false",
+        WATCHLISTS_ENABLED="false",
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "backend.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+def _wait_until(check: Callable[[], bool], what: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {what}")
+
+
+async def drive(
+    client: httpx.AsyncClient, request: RequestFn, keys: ZipfKeys, total: int, concurrency: int
+) -> Tuple[List[Sample], float]:
+    """Send ``total`` requests from ``concurrency`` workers; returns samples and wall time."""
+    samples: List[Sample] = []
+    remaining = iter(range(total))
+
+    async def worker() -> None:
+        for _ in remaining:
+            key = keys.sample()
+            start = time.perf_counter()
+            try:
+                status, cache = await request(client, key)
+            except httpx.HTTPError:
+                status, cache = 599, None
+            samples.append(Sample(time.perf_counter() - start, status, cache))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def listings_request(n_keys: int) -> RequestFn:
+    async def request(client: httpx.AsyncClient, key: int) -> Tuple[int, Optional[str]]:
+        # One distinct, non-empty query per key.
+        params: Dict[str, Any] = {
+            "min_float": round(key * 0.4 / n_keys, 6),
+            "sort_by": "lowest_price",
+        }
+        resp = await client.get("/listings/", params=params, headers={"Accept": "application/json"})
+        cache = resp.json().get("meta", {}).get("cache") if resp.status_code == 200 else None
+        return resp.status_code, cache
+
+    return request
+
+
+def item_names_request(prefixes: Sequence[str]) -> RequestFn:
+    async def request(client: httpx.AsyncClient, key: int) -> Tuple[int, Optional[str]]:
+        resp = await client.get(
+            "/item-names/suggest", params={"q": prefixes[key % len(prefixes)], "limit": 10}
+        )
+        return resp.status_code, None
+
+    return request
+
+
+def analyze_request(items: List[Dict[str, Any]]) -> RequestFn:
+    async def request(client: httpx.AsyncClient, key: int) -> Tuple[int, Optional[str]]:
+        payload = {
+            "question": f"Which listing is the best deal? (variant {key})",
+            "items": items,
+            "model": BENCH_MODEL,
+            "max_items": len(items),
+        }
+        resp = await client.post("/analyze/", json=payload)
+        return resp.status_code, None
+
+    return request
+
+
+def _name_prefixes(names: Sequence[str], limit: int) -> List[str]:
+    prefixes: Dict[str, None] = {}
+    for name in names:
+        for word in name.replace("|", " ").split():
+            for length in (2, 4, 6):
+                if len(word) >= length:
+                    prefixes.setdefault(word[:length].lower(), None)
+    return list(prefixes)[:limit] or ["ak"]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeUpstream(
+        FakeUpstreamConfig(
+            items=args.items,
+            seed=args.seed,
+            latency=args.upstream_latency,
+            error_rate=args.upstream_error_rate,
+            rate_limit=args.upstream_rate_limit,
+        )
+    )
+    llm = FakeLLM(args.llm_latency, seed=args.seed)
+    upstream_port, backend_port = _free_port(), _free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    backend_url = f"http://127.0.0.1:{backend_port}"
+    server = _serve_in_thread(BenchUpstream(fake, llm), upstream_port)
+    data_dir = tempfile.mkdtemp(prefix="csfloat-bench-")
+    backend = _start_backend(backend_port, upstream_url, data_dir)
+    results: Dict[str, Any] = {}
+    try:
+        _wait_until(lambda: httpx.get(f"{backend_url}/metrics/").status_code == 200, "the backend")
+        # The item-names catalog loads from the fake in the background.
+        _wait_until(
+            lambda: bool(
+                (httpx.get(f"{backend_url}/metrics/").json().get("item_names") or {}).get("names")
+            ),
+            "the item-names catalog",
+        )
+        names = httpx.get(f"{upstream_url}{ITEM_NAMES_PATH}", params={"limit": 500}).json()
+        sample_page = httpx.get(f"{backend_url}/listings/", params={"limit": 10}).json()
+        limits = httpx.Limits(
+            max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+        )
+        requests: Dict[str, RequestFn] = {
+            "listings": listings_request(args.keys),
+            "item_names": item_names_request(_name_prefixes(names["names"], args.keys)),
+            "analyze": analyze_request(sample_page["data"]),
+        }
+        async with httpx.AsyncClient(base_url=backend_url, limits=limits, timeout=60.0) as client:
+            for name in args.scenarios:
+                keys = ZipfKeys(args.keys, args.zipf, seed=args.seed)
+                upstream_before = httpx.get(f"{upstream_url}{STATS_PATH}").json().get("requests", 0)
+                llm_before = llm.calls
+                samples, duration = await drive(
+                    client, requests[name], keys, args.requests, args.concurrency
+                )
+                upstream_after = httpx.get(f"{upstream_url}{STATS_PATH}").json().get("requests", 0)
+                calls = (
+                    llm.calls - llm_before
+                    if name == "analyze"
+                    else upstream_after - upstream_before
+                )
+                results[name] = summarize(samples, duration, calls)
+                print(f"{name}: {json.dumps(results[name])}", file=sys.stderr)
+    finally:
+        backend.terminate()
+        try:
+            backend.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            backend.kill()
+        server.should_exit = True
+    return {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        "scenarios": results,
+    }
+
+
+def _scenarios(raw: str) -> List[str]:
+    chosen = [s.strip() for s in raw.split(",") if s.strip()]
+    unknown = sorted(set(chosen) - set(SCENARIOS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown scenarios: {', '.join(unknown)}")
+    return chosen
+
+
+def _parse_args(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Load-test the backend against local CSFloat and LLM stand-ins.",
+    )
+    parser.add_argument(
+        "--scenarios", type=_scenarios, default=list(SCENARIOS), help=",".join(SCENARIOS)
+    )
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--keys", type=int, default=200, help="Distinct queries per scenario")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--items", type=int, default=5000, help="Synthetic upstream listings")
+    parser.add_argument("--upstream-latency", default="lognormal:-3.5,0.5")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--upstream-rate-limit", type=int, default=0)
+    parser.add_argument("--llm-latency", default="fixed:0.05")
+    parser.add_argument("--out", default="data/bench/latest.json", help="Where to write JSON")
+    parser.add_argument("--baseline", help="Earlier result to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    report = asyncio.run(run_benchmarks(args))
+    directory = os.path.dirname(args.out)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"wrote {args.out}", file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            for line in compare(report, json.load(f)):
+                print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
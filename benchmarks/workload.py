@@ -0,0 +1,106 @@
+"""
+Workload generation and result summaries for the load benchmarks.
+
+Kept free of I/O so the sampling and the percentile math can be unit tested.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class ZipfKeys:
+    """Draws key ranks 0..n-1 with P(k) proportional to 1 / (k + 1) ** s.
+
+    ``s = 0`` is uniform; around 1 a handful of hot keys dominate, which is
+    what a shared cache sees from real users.
+    """
+
+    def __init__(self, n: int, s: float = 1.1, seed: int = 0) -> None:
+        if n < 1:
+            raise ValueError("Key space must hold at least one key")
+        self.n = n
+        self._keys = range(n)
+        self._cum_weights = list(accumulate(1.0 / (k + 1) ** s for k in range(n)))
+        self._rng = random.Random(seed)
+
+    def sample(self) -> int:
+        return self._rng.choices(self._keys, cum_weights=self._cum_weights)[0]
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending sequence (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Sample:
+    __slots__ = ("latency", "status", "cache")
+
+    def __init__(self, latency: float, status: int, cache: Optional[str] = None) -> None:
+        self.latency = latency
+        self.status = status
+        self.cache = cache
+
+
+# Cache statuses from /listings meta.cache that did not cost an upstream body.
+CACHE_HITS = ("HIT", "REVALIDATED", "LOCAL")
+
+
+def summarize(samples: List[Sample], duration: float, upstream_calls: int) -> Dict[str, Any]:
+    """Throughput, latency percentiles (ms), status and cache mix for one scenario."""
+    latencies = sorted(s.latency * 1000.0 for s in samples)
+    statuses = Counter(str(s.status) for s in samples)
+    caches = Counter(s.cache for s in samples if s.cache)
+    looked_up = sum(caches.values())
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status >= 400),
+        "status": dict(statuses),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(samples) / duration, 2) if duration > 0 else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+            "mean": ms(sum(latencies) / len(latencies) if latencies else None),
+        },
+        "cache": dict(caches),
+        "cache_hit_ratio": (
+            round(sum(caches[c] for c in CACHE_HITS) / looked_up, 4) if looked_up else None
+        ),
+        "upstream_calls": upstream_calls,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """One line per scenario with throughput and p95/p99 change against ``baseline``."""
+    lines = []
+    for name, result in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            lines.append(f"{name}: no baseline")
+            continue
+        parts = []
+        for label, now, then in (
+            ("rps", result["throughput_rps"], before["throughput_rps"]),
+            ("p95", result["latency_ms"]["p95"], before["latency_ms"]["p95"]),
+            ("p99", result["latency_ms"]["p99"], before["latency_ms"]["p99"]),
+        ):
+            if now is None or not then:
+                parts.append(f"{label} n/a")
+            else:
+                parts.append(f"{label} {then:g} -> {now:g} ({(now - then) / then:+.1%})")
+        lines.append(f"{name}: " + ", ".join(parts))
+    return lines
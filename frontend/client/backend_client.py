@@ -1,15 +1,66 @@
+import threading
 import time
-from typing import Any, Dict, List, Optional, Type
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import httpx
-from config.settings import API_BASE_URL, LISTINGS_ENDPOINT
+from client.wire import LISTINGS_ACCEPT, decode_payload
+from config.settings import (
+    ANALYZE_TIMEOUT_SECONDS,
+    API_BASE_URL,
+    ITEM_NAMES_SUGGEST_ENDPOINT,
+    LISTINGS_ENDPOINT,
+    METADATA_ENDPOINT,
+    REQUEST_TIMEOUT_SECONDS,
+)
 from models.listing_models import ItemDTO
 
+TIMEOUT_HEADER = "X-Request-Timeout"
+
 _client = httpx.Client(
-    timeout=httpx.Timeout(connect=3.05, read=10.0, write=10.0, pool=3.0),
+    timeout=httpx.Timeout(
+        connect=3.05, read=REQUEST_TIMEOUT_SECONDS, write=REQUEST_TIMEOUT_SECONDS, pool=3.0
+    ),
 )
 
 
+class EtagCache:
+    """
+    Small LRU of (ETag, payload) per GET request, used to revalidate with If-None-Match.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Any] | None, accept: str | None) -> Tuple[Any, ...]:
+        flat = sorted((str(k), repr(v)) for k, v in (params or {}).items())
+        return (url, tuple(flat), accept)
+
+    def get(self, key: Tuple[Any, ...]) -> Tuple[str, Dict[str, Any]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[Any, ...], etag: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (etag, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_etag_cache = EtagCache()
+
+
 class ApiClientError(Exception):
     """
     Exception for API client errors.
@@ -72,15 +123,41 @@ def _request_json(
     params: Dict[str, Any] | None = None,
     json: Any | None = None,
     error_cls: Type[ApiClientError] = ApiClientError,
+    timeout: float | None = None,
+    accept: str | None = None,
+    revalidate: bool = False,
 ) -> Dict[str, Any]:
     """
     Make an HTTP request and return JSON response, raising error_cls on failure.
+
+    The request budget (``timeout`` or REQUEST_TIMEOUT_SECONDS) is sent as a
+    relative X-Request-Timeout so the backend can drop work we gave up on.
+    ``accept`` may ask for a compact encoding; responses are decoded by type.
+    With ``revalidate`` the last payload of the same GET is kept with its ETag
+    and reused when the server answers 304 Not Modified.
     """
+    budget = float(timeout) if timeout is not None else REQUEST_TIMEOUT_SECONDS
+    headers = {TIMEOUT_HEADER: f"{budget:.3f}"}
+    if accept:
+        headers["Accept"] = accept
+    cache_key = EtagCache.key(url, params, accept) if revalidate else None
+    cached = _etag_cache.get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
     try:
-        resp = _client.request(method, url, params=params, json=json)
+        resp = _client.request(
+            method,
+            url,
+            params=params,
+            json=json,
+            headers=headers,
+            timeout=httpx.Timeout(connect=3.05, read=budget, write=budget, pool=3.0),
+        )
+        if resp.status_code == 304 and cached is not None:
+            return dict(cached[1])
         payload: Dict[str, Any] | None = None
         try:
-            payload = resp.json()
+            payload = decode_payload(resp.headers.get("content-type", ""), resp.content)
         except Exception:
             payload = None
 
@@ -93,6 +170,9 @@ def _request_json(
 
         if not isinstance(payload, dict):
             raise error_cls("Unexpected response format from server.")
+        etag = resp.headers.get("etag")
+        if cache_key is not None and etag:
+            _etag_cache.put(cache_key, etag, payload)
         return payload
     except httpx.ConnectTimeout:
         raise error_cls("Connection timed out. Please try again.")
@@ -122,7 +202,14 @@ def fetch_listings(params: Dict[str, Any]) -> List[ItemDTO]:
     start = time.time()
     # Remove keys with None values before making the request
     clean_params = {k: v for k, v in params.items() if v is not None}
-    data = _request_json("GET", LISTINGS_ENDPOINT, params=clean_params, error_cls=ApiClientError)
+    data = _request_json(
+        "GET",
+        LISTINGS_ENDPOINT,
+        params=clean_params,
+        error_cls=ApiClientError,
+        accept=LISTINGS_ACCEPT,
+        revalidate=True,
+    )
 
     items_raw = data.get("data")
     if not isinstance(items_raw, list):
@@ -139,6 +226,31 @@ def fetch_listings(params: Dict[str, Any]) -> List[ItemDTO]:
     return listings
 
 
+def fetch_name_suggestions(query: str, limit: int = 10) -> List[str]:
+    """
+    Ranked market hash name completions from the backend's item-names catalog.
+    """
+    data = _request_json(
+        "GET",
+        ITEM_NAMES_SUGGEST_ENDPOINT,
+        params={"q": query, "limit": limit},
+        error_cls=ApiClientError,
+        timeout=3.0,
+    )
+    names = data.get("names")
+    return [n for n in names if isinstance(n, str)] if isinstance(names, list) else []
+
+
+def fetch_item_metadata() -> Dict[str, Any]:
+    """
+    Static weapon, paint kit and collection metadata for the filter pickers.
+    """
+    data = _request_json("GET", METADATA_ENDPOINT, error_cls=ApiClientError, timeout=5.0)
+    if not isinstance(data.get("weapons"), list):
+        raise ApiClientError("Unexpected metadata payload from server.")
+    return data
+
+
 class BackendClient:
     """
     Client for backend analysis and listings.
@@ -152,7 +264,12 @@ class BackendClient:
         Fetch listings from backend API.
         """
         data = _request_json(
-            "GET", f"{self.base_url}/listings", params=params, error_cls=BackendApiError
+            "GET",
+            f"{self.base_url}/listings",
+            params=params,
+            error_cls=BackendApiError,
+            accept=LISTINGS_ACCEPT,
+            revalidate=True,
         )
         results = data.get("data")
         return results if isinstance(results, list) else []
@@ -183,6 +300,10 @@ class BackendClient:
             "max_items": max_items,
         }
         data = _request_json(
-            "POST", f"{self.base_url}/analyze/", json=payload, error_cls=BackendApiError
+            "POST",
+            f"{self.base_url}/analyze/",
+            json=payload,
+            error_cls=BackendApiError,
+            timeout=ANALYZE_TIMEOUT_SECONDS,
         )
         return data.get("result") or data.get("answer") or "No answer returned."
@@ -0,0 +1,59 @@
+"""
+Decoding of the backend's compact listing formats (see backend/core/wire.py).
+
+MessagePack is requested when the optional ``msgpack`` package is installed;
+Arrow IPC responses are decoded when ``pyarrow`` is available. Otherwise the
+client keeps asking for JSON.
+"""
+
+import json
+from typing import Any, Dict, List
+
+try:
+    import msgpack
+
+    _HAS_MSGPACK = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_MSGPACK = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+
+    _HAS_PYARROW = True
+except Exception:  # pragma: no cover - optional dependency
+    _HAS_PYARROW = False
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+
+# Accept header for listing requests: compact when we can decode it, JSON otherwise.
+LISTINGS_ACCEPT = f"{MSGPACK}, {JSON};q=0.5" if _HAS_MSGPACK else JSON
+
+
+def _from_msgpack(content: bytes) -> Dict[str, Any]:
+    doc = msgpack.unpackb(content, raw=False)
+    cols: Dict[str, List[Any]] = doc.get("cols") or {}
+    for field, labels in (doc.get("dict") or {}).items():
+        cols[field] = [labels[c] if c is not None else None for c in cols.get(field, [])]
+    fields = list(cols)
+    rows = [dict(zip(fields, values)) for values in zip(*(cols[f] for f in fields))]
+    return {"data": rows, "meta": doc.get("meta")}
+
+
+def _from_arrow(content: bytes) -> Dict[str, Any]:
+    reader = pa_ipc.open_stream(pa.BufferReader(content))
+    table = reader.read_all()
+    raw_meta = (reader.schema.metadata or {}).get(b"meta")
+    return {"data": table.to_pylist(), "meta": json.loads(raw_meta) if raw_meta else None}
+
+
+def decode_payload(content_type: str, content: bytes) -> Any:
+    """Decode a response body by media type; JSON is the fallback."""
+    media = (content_type or "").split(";")[0].strip().lower()
+    if media == MSGPACK and _HAS_MSGPACK:
+        return _from_msgpack(content)
+    if media == ARROW and _HAS_PYARROW:
+        return _from_arrow(content)
+    return json.loads(content)
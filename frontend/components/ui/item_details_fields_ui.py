@@ -2,6 +2,7 @@ from typing import List, Optional, Tuple
 
 import streamlit as st
 from components.ui.item_filter_utils import WIDGET_KEY_PREFIX, parse_csv_ints
+from components.ui.item_metadata import OTHER, metadata_entries, metadata_select
 
 
 def render_item_details() -> (
@@ -10,6 +11,9 @@ def render_item_details() -> (
     """
     Render UI fields for item details and return their values.
 
+    When item metadata is available, paint kit and collection are picked from
+    the catalog; choosing "Other…" uses the free-text field below the picker.
+
     Returns:
         Tuple[Optional[List[int]], Optional[int], Optional[str], Optional[str]]: Paint seeds, paint index, user ID, and collection name.
     """
@@ -17,8 +21,37 @@ def render_item_details() -> (
         "Paint Seed (comma separated)", "", key=f"{WIDGET_KEY_PREFIX}paint_seed"
     )
     paint_seeds = parse_csv_ints(paint_seed_input)
-    paint_index_raw = st.text_input("Paint Index", "", key=f"{WIDGET_KEY_PREFIX}paint_index")
-    paint_index = int(paint_index_raw) if paint_index_raw.strip().isdigit() else None
+
+    kits = metadata_entries("paint_kits")
+    picked_kit = (
+        metadata_select("Paint Kit", kits, "paint_index", f"{WIDGET_KEY_PREFIX}paint_index_pick")
+        if kits
+        else OTHER
+    )
+    kit = next((k for k in kits if k["paint_index"] == picked_kit), None)
+    if kit:
+        st.caption(f"Float range: {kit.get('min_float')} – {kit.get('max_float')}")
+    paint_index_raw = st.text_input(
+        "Other Paint Index" if kits else "Paint Index", "", key=f"{WIDGET_KEY_PREFIX}paint_index"
+    )
+    paint_index: Optional[int]
+    if picked_kit == OTHER:
+        paint_index = int(paint_index_raw) if paint_index_raw.strip().isdigit() else None
+    else:
+        paint_index = picked_kit
+
     user_id = st.text_input("User ID", "", key=f"{WIDGET_KEY_PREFIX}user_id") or None
-    collection = st.text_input("Collection", "", key=f"{WIDGET_KEY_PREFIX}collection") or None
+
+    collections = metadata_entries("collections")
+    picked_collection = (
+        metadata_select("Collection", collections, "key", f"{WIDGET_KEY_PREFIX}collection_pick")
+        if collections
+        else OTHER
+    )
+    collection_raw = st.text_input(
+        "Other Collection" if collections else "Collection",
+        "",
+        key=f"{WIDGET_KEY_PREFIX}collection",
+    )
+    collection = (collection_raw or None) if picked_collection == OTHER else picked_collection
     return paint_seeds, paint_index, user_id, collection
@@ -2,6 +2,7 @@ from typing import List, Optional, Tuple
 
 import streamlit as st
 from components.ui.item_filter_utils import WIDGET_KEY_PREFIX, parse_csv_ints
+from components.ui.item_metadata import metadata_entries, metadata_label
 from config.settings import CATEGORY_OPTIONS, DEFAULT_LIMIT, DEFAULT_SORT_INDEX, SORT_OPTIONS
 
 
@@ -20,8 +21,22 @@ def render_basic_filters() -> Tuple[str, int, str, str, Optional[List[int]]]:
     category = st.selectbox(
         "Category", CATEGORY_OPTIONS, index=0, key=f"{WIDGET_KEY_PREFIX}category"
     )
+    weapons = metadata_entries("weapons")
+    picked: List[int] = []
+    if weapons:
+        picked = st.multiselect(
+            "Weapons",
+            [w["def_index"] for w in weapons],
+            format_func=lambda d: metadata_label(weapons, "def_index", d),
+            key=f"{WIDGET_KEY_PREFIX}def_index_pick",
+        )
+    # Free-text def indexes are kept alongside the picker for weapons the
+    # catalog does not list.
     def_index_raw = st.text_input(
-        "Def Index (comma separated)", "", key=f"{WIDGET_KEY_PREFIX}def_index"
+        "Other Def Index (comma separated)" if weapons else "Def Index (comma separated)",
+        "",
+        key=f"{WIDGET_KEY_PREFIX}def_index",
     )
-    def_index = parse_csv_ints(def_index_raw)
+    typed = parse_csv_ints(def_index_raw) or []
+    def_index = list(dict.fromkeys(picked + typed)) or None
     return cursor, limit, sort_by, category, def_index
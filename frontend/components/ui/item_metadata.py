@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+from client.backend_client import ApiClientError, fetch_item_metadata
+
+# Picker option that defers to the free-text field under it, for values the
+# catalog does not list.
+OTHER = "Other…"
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def load_item_metadata() -> Dict[str, Any]:
+    """
+    Static item metadata from the backend, or an empty dict when it is unavailable.
+    """
+    try:
+        return fetch_item_metadata()
+    except ApiClientError:
+        return {}
+
+
+def metadata_entries(kind: str) -> List[Dict[str, Any]]:
+    """
+    Entries of one metadata table ("weapons", "paint_kits", "collections").
+    """
+    entries = load_item_metadata().get(kind)
+    return [e for e in entries if isinstance(e, dict)] if isinstance(entries, list) else []
+
+
+def metadata_label(entries: List[Dict[str, Any]], id_key: str, value: Optional[Any]) -> str:
+    """
+    Display label "Name (id)" for a picker option.
+    """
+    if value is None or value == "":
+        return "Any"
+    if value == OTHER:
+        return OTHER
+    for entry in entries:
+        if entry.get(id_key) == value:
+            return f"{entry.get('name')} ({value})"
+    return str(value)
+
+
+def metadata_select(
+    label: str, entries: List[Dict[str, Any]], id_key: str, key: str
+) -> Optional[Any]:
+    """
+    Single-choice picker over ``entries``: None ("Any"), an entry id, or ``OTHER``.
+    """
+    return st.selectbox(
+        label,
+        [None] + [e[id_key] for e in entries] + [OTHER],
+        format_func=lambda v: metadata_label(entries, id_key, v),
+        key=key,
+    )
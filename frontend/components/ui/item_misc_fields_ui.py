@@ -1,9 +1,18 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import streamlit as st
+from client.backend_client import ApiClientError, fetch_name_suggestions
 from components.ui.item_filter_utils import WIDGET_KEY_PREFIX
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _name_suggestions(query: str) -> List[str]:
+    try:
+        return fetch_name_suggestions(query)
+    except ApiClientError:
+        return []
+
+
 def render_misc_fields() -> Tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Render UI for miscellaneous item fields (market hash name, type, stickers).
@@ -11,9 +20,21 @@ def render_misc_fields() -> Tuple[Optional[str], Optional[str], Optional[str]]:
     Returns:
         Tuple[Optional[str], Optional[str], Optional[str]]: Market hash name, type, stickers.
     """
-    market_hash_name = (
-        st.text_input("Market Hash Name (manual search)", "", key=f"{WIDGET_KEY_PREFIX}mhn") or None
-    )
+    typed = st.text_input(
+        "Market Hash Name",
+        "",
+        key=f"{WIDGET_KEY_PREFIX}mhn",
+        help="Type part of a name and apply to pick from matching catalog names.",
+    ).strip()
+    market_hash_name = typed or None
+    suggestions = [s for s in _name_suggestions(typed) if s != typed] if typed else []
+    if suggestions:
+        market_hash_name = (
+            st.selectbox(
+                "Matching names", [typed] + suggestions, index=0, key=f"{WIDGET_KEY_PREFIX}mhn_pick"
+            )
+            or None
+        )
     type_ = st.selectbox(
         "Type", ["", "buy_now", "auction"], index=0, key=f"{WIDGET_KEY_PREFIX}type"
     )
@@ -8,6 +8,13 @@ load_dotenv()
 
 API_BASE_URL: str = os.getenv("API_BASE_URL", "http://localhost:8000")
 LISTINGS_ENDPOINT: str = f"{API_BASE_URL}/listings/"
+ITEM_NAMES_SUGGEST_ENDPOINT: str = f"{API_BASE_URL}/item-names/suggest"
+METADATA_ENDPOINT: str = f"{API_BASE_URL}/metadata/"
+
+# Request budgets (seconds). Sent to the backend as a relative
+# X-Request-Timeout so it stops working on requests we have abandoned.
+REQUEST_TIMEOUT_SECONDS: float = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "10"))
+ANALYZE_TIMEOUT_SECONDS: float = float(os.getenv("ANALYZE_TIMEOUT_SECONDS", "45"))
 
 # UI settings
 APP_TITLE: str = "CSFloat Listings"
@@ -53,4 +60,5 @@ SORT_OPTIONS: List[str] = [
     "highest_discount",
     "float_rank",
     "num_bids",
+    "local_deal",
 ]
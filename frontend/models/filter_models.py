@@ -72,6 +72,8 @@ class FilterState(BaseModel):
             "user_id": self.user_id or None,
             "collection": self.collection or None,
             "market_hash_name": self.market_hash_name or None,
+            # Let the backend correct typos against its item-names catalog
+            "resolve_name": True if self.market_hash_name else None,
             "type": self.type or None,
             "stickers": self.stickers or None,
             # Send prices in dollars; backend converts to cents for upstream API
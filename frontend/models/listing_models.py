@@ -1,18 +1,26 @@
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
+from config.settings import RARITY_MAP
 from pydantic import BaseModel, Field
 
+RARITY_LABELS: Dict[int, str] = {code: label for label, code in RARITY_MAP.items() if code}
+
 
 class ItemDTO(BaseModel):
     """
     Data Transfer Object for item listings.
     """
 
+    id: Optional[str] = Field(None, description="CSFloat listing id")
     name: Optional[str] = Field(None, description="Name of the item")
     price: Optional[int] = Field(None, description="Price of the item in cents")
     wear: Optional[str] = Field(None, description="Wear level or condition of the item")
     rarity: Optional[str] = Field(None, description="Rarity classification of the item")
     float_value: Optional[float] = Field(None, description="Float value indicating item quality")
+    # Only filled when requested with the backend's ``fields=`` parameter.
+    paint_seed: Optional[int] = Field(None, description="Pattern seed")
+    stickers: Optional[List[Dict[str, Any]]] = Field(None, description="Applied stickers")
+    inspect_link: Optional[str] = Field(None, description="In-game inspect link")
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ItemDTO":
@@ -30,15 +38,17 @@ class ItemDTO(BaseModel):
         wear = data.get("wear_name") or data.get("wear")
         rarity = data.get("rarity")
         if isinstance(rarity, int):
-            rarity_map = {
-                1: "Common",
-                2: "Uncommon",
-                3: "Rare",
-                4: "Mythical",
-                5: "Legendary",
-                6: "Ancient",
-                7: "Immortal",
-            }
-            rarity = rarity_map.get(rarity, str(rarity))
+            rarity = RARITY_LABELS.get(rarity, str(rarity))
         float_value = data.get("float_value")
-        return cls(name=name, price=price, wear=wear, rarity=rarity, float_value=float_value)
+        listing_id = data.get("id")
+        return cls(
+            id=str(listing_id) if listing_id is not None else None,
+            name=name,
+            price=price,
+            wear=wear,
+            rarity=rarity,
+            float_value=float_value,
+            paint_seed=data.get("paint_seed"),
+            stickers=data.get("stickers"),
+            inspect_link=data.get("inspect_link"),
+        )
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionRejected,
+    RoutePolicy,
+)
+
+
+def _controller(**overrides):
+    listings = RoutePolicy("/listings", 1, 2, 0.2)
+    analyze = RoutePolicy("/analyze", 1, 2, 0.2, sheddable=True)
+    return AdmissionController([listings, analyze], **overrides)
+
+
+class TestAdmissionController:
+    def test_given_full_queue_when_acquire_then_reject_with_retry_after(self):
+        # Arrange
+        controller = AdmissionController([RoutePolicy("/listings", 1, 0, 2.5)])
+        gate = controller.match("/listings/")
+
+        async def scenario():
+            await controller.acquire(gate)
+            with pytest.raises(AdmissionRejected) as exc:
+                await controller.acquire(gate)
+            return exc.value
+
+        # Act
+        rejected = asyncio.run(scenario())
+
+        # Assert
+        assert rejected.retry_after == 3
+        assert gate.stats()["rejected_queue_full"] == 1
+
+    def test_given_queued_request_when_slot_released_then_waiter_is_admitted(self):
+        # Arrange
+        controller = _controller()
+        gate = controller.match("/listings")
+
+        async def scenario():
+            await controller.acquire(gate)
+            waiter = asyncio.create_task(controller.acquire(gate))
+            await asyncio.sleep(0)
+            controller.release(gate)
+            await waiter
+            return gate.stats()
+
+        # Act
+        stats = asyncio.run(scenario())
+
+        # Assert
+        assert stats["active"] == 1 and stats["admitted"] == 2 and stats["queued"] == 0
+
+    def test_given_slow_holder_when_wait_exceeds_max_then_reject(self):
+        # Arrange
+        controller = _controller()
+        gate = controller.match("/listings")
+
+        async def scenario():
+            await controller.acquire(gate)
+            await controller.acquire(gate)
+
+        # Act / Assert
+        with pytest.raises(AdmissionRejected):
+            asyncio.run(scenario())
+        assert gate.stats()["rejected_wait_timeout"] == 1
+        assert gate.stats()["queued"] == 0
+
+    def test_given_listings_queueing_when_analyze_arrives_then_analyze_is_shed_first(self):
+        # Arrange
+        controller = _controller(shed_threshold=0.25)
+        listings = controller.match("/listings")
+        analyze = controller.match("/analyze")
+
+        async def scenario():
+            await controller.acquire(listings)
+            queued = [asyncio.create_task(controller.acquire(listings)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected):
+                await controller.acquire(analyze)
+            for _ in range(3):
+                controller.release(listings)
+            await asyncio.gather(*queued)
+
+        # Act
+        asyncio.run(scenario())
+
+        # Assert
+        assert analyze.stats()["shed"] == 1
+        assert listings.stats()["admitted"] == 3
+
+
+class TestAdmissionMiddleware:
+    def test_given_route_at_capacity_when_request_then_503_with_retry_after(self):
+        # Arrange
+        controller = AdmissionController([RoutePolicy("/listings", 1, 0, 1.0)])
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, controller=controller)
+
+        @app.get("/listings")
+        def listings():
+            return {"data": []}
+
+        @app.get("/health")
+        def health():
+            return {"status": "ok"}
+
+        asyncio.run(controller.acquire(controller.match("/listings")))
+        client = TestClient(app)
+
+        # Act
+        rejected = client.get("/listings")
+        unguarded = client.get("/health")
+
+        # Assert
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "1"
+        assert rejected.json()["error"] == "overloaded"
+        assert unguarded.status_code == 200
@@ -0,0 +1,60 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.workload import Sample, ZipfKeys, compare, percentile, summarize
+
+
+class TestZipfKeys:
+    def test_given_skew_when_sampled_then_hot_keys_dominate(self):
+        # Arrange
+        keys = ZipfKeys(100, s=1.2, seed=3)
+
+        # Act
+        counts = Counter(keys.sample() for _ in range(5000))
+
+        # Assert
+        assert set(counts) <= set(range(100))
+        assert counts[0] > counts[1] > counts[10]
+        assert counts[0] / 5000 > 0.15
+
+    def test_given_empty_key_space_when_created_then_error(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            ZipfKeys(0)
+
+
+class TestSummaries:
+    def test_given_samples_when_summarized_then_nearest_rank_percentiles_and_hit_ratio(self):
+        # Arrange
+        samples = [Sample(i / 1000.0, 200, "HIT") for i in range(1, 100)]
+        samples.append(Sample(1.0, 503, "MISS"))
+
+        # Act
+        summary = summarize(samples, duration=2.0, upstream_calls=1)
+
+        # Assert
+        assert percentile([], 50) is None
+        assert summary["latency_ms"]["p50"] == 50.0
+        assert summary["latency_ms"]["p99"] == 99.0
+        assert summary["latency_ms"]["max"] == 1000.0
+        assert summary["throughput_rps"] == 50.0
+        assert summary["errors"] == 1 and summary["status"] == {"200": 99, "503": 1}
+        assert summary["cache_hit_ratio"] == 0.99
+
+    def test_given_baseline_when_compared_then_relative_change_per_scenario(self):
+        # Arrange
+        def result(rps, p95):
+            return {"throughput_rps": rps, "latency_ms": {"p95": p95, "p99": p95}}
+
+        current = {"scenarios": {"listings": result(200.0, 10.0), "analyze": result(5.0, 1.0)}}
+        baseline = {"scenarios": {"listings": result(100.0, 20.0)}}
+
+        # Act
+        lines = compare(current, baseline)
+
+        # Assert
+        assert lines == [
+            "listings: rps 100 -> 200 (+100.0%), p95 20 -> 10 (-50.0%), p99 20 -> 10 (-50.0%)",
+            "analyze: no baseline",
+        ]
@@ -0,0 +1,88 @@
+import contextvars
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.analyze.router as analyze_router
+import backend.features.listings.router as listings_router
+from backend.core.bulkhead import Bulkhead
+from backend.core.exceptions import CapacityExceededError
+from backend.main import app
+
+request_tag: contextvars.ContextVar[str] = contextvars.ContextVar("request_tag", default="")
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestBulkhead:
+    def test_given_saturated_bulkhead_when_submit_then_reject_and_count(self):
+        # Arrange
+        bulkhead = Bulkhead("llm", max_workers=1, max_queue=1)
+        gate = threading.Event()
+        running = [bulkhead.submit(gate.wait, 2), bulkhead.submit(gate.wait, 2)]
+
+        # Act
+        with pytest.raises(CapacityExceededError):
+            bulkhead.submit(gate.wait, 2)
+        stats = bulkhead.stats()
+        gate.set()
+        for f in running:
+            f.result(timeout=2)
+
+        # Assert
+        assert stats["rejected"] == 1
+        assert stats["saturation"] == 1.0
+        assert bulkhead.stats()["completed"] == 2
+        bulkhead.shutdown()
+
+    def test_given_context_var_when_submit_then_task_sees_caller_context(self):
+        # Arrange
+        bulkhead = Bulkhead("cpu", max_workers=1, max_queue=0)
+        request_tag.set("req-42")
+
+        # Act
+        seen = bulkhead.submit(request_tag.get).result(timeout=2)
+
+        # Assert
+        assert seen == "req-42"
+        bulkhead.shutdown()
+
+
+class TestBulkheadIsolation:
+    def test_given_llm_bulkhead_saturated_when_requests_arrive_then_listings_still_served(
+        self, client, monkeypatch
+    ):
+        # Arrange
+        llm = Bulkhead("llm", max_workers=1, max_queue=0)
+        gate = threading.Event()
+        blocker = llm.submit(gate.wait, 5)
+        monkeypatch.setattr(analyze_router, "get_bulkhead", lambda name: llm)
+        monkeypatch.setattr(
+            listings_router.csfloat_client,
+            "fetch_listings",
+            lambda params: ([{"name": "AK-47 | Redline", "price": 100}], "MISS"),
+        )
+        item = {
+            "name": "AK-47 | Redline",
+            "price": 100,
+            "wear": "Field-Tested",
+            "rarity": "Rare",
+            "float_value": 0.2,
+        }
+        payload = {"question": "best?", "items": [item]}
+
+        # Act
+        analyze_resp = client.post("/analyze/", json=payload)
+        listings_resp = client.get("/listings")
+        gate.set()
+        blocker.result(timeout=2)
+
+        # Assert
+        assert analyze_resp.status_code == 503
+        assert "busy" in analyze_resp.json()["message"].lower()
+        assert listings_resp.status_code == 200
+        llm.shutdown()
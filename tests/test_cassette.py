@@ -0,0 +1,92 @@
+import gzip
+
+import httpx
+import pytest
+
+from backend.services.csfloat.cassette import Cassette, RecordingTransport, ReplayTransport
+from backend.services.csfloat.client import CSFloatClient
+
+LISTING = {"id": "1", "price": 1500, "item": {"item_name": "AK-47 | Redline", "float_value": 0.2}}
+
+
+def upstream(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": [LISTING]}, headers={"ETag": '"v1"'})
+
+    return httpx.MockTransport(handler)
+
+
+class TestCassette:
+    def test_given_recorded_session_when_replayed_then_same_payload_without_network(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "cassette.jsonl.gz")
+        seen: list = []
+        recorder = CSFloatClient()
+        recorder.set_http_client(
+            httpx.Client(transport=RecordingTransport(upstream(seen), Cassette(path)))
+        )
+        recorded, _ = recorder.fetch_listings({"min_price": 15.0})
+        recorder._get_http_client().close()
+
+        replayer = CSFloatClient()
+        replayer.set_http_client(httpx.Client(transport=ReplayTransport(Cassette(path))))
+
+        # Act
+        replayed, status = replayer.fetch_listings({"min_price": 15.0})
+
+        # Assert
+        assert len(seen) == 1
+        assert status == "MISS"
+        assert replayed == recorded
+        assert replayed[0]["price"] == 1500
+
+    def test_given_latency_scale_when_replay_then_recorded_latency_slept(self, tmp_path):
+        # Arrange
+        path = tmp_path / "c.jsonl.gz"
+        cassette = Cassette(str(path))
+        request = httpx.Request(
+            "GET", "https://csfloat.test/api?b=2&a=1", headers={"Authorization": "secret-key"}
+        )
+        cassette.record(request, httpx.Response(429, headers={"Retry-After": "3"}), 0.25)
+        cassette.close()
+        slept: list = []
+        transport = ReplayTransport(cassette, latency_scale=2.0, sleep=slept.append)
+
+        # Act
+        response = transport.handle_request(
+            httpx.Request("GET", "https://csfloat.test/api?a=1&b=2")
+        )
+
+        # Assert
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        assert slept == [0.5]
+        assert b"secret-key" not in gzip.decompress(path.read_bytes())
+
+    def test_given_conditional_request_when_only_plain_recorded_then_falls_back(self, tmp_path):
+        # Arrange
+        cassette = Cassette(str(tmp_path / "c.jsonl.gz"))
+        url = "https://csfloat.test/api"
+        cassette.record(httpx.Request("GET", url), httpx.Response(200, content=b"plain"), 0.0)
+        conditional = httpx.Request("GET", url, headers={"If-None-Match": '"v1"'})
+        cassette.record(conditional, httpx.Response(304), 0.0)
+        transport = ReplayTransport(cassette)
+
+        # Act
+        not_modified = transport.handle_request(conditional)
+        stale = transport.handle_request(
+            httpx.Request("GET", url, headers={"If-None-Match": '"v0"'})
+        )
+
+        # Assert
+        assert not_modified.status_code == 304
+        assert stale.content == b"plain"
+
+    def test_given_unrecorded_request_when_replay_then_connect_error(self, tmp_path):
+        # Arrange
+        transport = ReplayTransport(Cassette(str(tmp_path / "empty.jsonl.gz")))
+
+        # Act / Assert
+        with pytest.raises(httpx.ConnectError):
+            transport.handle_request(httpx.Request("GET", "https://csfloat.test/api"))
@@ -0,0 +1,166 @@
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.export.router as export_router
+import backend.features.listings.router as listings_router
+from backend.core.compression import (
+    BROTLI,
+    GZIP,
+    ZSTD,
+    BodyCache,
+    StreamCompressor,
+    available_encodings,
+    compress,
+    get_body_cache,
+    negotiate_encoding,
+)
+from backend.main import app
+from backend.services.market.store import ListingsStore
+
+ITEMS = [
+    {
+        "id": str(i),
+        "name": "AK-47 | Redline",
+        "price": 1000 + i,
+        "wear": "Field-Tested",
+        "rarity": "Rare",
+        "float_value": 0.2,
+    }
+    for i in range(50)
+]
+
+
+class TestNegotiateEncoding:
+    def test_given_accept_encoding_when_negotiate_then_preferred_available_encoding(self):
+        # Act / Assert
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("gzip, deflate") == GZIP
+        assert negotiate_encoding("gzip;q=0, deflate") is None
+        assert negotiate_encoding("*", preference=("gzip",)) == GZIP
+        assert negotiate_encoding("br, zstd, gzip") == available_encodings()[0]
+
+
+class TestStreamCompressor:
+    def test_given_chunks_when_gzip_stream_then_each_chunk_decodable_on_arrival(self):
+        # Arrange
+        compressor = StreamCompressor(GZIP)
+        decoder = zlib.decompressobj(31)
+
+        # Act
+        first = decoder.decompress(compressor.chunk(b'{"a":1}\n'))
+        second = decoder.decompress(compressor.chunk(b'{"a":2}\n') + compressor.finish())
+
+        # Assert
+        assert first == b'{"a":1}\n'
+        assert second == b'{"a":2}\n'
+
+    def test_given_zstd_stream_when_chunks_arrive_then_each_decodable_on_arrival(self):
+        # Arrange
+        zstandard = pytest.importorskip("zstandard")
+        compressor = StreamCompressor(ZSTD)
+        decoder = zstandard.ZstdDecompressor().decompressobj()
+
+        # Act
+        first = decoder.decompress(compressor.chunk(b'{"a":1}\n'))
+        second = decoder.decompress(compressor.chunk(b'{"a":2}\n') + compressor.finish())
+
+        # Assert
+        assert first == b'{"a":1}\n'
+        assert second == b'{"a":2}\n'
+        assert zstandard.ZstdDecompressor().decompress(compress(b"x" * 100, ZSTD)) == b"x" * 100
+
+    def test_given_brotli_stream_when_chunks_arrive_then_each_decodable_on_arrival(self):
+        # Arrange
+        brotli = pytest.importorskip("brotli")
+        compressor = StreamCompressor(BROTLI)
+        decoder = brotli.Decompressor()
+
+        # Act
+        first = decoder.process(compressor.chunk(b'{"a":1}\n'))
+        second = decoder.process(compressor.chunk(b'{"a":2}\n') + compressor.finish())
+
+        # Assert
+        assert first == b'{"a":1}\n'
+        assert second == b'{"a":2}\n'
+        assert brotli.decompress(compress(b"x" * 100, BROTLI)) == b"x" * 100
+
+
+class TestBodyCache:
+    def test_given_cached_body_when_encoded_twice_then_compressed_once(self):
+        # Arrange
+        cache = BodyCache(maxsize=2, min_bytes=10)
+        entry = cache.put("k", "application/json", b"x" * 100)
+
+        # Act
+        first, encoding = cache.encode(entry, GZIP)
+        second, _ = cache.encode(entry, GZIP)
+        small, small_encoding = cache.encode(cache.put("s", "text/plain", b"tiny"), GZIP)
+
+        # Assert
+        assert encoding == GZIP and first is second
+        assert gzip.decompress(first) == b"x" * 100
+        assert (small, small_encoding) == (b"tiny", None)
+        assert cache.stats()["compressions"] == 1
+
+
+class TestCompressedResponses:
+    def test_given_large_listings_when_gzip_accepted_then_precompressed_body(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(
+            listings_router.csfloat_client, "fetch_listings", lambda params: (ITEMS, "HIT")
+        )
+        client = TestClient(app)
+        before = get_body_cache().stats()["compressions"]
+
+        # Act
+        first = client.get("/listings", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/listings", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/listings", headers={"Accept-Encoding": "identity"})
+
+        # Assert
+        assert first.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in first.headers["vary"]
+        assert first.json() == second.json() == plain.json()
+        assert len(first.json()["data"]) == 50
+        assert "content-encoding" not in plain.headers
+        assert get_body_cache().stats()["compressions"] - before <= 1
+
+    def test_given_ndjson_export_when_gzip_accepted_then_streamed_compressed(self, monkeypatch):
+        # Arrange
+        store = ListingsStore()
+        store.upsert(
+            {"id": str(i), "price": 100 + i, "item": {"item_name": "AWP | Asiimov"}}
+            for i in range(30)
+        )
+        monkeypatch.setattr(export_router, "get_listings_store", lambda: store)
+
+        # Act
+        resp = TestClient(app).get(
+            "/export", params={"format": "ndjson"}, headers={"Accept-Encoding": "gzip"}
+        )
+
+        # Assert
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        assert resp.headers["content-encoding"] == "gzip"
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert len(rows) == 30 and rows[0]["price"] == 100
+
+    def test_given_small_listings_when_gzip_accepted_then_identity(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(
+            listings_router.csfloat_client, "fetch_listings", lambda params: (ITEMS[:1], "HIT")
+        )
+
+        # Act
+        resp = TestClient(app).get("/listings", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert resp.status_code == 200
+        assert "content-encoding" not in resp.headers
+        assert resp.json()["data"][0]["id"] == "0"
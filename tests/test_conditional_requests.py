@@ -0,0 +1,141 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.core.conditional import if_none_match
+from backend.main import app
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.market.store import ListingsStore
+
+ITEMS = [
+    {
+        "id": "1",
+        "name": "AK-47 | Redline",
+        "price": 1000,
+        "wear": "Field-Tested",
+        "rarity": "Rare",
+        "float_value": 0.2,
+    }
+]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(
+        listings_router.csfloat_client, "fetch_listings", lambda params: (ITEMS, "HIT")
+    )
+    return TestClient(app)
+
+
+class TestIfNoneMatch:
+    def test_given_header_variants_when_matching_then_weak_comparison(self):
+        # Act / Assert
+        assert if_none_match('"a", "b"', '"b"')
+        assert if_none_match('W/"b"', '"b"')
+        assert if_none_match("*", '"b"')
+        assert not if_none_match('"a"', '"b"')
+        assert not if_none_match(None, '"b"')
+
+
+class TestListingsETag:
+    def test_given_matching_if_none_match_when_get_listings_then_304(self, client):
+        # Arrange
+        first = client.get("/listings")
+        etag = first.headers["etag"]
+
+        # Act
+        second = client.get("/listings", headers={"If-None-Match": etag})
+
+        # Assert
+        assert first.status_code == 200
+        assert etag.startswith('"')
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_given_changed_items_when_revalidating_then_full_response(self, client, monkeypatch):
+        # Arrange
+        etag = client.get("/listings").headers["etag"]
+        changed = [dict(ITEMS[0], price=900)]
+        monkeypatch.setattr(
+            listings_router.csfloat_client, "fetch_listings", lambda params: (changed, "MISS")
+        )
+
+        # Act
+        resp = client.get("/listings", headers={"If-None-Match": etag})
+
+        # Assert
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()["data"][0]["price"] == 900
+
+    def test_given_version_moved_on_when_revalidating_then_full_response(self, client, monkeypatch):
+        # Arrange
+        store = ListingsStore()
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+        first = client.get("/listings", params={"source": "upstream"})
+        cached = client.get(
+            "/listings",
+            params={"source": "upstream"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        store.upsert([{"id": "other", "price": 5}])
+
+        # Act
+        resp = client.get(
+            "/listings",
+            params={"source": "upstream"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        # Assert
+        assert cached.status_code == 304
+        assert resp.status_code == 200
+        assert resp.json()["data"] == first.json()["data"]
+        assert resp.json()["meta"]["version"] == first.json()["meta"]["version"] + 1
+
+    def test_given_other_media_type_when_get_listings_then_distinct_etag(self, client):
+        # Arrange
+        pytest.importorskip("msgpack")
+
+        # Act
+        as_json = client.get("/listings")
+        as_msgpack = client.get(
+            "/listings",
+            headers={"Accept": "application/msgpack", "If-None-Match": as_json.headers["etag"]},
+        )
+
+        # Assert
+        assert as_msgpack.status_code == 200
+        assert as_msgpack.headers["etag"] != as_json.headers["etag"]
+
+
+class TestUpstreamRevalidation:
+    def test_given_expired_entry_with_etag_when_fetch_then_conditional_request(self):
+        # Arrange
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"ETag": '"v1"'})
+            listing = {"id": 7, "price": 500, "item": {"item_name": "AWP | Asiimov"}}
+            return httpx.Response(200, json={"data": [listing]}, headers={"ETag": '"v1"'})
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+        params = {"min_price": 123.0}
+
+        # Act
+        items, first = csfloat.fetch_listings(params)
+        csfloat._listings_cache.clear()
+        again, second = csfloat.fetch_listings(params)
+        _, third = csfloat.fetch_listings(params)
+
+        # Assert
+        assert (first, second, third) == ("MISS", "REVALIDATED", "HIT")
+        assert seen == [None, '"v1"']
+        assert again is items
+        assert csfloat.listings_digest(params, again) is not None
+        assert csfloat.get_cache_stats()["revalidations"] == 1
@@ -0,0 +1,156 @@
+import gzip
+import json
+import os
+import signal
+import time
+
+import httpx
+import pytest
+
+from backend.cli.crawl import Crawler
+from backend.services.csfloat.client import CSFloatClient
+
+
+class PagedUpstream:
+    """Serves `per_index` listings per def_index in pages of `page_size`, with chained cursors."""
+
+    def __init__(self, per_index=5, page_size=2):
+        self.per_index = per_index
+        self.page_size = page_size
+        self.requests = []
+        self.fail_cursor = None
+        self.garbled_def_index = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append(params)
+        def_index = params["def_index"]
+        cursor = params.get("cursor")
+        if cursor is not None and cursor == self.fail_cursor:
+            return httpx.Response(502)
+        if def_index == self.garbled_def_index:
+            return httpx.Response(200, content=b"<html>maintenance</html>")
+        offset = int(cursor) if cursor else 0
+        page = [
+            {"id": f"{def_index}-{i}", "price": 100 + i, "item": {"def_index": int(def_index)}}
+            for i in range(offset, min(offset + self.page_size, self.per_index))
+        ]
+        body = {"data": page}
+        if offset + self.page_size < self.per_index:
+            body["cursor"] = str(offset + self.page_size)
+        return httpx.Response(200, json=body)
+
+
+def make_crawler(upstream, out_dir, **kwargs):
+    client = CSFloatClient()
+    client.set_http_client(httpx.Client(transport=httpx.MockTransport(upstream)))
+    kwargs.setdefault("concurrency", 2)
+    return Crawler(client, str(out_dir), [7, 9], page_limit=2, backoff_seconds=0.0, **kwargs)
+
+
+def read_ids(out_dir):
+    ids = []
+    for path in sorted(out_dir.glob("segment-*.jsonl.gz")):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            ids.extend(json.loads(line)["id"] for line in f if line.strip())
+    return ids
+
+
+class TestCrawler:
+    def test_given_two_def_indexes_when_run_then_every_page_in_rotated_segments(self, tmp_path):
+        # Arrange
+        upstream = PagedUpstream(per_index=5)
+        crawler = make_crawler(upstream, tmp_path, max_segment_bytes=1)
+
+        # Act
+        report = crawler.run()
+
+        # Assert
+        ids = read_ids(tmp_path)
+        assert sorted(ids) == sorted(f"{d}-{i}" for d in (7, 9) for i in range(5))
+        assert report["pages"] == 6 and report["listings"] == 10 and report["errors"] == []
+        assert len(list(tmp_path.glob("segment-*.jsonl.gz"))) == 6
+        assert {r["def_index"] for r in upstream.requests} == {"7", "9"}
+
+    def test_given_failure_mid_chain_when_rerun_then_resume_without_duplicates(self, tmp_path):
+        # Arrange
+        upstream = PagedUpstream(per_index=5)
+        upstream.fail_cursor = "4"
+        first = make_crawler(upstream, tmp_path, max_retries=0)
+
+        # Act
+        report = first.run()
+        upstream.fail_cursor = None
+        upstream.requests.clear()
+        second = make_crawler(upstream, tmp_path)
+        resumed = second.run()
+
+        # Assert
+        assert len(report["errors"]) == 2
+        assert [r.get("cursor") for r in upstream.requests] == ["4", "4"]
+        ids = read_ids(tmp_path)
+        assert len(ids) == len(set(ids)) == 10
+        assert resumed["errors"] == [] and resumed["pages"] == 2
+
+    def test_given_non_json_page_when_run_then_error_recorded_and_others_crawled(self, tmp_path):
+        # Arrange
+        upstream = PagedUpstream(per_index=3)
+        upstream.garbled_def_index = "7"
+
+        # Act
+        report = make_crawler(upstream, tmp_path).run()
+
+        # Assert
+        assert len(report["errors"]) == 1 and report["errors"][0].startswith("def_index 7:")
+        assert sorted(read_ids(tmp_path)) == ["9-0", "9-1", "9-2"]
+
+    def test_given_uncheckpointed_bytes_when_resume_then_segment_truncated(self, tmp_path):
+        # Arrange
+        crawler = make_crawler(PagedUpstream(per_index=2), tmp_path, concurrency=1)
+        crawler.run()
+        segment = next(tmp_path.glob("segment-*.jsonl.gz"))
+        committed = segment.stat().st_size
+        with open(segment, "ab") as f:
+            f.write(gzip.compress(b'{"id":"orphan"}\n'))
+
+        # Act
+        make_crawler(PagedUpstream(per_index=2), tmp_path)
+
+        # Assert
+        assert segment.stat().st_size == committed
+        assert "orphan" not in read_ids(tmp_path)
+
+    def test_given_keyboard_interrupt_when_run_then_queued_targets_cancelled_and_checkpointed(
+        self, tmp_path
+    ):
+        # Arrange
+        upstream = PagedUpstream(per_index=5)
+
+        def interrupting(request: httpx.Request) -> httpx.Response:
+            if request.url.params.get("cursor") == "2":
+                # Ctrl-C lands on the main thread while this page is in flight.
+                os.kill(os.getpid(), signal.SIGINT)
+                time.sleep(0.1)
+            return upstream(request)
+
+        crawler = make_crawler(interrupting, tmp_path, concurrency=1)
+
+        # Act
+        with pytest.raises(KeyboardInterrupt):
+            crawler.run()
+
+        # Assert
+        assert {r["def_index"] for r in upstream.requests} == {"7"}
+        saved = json.loads((tmp_path / "checkpoint.json").read_text())
+        assert saved["targets"]["7"]["cursor"] == "4"
+        assert saved["targets"]["9"]["pages"] == 0
+
+    def test_given_checkpoint_for_other_category_when_resume_then_refused(self, tmp_path):
+        # Arrange
+        make_crawler(PagedUpstream(per_index=2), tmp_path, category=1).run()
+        committed = read_ids(tmp_path)
+
+        # Act / Assert
+        with pytest.raises(ValueError, match="category"):
+            make_crawler(PagedUpstream(per_index=2), tmp_path, category=2)
+        assert read_ids(tmp_path) == committed
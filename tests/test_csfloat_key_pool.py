@@ -0,0 +1,119 @@
+import httpx
+import pytest
+
+from backend.core.exceptions import UpstreamServiceError
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.csfloat.key_pool import APIKeyPool
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAPIKeyPool:
+    def test_given_busy_key_when_acquire_then_least_loaded_key_is_used(self):
+        # Arrange
+        pool = APIKeyPool(["k1", "k2"], clock=FakeClock())
+        first = pool.acquire()
+
+        # Act
+        second = pool.acquire()
+
+        # Assert
+        assert {first.key, second.key} == {"k1", "k2"}
+
+    def test_given_429_with_retry_after_when_acquire_then_key_cools_down_until_expiry(self):
+        # Arrange
+        clock = FakeClock()
+        pool = APIKeyPool(["k1", "k2"], clock=clock)
+        lease = pool.acquire()
+        pool.release(lease, 429, retry_after=30)
+
+        # Act
+        during = [pool.acquire().key for _ in range(3)]
+        clock.now += 31
+        stats = {s["key"]: s for s in pool.stats()}
+
+        # Assert
+        assert lease.key not in during
+        assert stats["key-1"]["rate_limited"] + stats["key-2"]["rate_limited"] == 1
+        assert not any(s["cooling_down"] for s in stats.values())
+
+    def test_given_single_key_unauthorized_when_acquire_then_key_is_still_handed_out(self):
+        # Arrange
+        pool = APIKeyPool(["k1"], clock=FakeClock())
+        pool.release(pool.acquire(), 401)
+
+        # Act
+        lease = pool.acquire()
+
+        # Assert
+        assert lease.key == "k1"
+        assert pool.stats()[0]["unauthorized"] == 1
+        assert pool.stats()[0]["cooling_down"] is False
+
+    def test_given_other_keys_cooling_when_last_key_rate_limited_then_it_stays_usable(self):
+        # Arrange
+        pool = APIKeyPool(["k1", "k2"], clock=FakeClock())
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first, 403)
+
+        # Act
+        pool.release(second, 429, retry_after=30)
+        lease = pool.acquire()
+
+        # Assert
+        assert lease.key == second.key
+        assert [s["cooling_down"] for s in pool.stats()].count(True) == 1
+
+    def test_given_per_minute_cap_when_exhausted_then_key_is_skipped(self):
+        # Arrange
+        clock = FakeClock()
+        pool = APIKeyPool(["k1", "k2"], max_requests_per_minute=1, clock=clock)
+        pool.release(pool.acquire(), 200)
+        pool.release(pool.acquire(), 200)
+
+        # Act / Assert
+        with pytest.raises(UpstreamServiceError):
+            pool.acquire()
+        clock.now += 61
+        assert pool.acquire().key in {"k1", "k2"}
+
+    def test_given_stats_when_read_then_raw_keys_are_not_exposed(self):
+        # Arrange
+        pool = APIKeyPool(["secret-key"], clock=FakeClock())
+
+        # Act
+        stats = pool.stats()
+
+        # Assert
+        assert stats[0]["key"] == "key-1"
+        assert "secret-key" not in str(stats)
+
+
+class TestCSFloatClientKeyRotation:
+    def test_given_rate_limited_key_when_fetch_then_retry_with_next_key(self):
+        # Arrange
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("Authorization"))
+            if request.headers.get("Authorization") == "k1":
+                return httpx.Response(429, headers={"Retry-After": "5"})
+            return httpx.Response(200, json={"names": ["AK-47 | Redline"]})
+
+        client = CSFloatClient()
+        client._key_pool = APIKeyPool(["k1", "k2"], clock=FakeClock())
+        client.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+
+        # Act
+        names = client.fetch_item_names(limit=1)
+
+        # Assert
+        assert names == ["AK-47 | Redline"]
+        assert seen == ["k1", "k2"]
+        assert client.get_key_stats()[0]["cooling_down"] is True
@@ -0,0 +1,102 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.config.settings import get_settings
+from backend.main import app
+from backend.services.market.scoring import deal_scores
+from backend.services.market.store import ListingsStore
+
+
+def raw_listing(listing_id, price, float_value, name="AK-47 | Redline", wear="Field-Tested"):
+    return {
+        "id": listing_id,
+        "price": price,
+        "item": {
+            "item_name": name,
+            "market_hash_name": f"{name} ({wear})",
+            "wear_name": wear,
+            "float_value": float_value,
+            "rarity": 3,
+            "def_index": 7,
+        },
+    }
+
+
+class TestDealScores:
+    def test_given_groups_when_scored_then_discount_to_peer_median_and_float_rank(self):
+        # Arrange
+        groups = np.array([0, 0, 0, 1, 1])
+        prices = np.array([800, 1000, 1200, 50, 60])
+        floats = np.array([0.30, 0.20, np.nan, 0.1, 0.2])
+
+        # Act
+        score, median, pct = deal_scores(groups, prices, floats, min_peers=3, float_weight=0.1)
+
+        # Assert
+        assert median[:3].tolist() == [1000.0, 1000.0, 1000.0]
+        assert pct[:3].tolist() == [1.0, 0.0, 0.5]
+        assert np.allclose(score[:3], [0.2 - 0.05, 0.0 + 0.05, -0.2])
+        assert np.isnan(score[3:]).all()  # group 1 has too few peers
+
+
+class TestLocalDealRanking:
+    def test_given_store_updates_when_ranked_then_only_dirty_groups_rescored(self):
+        # Arrange
+        store = ListingsStore()
+        store.upsert(raw_listing(str(i), 1000 + 100 * i, 0.2 + i / 100) for i in range(5))
+        store.upsert(
+            raw_listing(f"a{i}", 5000, 0.05, name="AWP | Asiimov", wear="Factory New")
+            for i in range(3)
+        )
+
+        # Act
+        first = store.top_deals({}, 2)
+        rescored_all = store.refresh_deal_scores()
+        store.upsert([raw_listing("a0", 2500, 0.05, name="AWP | Asiimov", wear="Factory New")])
+        rescored_dirty = store.refresh_deal_scores()
+        second = store.top_deals({}, 1)
+
+        # Assert
+        assert [d["id"] for d in first] == ["0", "1"]
+        assert first[0]["peer_median"] == 1200.0
+        assert rescored_all == 0 and rescored_dirty == 3
+        assert second[0]["id"] == "a0" and second[0]["deal_score"] > 0.4
+
+    def test_given_sort_local_deal_when_get_listings_then_answered_locally(self, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(get_settings(), "LOCAL_STORE_ENABLED", True)
+        store = ListingsStore()
+        store.upsert(raw_listing(str(i), 1000 + 100 * i, 0.2) for i in range(4))
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+
+        def boom(params):
+            raise AssertionError("upstream must not be called")
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", boom)
+
+        # Act
+        listings = client.get("/listings", params={"sort_by": "local_deal", "limit": 2})
+        deals = client.get("/listings/deals", params={"limit": 1, "max_price": 1100})
+
+        # Assert
+        assert listings.status_code == 200
+        assert [i["id"] for i in listings.json()["data"]] == ["0", "1"]
+        assert deals.status_code == 200
+        top = deals.json()["data"][0]
+        assert top["id"] == "0" and top["peer_median"] == 1150.0
+
+    def test_given_local_store_disabled_when_local_deal_requested_then_400(self, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(get_settings(), "LOCAL_STORE_ENABLED", False)
+        monkeypatch.setattr(get_settings(), "INGEST_ENABLED", False)
+
+        # Act
+        listings = client.get("/listings", params={"sort_by": "local_deal"})
+        deals = client.get("/listings/deals")
+
+        # Assert
+        assert listings.status_code == deals.status_code == 400
+        assert "LOCAL_STORE_ENABLED" in listings.json()["message"]
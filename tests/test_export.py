@@ -0,0 +1,171 @@
+import csv
+import io
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.export.router as export_router
+from backend.main import app
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.market.export import encode, upstream_chunks
+from backend.services.market.store import ListingsStore
+
+
+def raw_listing(listing_id, price, float_value=0.2, name="AK-47 | Redline", rarity=3):
+    return {
+        "id": listing_id,
+        "price": price,
+        "item": {
+            "item_name": name,
+            "wear_name": "Field-Tested",
+            "float_value": float_value,
+            "rarity": rarity,
+        },
+    }
+
+
+@pytest.fixture
+def store():
+    s = ListingsStore()
+    s.upsert(raw_listing(str(i), 1000 + i) for i in range(25))
+    return s
+
+
+@pytest.fixture
+def client(store, monkeypatch):
+    monkeypatch.setattr(export_router, "get_listings_store", lambda: store)
+    return TestClient(app)
+
+
+class TestExportEncoding:
+    def test_given_chunks_when_csv_then_one_piece_per_chunk_with_single_header(self, store):
+        # Act
+        pieces = list(encode("csv", store.iter_items({}, chunk_size=10)))
+
+        # Assert
+        assert len(pieces) == 3
+        rows = list(csv.reader(io.StringIO(b"".join(pieces).decode())))
+        assert rows[0] == ["id", "name", "price", "wear", "rarity", "float_value"]
+        assert len(rows) == 26 and rows[1][:3] == ["0", "AK-47 | Redline", "1000"]
+
+    def test_given_cursor_chain_when_upstream_chunks_then_all_pages_followed(self):
+        # Arrange
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params.get("cursor") or 0)
+            body = {"data": [raw_listing(str(offset + i), 100) for i in range(2)]}
+            if offset < 4:
+                body["cursor"] = str(offset + 2)
+            return httpx.Response(200, json=body)
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+
+        # Act
+        chunks = list(upstream_chunks(csfloat, {"limit": 2}, max_pages=10))
+
+        # Assert
+        assert [[i["id"] for i in c] for c in chunks] == [["0", "1"], ["2", "3"], ["4", "5"]]
+
+    def test_given_name_and_rarity_filters_when_upstream_chunks_then_only_matching_rows(self):
+        # Arrange
+        def handler(request: httpx.Request) -> httpx.Response:
+            data = [
+                raw_listing("1", 100),
+                raw_listing("2", 100, name="AWP | Asiimov"),
+                raw_listing("3", 100, rarity=5),
+                raw_listing("4", 100),
+            ]
+            return httpx.Response(200, json={"data": data})
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+        params = {"limit": 4, "item_name": "AK-47 | Redline", "rarity": 3}
+
+        # Act
+        chunks = list(upstream_chunks(csfloat, params, max_pages=1))
+
+        # Assert
+        assert [[i["id"] for i in c] for c in chunks] == [["1", "4"]]
+
+
+class TestExportEndpoint:
+    def test_given_local_store_when_export_csv_then_streamed_attachment(self, client):
+        # Act
+        resp = client.get("/export", params={"format": "csv", "max_price": 1009})
+
+        # Assert
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert 'filename="listings.csv"' in resp.headers["content-disposition"]
+        assert len(resp.text.strip().splitlines()) == 11
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_given_pyarrow_when_export_columnar_then_readable_table(self, client, fmt):
+        # Arrange
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc as pa_ipc
+        import pyarrow.parquet as pq
+
+        # Act
+        resp = client.get("/export", params={"format": fmt})
+
+        # Assert
+        assert resp.status_code == 200
+        data = pa.BufferReader(resp.content)
+        table = pq.read_table(data) if fmt == "parquet" else pa_ipc.open_stream(data).read_all()
+        assert table.num_rows == 25
+        assert table.column("price").to_pylist()[:2] == [1000, 1001]
+
+    @pytest.mark.parametrize("accept_encoding", ["identity", "gzip"])
+    def test_given_upstream_failure_when_export_upstream_then_503_before_streaming(
+        self, client, monkeypatch, accept_encoding
+    ):
+        # Arrange
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(
+            httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(502)))
+        )
+        monkeypatch.setattr(export_router, "csfloat_client", csfloat)
+
+        # Act
+        resp = client.get(
+            "/export",
+            params={"format": "csv", "source": "upstream"},
+            headers={"Accept-Encoding": accept_encoding},
+        )
+
+        # Assert
+        assert resp.status_code == 503
+        assert "content-disposition" not in resp.headers
+        assert resp.json()["message"].startswith("Upstream listings service unavailable")
+
+    def test_given_upstream_chain_when_export_upstream_then_every_page_streamed(
+        self, client, monkeypatch
+    ):
+        # Arrange
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params.get("cursor") or 0)
+            body = {"data": [raw_listing(str(offset + i), 100) for i in range(2)]}
+            if offset < 2:
+                body["cursor"] = str(offset + 2)
+            return httpx.Response(200, json=body)
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(export_router, "csfloat_client", csfloat)
+
+        # Act
+        resp = client.get("/export", params={"format": "csv", "source": "upstream"})
+
+        # Assert
+        assert resp.status_code == 200
+        rows = list(csv.reader(io.StringIO(resp.text)))
+        assert [row[0] for row in rows[1:]] == ["0", "1", "2", "3"]
+
+    def test_given_unknown_format_when_export_then_422(self, client):
+        # Act
+        resp = client.get("/export", params={"format": "xml"})
+
+        # Assert
+        assert resp.status_code == 422
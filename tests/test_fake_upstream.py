@@ -0,0 +1,111 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.cli.fake_upstream import (
+    ITEM_NAMES_PATH,
+    LISTINGS_PATH,
+    FakeUpstream,
+    FakeUpstreamConfig,
+    latency_sampler,
+)
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.csfloat.scheduler import Priority
+
+
+def csfloat_against(fake: FakeUpstream) -> CSFloatClient:
+    client = CSFloatClient()
+    client.set_http_client(TestClient(fake))
+    client.api_url = f"http://testserver{LISTINGS_PATH}"
+    return client
+
+
+class TestFakeUpstream:
+    def test_given_cursor_chain_when_walked_then_every_match_once_in_order(self):
+        # Arrange
+        fake = FakeUpstream(FakeUpstreamConfig(items=300))
+        csfloat = csfloat_against(fake)
+        params = {"limit": 50, "sort_by": "lowest_price", "max_float": 0.5}
+
+        # Act
+        seen, cursor = [], None
+        while True:
+            page, cursor = csfloat.fetch_listings_page(
+                dict(params, cursor=cursor), priority=Priority.BULK
+            )
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        # Assert
+        prices = [x["price"] for x in seen]
+        assert len({x["id"] for x in seen}) == len(seen) > 50
+        assert prices == sorted(prices)
+        assert all(x["item"]["float_value"] <= 0.5 for x in seen)
+
+    def test_given_rate_limit_when_exceeded_then_429_until_window_rolls(self):
+        # Arrange
+        now = [0.0]
+        fake = FakeUpstream(
+            FakeUpstreamConfig(items=10, rate_limit=2, rate_window_seconds=10),
+            clock=lambda: now[0],
+        )
+        client = TestClient(fake)
+        auth = {"Authorization": "key-a"}
+
+        # Act
+        statuses = [client.get(LISTINGS_PATH, headers=auth).status_code for _ in range(3)]
+        limited = client.get(LISTINGS_PATH, headers=auth)
+        other_key = client.get(LISTINGS_PATH, headers={"Authorization": "key-b"})
+        now[0] = 11.0
+        rolled = client.get(LISTINGS_PATH, headers=auth)
+
+        # Assert
+        assert statuses == [200, 200, 429]
+        assert limited.headers["retry-after"] == "10"
+        assert other_key.status_code == rolled.status_code == 200
+
+    def test_given_error_rate_and_etag_when_requested_then_faults_and_304s(self):
+        # Arrange
+        failing = TestClient(FakeUpstream(FakeUpstreamConfig(items=10, error_rate=1.0)))
+        healthy = TestClient(FakeUpstream(FakeUpstreamConfig(items=10)))
+
+        # Act
+        error = failing.get(ITEM_NAMES_PATH)
+        first = healthy.get(LISTINGS_PATH)
+        again = healthy.get(LISTINGS_PATH, headers={"If-None-Match": first.headers["etag"]})
+        stats = healthy.get("/__stats").json()
+
+        # Assert
+        assert error.status_code in (500, 502, 503)
+        assert again.status_code == 304
+        assert stats["listings_pages"] == 1 and stats["not_modified"] == 1
+
+    def test_given_latency_specs_when_sampled_then_in_range(self):
+        # Arrange
+        rng = random.Random(1)
+
+        # Act / Assert
+        assert latency_sampler("fixed:0.05", rng)() == 0.05
+        assert 0.01 <= latency_sampler("uniform:0.01,0.02", rng)() <= 0.02
+        assert latency_sampler("lognormal:-3,0.5", rng)() > 0
+        with pytest.raises(ValueError):
+            latency_sampler("gamma:1", rng)
+
+
+class TestFakeUpstreamItemNames:
+    def test_given_item_names_url_when_fetched_then_synthetic_names(self, monkeypatch):
+        # Arrange
+        fake = FakeUpstream(FakeUpstreamConfig(items=50))
+        csfloat = csfloat_against(fake)
+        monkeypatch.setattr(
+            csfloat._settings, "CSFLOAT_ITEM_NAMES_URL", f"http://testserver{ITEM_NAMES_PATH}"
+        )
+
+        # Act
+        names = csfloat.fetch_item_names(limit=5)
+
+        # Assert
+        assert len(names) == 5
+        assert all(" | " in name and name.endswith(")") for name in names)
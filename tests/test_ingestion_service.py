@@ -0,0 +1,175 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from backend.core.exceptions import UpstreamServiceError
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.market.ingestion import IngestionService
+from backend.services.market.store import ListingsStore
+
+
+class FakeUpstream:
+    """Serves listings in pages of `page_size`, chaining cursors like CSFloat."""
+
+    def __init__(self, listings, page_size=2):
+        self.listings = listings
+        self.page_size = page_size
+        self.requests = []
+        self.fail_cursor = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        self.requests.append(params)
+        cursor = params.get("cursor")
+        if cursor is not None and cursor == self.fail_cursor:
+            self.fail_cursor = None
+            return httpx.Response(502)
+        offset = int(cursor) if cursor else 0
+        page = self.listings[offset : offset + self.page_size]
+        nxt = offset + self.page_size
+        body = {"data": page}
+        if nxt < len(self.listings):
+            body["cursor"] = str(nxt)
+        return httpx.Response(200, json=body)
+
+
+def listing(listing_id, price, state="listed"):
+    return {
+        "id": listing_id,
+        "price": price,
+        "state": state,
+        "item": {"market_hash_name": "AK-47 | Redline (Field-Tested)", "float_value": 0.2},
+    }
+
+
+def make_service(upstream, store, tmp_path=None):
+    client = CSFloatClient()
+    client.set_http_client(httpx.Client(transport=httpx.MockTransport(upstream)))
+    checkpoint = str(tmp_path / "checkpoint.json") if tmp_path else None
+    return IngestionService(
+        client, store, [{"category": 1}], checkpoint_path=checkpoint, page_limit=2
+    )
+
+
+class TestIngestionService:
+    def test_given_cursor_chain_when_run_once_then_all_pages_upserted(self):
+        # Arrange
+        upstream = FakeUpstream([listing(str(i), 100 + i) for i in range(5)])
+        store = ListingsStore()
+        service = make_service(upstream, store)
+
+        # Act
+        service.run_once()
+
+        # Assert
+        assert len(store) == 5
+        assert [r.get("cursor") for r in upstream.requests] == [None, "2", "4"]
+        assert all(r["category"] == "1" and r["limit"] == "2" for r in upstream.requests)
+        assert service.stats()["sweeps"] == 1
+
+    def test_given_sold_and_missing_listings_when_next_sweep_then_they_expire(self):
+        # Arrange
+        upstream = FakeUpstream([listing(str(i), 100 + i) for i in range(5)])
+        store = ListingsStore()
+        service = make_service(upstream, store)
+        service.run_once()
+        upstream.listings = [listing("0", 100), listing("1", 101, state="sold"), listing("3", 99)]
+
+        # Act
+        service.run_once()
+
+        # Assert
+        items, total = store.query({"sort_by": "lowest_price", "limit": 10})
+        assert total == 2
+        assert [i["price"] for i in items] == [99, 100]
+        assert service.stats()["expired"] == 3
+
+    def test_given_failure_mid_chain_when_restarted_then_resume_from_checkpoint(self, tmp_path):
+        # Arrange
+        upstream = FakeUpstream([listing(str(i), 100 + i) for i in range(6)])
+        upstream.fail_cursor = "4"
+        first = make_service(upstream, ListingsStore(), tmp_path)
+        with pytest.raises(UpstreamServiceError):
+            first.run_once()
+        saved = json.loads((tmp_path / "checkpoint.json").read_text())
+        upstream.requests.clear()
+
+        # Act
+        store = ListingsStore()
+        make_service(upstream, store, tmp_path).run_once()
+
+        # Assert
+        assert saved["cursor"] == "4"
+        assert [r.get("cursor") for r in upstream.requests] == ["4"]
+        assert len(store) == 2
+        assert json.loads((tmp_path / "checkpoint.json").read_text())["sweep"] == 1
+
+    def test_given_restart_when_listing_gone_then_ids_owned_before_restart_expire(self, tmp_path):
+        # Arrange
+        upstream = FakeUpstream([listing(str(i), 100 + i) for i in range(4)])
+        store = ListingsStore()
+        make_service(upstream, store, tmp_path).run_once()
+        upstream.listings = upstream.listings[:3]
+
+        # Act
+        make_service(upstream, store, tmp_path).run_once()
+
+        # Assert
+        items, total = store.query({"sort_by": "lowest_price", "limit": 10})
+        assert total == 3
+        assert "3" not in {i["id"] for i in items}
+
+    def test_given_restart_mid_sweep_when_resumed_then_ids_seen_before_restart_kept(self, tmp_path):
+        # Arrange
+        upstream = FakeUpstream([listing(str(i), 100 + i) for i in range(6)])
+        store = ListingsStore()
+        make_service(upstream, store, tmp_path).run_once()
+        upstream.fail_cursor = "4"
+        with pytest.raises(UpstreamServiceError):
+            make_service(upstream, store, tmp_path).run_once()
+        position = json.loads((tmp_path / "checkpoint.json").read_text())
+        seen_log = (tmp_path / "checkpoint.json.seen.jsonl").read_text().splitlines()
+
+        # Act
+        make_service(upstream, store, tmp_path).run_once()
+
+        # Assert
+        assert set(position) == {"target", "cursor", "sweep", "targets"}
+        assert [json.loads(line)["ids"] for line in seen_log] == [["0", "1"], ["2", "3"]]
+        assert len(store) == 6
+        assert not (tmp_path / "checkpoint.json.seen.jsonl").exists()
+        owned = json.loads((tmp_path / "checkpoint.json.owned.json").read_text())
+        assert list(owned.values()) == [[str(i) for i in range(6)]]
+
+    def test_given_unexpected_error_when_loop_runs_then_thread_survives_and_retries(
+        self, monkeypatch
+    ):
+        # Arrange
+        upstream = FakeUpstream([listing("0", 100)])
+        service = make_service(upstream, ListingsStore())
+        service._interval = 0.01
+        real_fetch = service._client.fetch_listings_page
+        calls = []
+
+        def flaky_fetch(params, priority):
+            calls.append(params)
+            if len(calls) == 1:
+                raise TypeError("malformed page")
+            return real_fetch(params, priority)
+
+        monkeypatch.setattr(service._client, "fetch_listings_page", flaky_fetch)
+
+        # Act
+        service.start()
+        deadline = time.monotonic() + 2
+        while service.stats()["sweeps"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        service.stop()
+
+        # Assert
+        stats = service.stats()
+        assert stats["errors"] == 1
+        assert stats["last_error"] == "malformed page"
+        assert stats["sweeps"] >= 1
@@ -0,0 +1,296 @@
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.item_names.router as item_names_router
+import backend.features.listings.router as listings_router
+from backend.main import app
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.item_names.catalog import (
+    ItemNamesCatalog,
+    PrefixIndex,
+    TrigramIndex,
+    expand_query,
+    normalize_name,
+)
+
+NAMES = [
+    "AK-47 | Redline (Field-Tested)",
+    "AK-47 | Redline (Minimal Wear)",
+    "AK-47 | Asiimov (Field-Tested)",
+    "AWP | Asiimov (Field-Tested)",
+    "★ Karambit | Doppler (Factory New)",
+    "M4A1-S | Golden Coil (Minimal Wear)",
+]
+
+
+class FakeClient:
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    def fetch_item_names(self, limit=50, priority=None):
+        self.calls += 1
+        return self.names[:limit]
+
+
+def listing(name):
+    return {"id": name, "item": {"market_hash_name": name}}
+
+
+class TestPrefixIndex:
+    def test_given_prefix_when_complete_then_word_starts_match_ranked_by_weight(self):
+        # Arrange
+        index = PrefixIndex(NAMES, [0, 5, 0, 9, 0, 0])
+
+        # Act / Assert
+        assert normalize_name("AK-47 | Redline") == "ak 47 redline"
+        assert index.complete("ak", 2) == [
+            "AK-47 | Redline (Minimal Wear)",
+            "AK-47 | Asiimov (Field-Tested)",
+        ]
+        assert index.complete("asii", 5) == [
+            "AWP | Asiimov (Field-Tested)",
+            "AK-47 | Asiimov (Field-Tested)",
+        ]
+        assert index.complete("Karambit | Dop") == ["★ Karambit | Doppler (Factory New)"]
+        assert index.complete("zeus") == []
+
+    def test_given_long_prefix_when_repeated_then_memoized(self):
+        # Arrange
+        index = PrefixIndex(NAMES)
+
+        # Act
+        first = index.complete("redline field", 5)
+        second = index.complete("redline field", 5)
+
+        # Assert
+        assert first == second == ["AK-47 | Redline (Field-Tested)"]
+        assert len(index._memo) == 1
+
+
+class TestTrigramIndex:
+    def test_given_typos_and_shorthand_when_search_then_canonical_name_first(self):
+        # Arrange
+        index = TrigramIndex(NAMES)
+
+        # Act / Assert
+        assert expand_query("AK redlin FT") == "ak redlin field tested"
+        assert index.search("ak redlin ft", 1)[0][0] == "AK-47 | Redline (Field-Tested)"
+        assert index.search("karambit dopler", 1)[0][0] == "★ Karambit | Doppler (Factory New)"
+        assert index.search("qqq") == []
+
+    def test_given_resolve_when_exact_or_far_then_identity_or_none(self):
+        # Arrange
+        index = TrigramIndex(NAMES)
+
+        # Act / Assert
+        assert index.resolve("awp | asiimov (field-tested)") == (
+            "AWP | Asiimov (Field-Tested)",
+            1.0,
+        )
+        assert index.resolve("golden col mw")[0] == "M4A1-S | Golden Coil (Minimal Wear)"
+        assert index.resolve("sawed-off") is None
+
+    def test_given_tied_similarity_when_search_then_popular_name_first(self):
+        # Arrange
+        index = TrigramIndex(NAMES, [0, 0, 1, 50, 0, 0])
+
+        # Act
+        matches = index.search("asiimov", 2)
+
+        # Assert
+        assert [name for name, _ in matches] == [
+            "AWP | Asiimov (Field-Tested)",
+            "AK-47 | Asiimov (Field-Tested)",
+        ]
+
+    def test_given_large_catalog_when_search_then_common_postings_skipped(self):
+        # Arrange
+        filler = [f"Sticker {i} | Redline (Field-Tested)" for i in range(2000)]
+        index = TrigramIndex(filler + NAMES, max_scan=500)
+
+        # Act
+        matches = index.search("ak 47 redlin", 1)
+
+        # Assert
+        assert matches[0][0] == "AK-47 | Redline (Field-Tested)"
+
+
+class TestItemNamesCatalog:
+    def test_given_refresh_when_reloaded_then_served_from_disk(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "item_names.json")
+        client = FakeClient(NAMES)
+        catalog = ItemNamesCatalog(client, path)
+        catalog.observe([listing("AWP | Dragon Lore (Factory New)")] * 3)
+
+        # Act
+        size = catalog.refresh()
+        warm = ItemNamesCatalog(None, path)
+
+        # Assert
+        assert size == len(NAMES) + 1 and client.calls == 1
+        assert len(warm) == size
+        assert not warm.stale()
+        assert warm.suggest("aw", 2) == [
+            "AWP | Dragon Lore (Factory New)",
+            "AWP | Asiimov (Field-Tested)",
+        ]
+
+    def test_given_fresh_catalog_when_tick_then_no_upstream_call(self, tmp_path):
+        # Arrange
+        now = [1000.0]
+        client = FakeClient(NAMES)
+        catalog = ItemNamesCatalog(client, None, refresh_seconds=60, clock=lambda: now[0])
+
+        # Act
+        catalog._tick()
+        catalog._tick()
+        now[0] += 61
+        catalog._tick()
+
+        # Assert
+        assert client.calls == 2
+
+    def test_given_truncated_file_when_loaded_then_empty_catalog_refreshed_later(self, tmp_path):
+        # Arrange
+        path = tmp_path / "item_names.json"
+        path.write_text('{"fetched_at": 1, "names": ["AK-47 | Red')
+        client = FakeClient(NAMES)
+
+        # Act
+        catalog = ItemNamesCatalog(client, str(path))
+        catalog._tick()
+
+        # Assert
+        assert len(catalog) == len(NAMES)
+        assert client.calls == 1
+        assert ItemNamesCatalog(None, str(path)).suggest("awp", 1) == [
+            "AWP | Asiimov (Field-Tested)"
+        ]
+
+    def test_given_unwritable_path_when_tick_then_error_counted_and_names_served(self, tmp_path):
+        # Arrange
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        catalog = ItemNamesCatalog(FakeClient(NAMES), str(blocker / "item_names.json"))
+
+        # Act
+        catalog._tick()
+
+        # Assert
+        assert catalog.stats()["errors"] == 1
+        assert len(catalog) == len(NAMES)
+
+    def test_given_malformed_upstream_body_when_loop_runs_then_thread_keeps_ticking(self):
+        # Arrange
+        bodies = [["not", "an", "object"], ["still", "a", "list"], {"names": NAMES}]
+
+        def handler(request):
+            return httpx.Response(200, json=bodies.pop(0) if len(bodies) > 1 else bodies[0])
+
+        client = CSFloatClient()
+        client.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+        catalog = ItemNamesCatalog(client, None, refresh_seconds=0, rebuild_seconds=0.01)
+
+        # Act
+        catalog.start()
+        try:
+            deadline = time.monotonic() + 5.0
+            while len(catalog) == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stats = catalog.stats()
+        finally:
+            catalog.stop()
+
+        # Assert
+        assert stats["running"] is True
+        assert stats["errors"] == 2
+        assert len(catalog) == len(NAMES)
+
+
+class TestSuggestEndpoint:
+    def test_given_catalog_when_suggest_then_completions_without_upstream(self, monkeypatch):
+        # Arrange
+        catalog = ItemNamesCatalog(None, None)
+        catalog.observe([listing(name) for name in NAMES])
+        catalog.rebuild()
+        monkeypatch.setattr(item_names_router, "get_item_names_catalog", lambda: catalog)
+
+        def boom(*args, **kwargs):
+            raise AssertionError("upstream must not be called")
+
+        monkeypatch.setattr(item_names_router.csfloat_client, "fetch_item_names", boom)
+        client = TestClient(app)
+
+        # Act
+        suggest = client.get("/item-names/suggest", params={"q": "golden", "limit": 3})
+        names = client.get("/item-names", params={"limit": 2})
+
+        # Assert
+        assert suggest.status_code == 200
+        assert suggest.json() == {"query": "golden", "names": [NAMES[-1]]}
+        assert len(names.json()["names"]) == 2
+
+    @pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 51}])
+    def test_given_bad_limit_when_suggest_then_422(self, params):
+        # Act
+        resp = TestClient(app).get("/item-names/suggest", params={"q": "ak", **params})
+
+        # Assert
+        assert resp.status_code == 422
+
+
+class TestFuzzyEndpoints:
+    @pytest.fixture
+    def catalog(self, monkeypatch):
+        catalog = ItemNamesCatalog(None, None)
+        catalog.observe([listing(name) for name in NAMES])
+        catalog.rebuild()
+        monkeypatch.setattr(item_names_router, "get_item_names_catalog", lambda: catalog)
+        monkeypatch.setattr(listings_router, "get_item_names_catalog", lambda: catalog)
+        return catalog
+
+    def test_given_typo_when_search_then_ranked_matches(self, catalog):
+        # Act
+        resp = TestClient(app).get("/item-names/search", params={"q": "ak redlin ft", "limit": 2})
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["query"] == "ak redlin ft"
+        assert body["matches"][0]["name"] == "AK-47 | Redline (Field-Tested)"
+        assert len(body["matches"]) == 2
+
+    def test_given_resolve_name_when_get_listings_then_query_rewritten(self, catalog, monkeypatch):
+        # Arrange
+        seen = []
+
+        def fake_fetch(params):
+            seen.append(params["market_hash_name"])
+            return [], "MISS"
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", fake_fetch)
+        client = TestClient(app)
+
+        # Act
+        resolved = client.get(
+            "/listings",
+            params={
+                "market_hash_name": "ak redlin ft",
+                "resolve_name": "true",
+                "source": "upstream",
+            },
+        )
+        verbatim = client.get(
+            "/listings", params={"market_hash_name": "ak redlin ft", "source": "upstream"}
+        )
+
+        # Assert
+        assert resolved.status_code == verbatim.status_code == 200
+        assert seen == ["AK-47 | Redline (Field-Tested)", "ak redlin ft"]
+        assert resolved.json()["meta"]["resolved"]["market_hash_name"] == seen[0]
+        assert "resolved" not in verbatim.json()["meta"]
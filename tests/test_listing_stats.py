@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.main import app
+from backend.services.market.stats import StatsCache, compute_listing_stats, items_to_columns
+from backend.services.market.store import ListingsStore
+
+
+def raw_listing(listing_id, price, float_value, name="AK-47 | Redline", def_index=7):
+    return {
+        "id": listing_id,
+        "price": price,
+        "item": {
+            "item_name": name,
+            "wear_name": "Field-Tested",
+            "float_value": float_value,
+            "rarity": 3,
+            "def_index": def_index,
+        },
+    }
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def stats_cache(monkeypatch):
+    cache = StatsCache(maxsize=16, ttl_seconds=60)
+    monkeypatch.setattr(listings_router, "get_stats_cache", lambda: cache)
+    return cache
+
+
+class TestComputeListingStats:
+    def test_given_items_when_compute_then_grouped_percentiles_histogram_and_counts(self):
+        # Arrange
+        items = [
+            {"price": 100, "wear": "Field-Tested", "rarity": "Rare", "float_value": 0.21},
+            {"price": 300, "wear": "Field-Tested", "rarity": "Rare", "float_value": 0.35},
+            {"price": 1000, "wear": "Factory New", "rarity": "Covert", "float_value": 0.01},
+            {"price": 50, "wear": None, "rarity": None, "float_value": None},
+        ]
+
+        # Act
+        stats = compute_listing_stats(items_to_columns(items), bins=4)
+
+        # Assert
+        assert stats["count"] == 4
+        assert stats["price"]["min"] == 50 and stats["price"]["max"] == 1000
+        assert stats["price_by_wear"]["Field-Tested"]["percentiles"]["p50"] == 200.0
+        assert stats["price_by_wear"]["Unknown"]["count"] == 1
+        assert stats["float"]["count"] == 3
+        assert stats["float"]["histogram"]["counts"] == [2, 1, 0, 0]
+        assert stats["rarity_counts"] == {"Covert": 1, "Rare": 2, "Unknown": 1}
+
+    def test_given_no_items_when_compute_then_empty_summaries(self):
+        # Act
+        stats = compute_listing_stats(items_to_columns([]))
+
+        # Assert
+        assert stats["count"] == 0 and stats["price"] is None
+        assert stats["float"]["count"] == 0
+        assert np.sum(stats["float"]["histogram"]["counts"]) == 0
+
+
+class TestListingStatsEndpoint:
+    def test_given_local_store_when_get_stats_then_all_matches_aggregated_and_cached(
+        self, client, stats_cache, monkeypatch
+    ):
+        # Arrange
+        store = ListingsStore()
+        store.upsert(raw_listing(str(i), 1000 + i, i / 100) for i in range(60))
+        store.upsert([raw_listing("x", 5000, 0.02, name="AWP | Asiimov", def_index=9)])
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+
+        # Act
+        resp = client.get("/listings/stats", params={"source": "local", "def_index": 7})
+        again = client.get("/listings/stats", params={"source": "local", "def_index": 7})
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["source"] == "local" and body["stats"]["count"] == 60
+        assert body["stats"]["price"]["max"] == 1059
+        assert body["stats"]["rarity_counts"] == {"Rare": 60}
+        assert again.json() == body
+        assert stats_cache.stats()["hits"] == 1
+
+    def test_given_upstream_source_when_get_stats_then_computed_over_cached_page(
+        self, client, stats_cache, monkeypatch
+    ):
+        # Arrange
+        items = [{"price": p, "wear": "Minimal Wear", "float_value": 0.1} for p in (10, 20, 30)]
+        monkeypatch.setattr(
+            listings_router.csfloat_client, "fetch_listings", lambda params: (items, "HIT")
+        )
+
+        # Act
+        resp = client.get("/listings/stats", params={"source": "upstream", "bins": 2})
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["source"] == "upstream" and body["cache"] == "HIT"
+        assert body["stats"]["price_by_wear"]["Minimal Wear"]["percentiles"]["p50"] == 20.0
+        assert body["stats"]["float"]["histogram"]["counts"] == [3, 0]
+
+    def test_given_filter_store_cannot_evaluate_when_auto_then_answered_upstream(
+        self, client, stats_cache, monkeypatch
+    ):
+        # Arrange
+        store = ListingsStore()
+        store.upsert(raw_listing(str(i), 1000 + i, i / 100) for i in range(10))
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+        seen = []
+
+        def fake_fetch(params):
+            seen.append(params)
+            return [{"price": 10, "wear": "Minimal Wear", "float_value": 0.1}], "MISS"
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", fake_fetch)
+
+        # Act
+        resp = client.get(
+            "/listings/stats", params={"source": "auto", "collection": "set_community_1"}
+        )
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["source"] == "upstream" and body["stats"]["count"] == 1
+        assert seen[0]["collection"] == "set_community_1"
+
+    def test_given_filter_store_cannot_evaluate_when_local_then_400(
+        self, client, stats_cache, monkeypatch
+    ):
+        # Arrange
+        store = ListingsStore()
+        store.upsert([raw_listing("1", 1000, 0.1)])
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+
+        # Act
+        resp = client.get("/listings/stats", params={"source": "local", "stickers": "[1]"})
+
+        # Assert
+        assert resp.status_code == 400
+        assert "local listings store" in resp.json()["message"]
@@ -0,0 +1,296 @@
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.core.exceptions import ValidationError
+from backend.main import app
+from backend.services.market.store import ListingsStore, filter_listings
+
+
+def raw_listing(
+    listing_id, price, float_value, name="AK-47 | Redline", wear="Field-Tested", **item
+):
+    return {
+        "id": listing_id,
+        "price": price,
+        "type": "buy_now",
+        "created_at": "2024-05-01T12:00:00Z",
+        "item": {
+            "item_name": name,
+            "market_hash_name": f"{name} ({wear})",
+            "wear_name": wear,
+            "float_value": float_value,
+            "rarity": item.pop("rarity", 3),
+            "def_index": item.pop("def_index", 7),
+            "paint_index": item.pop("paint_index", 282),
+            "paint_seed": item.pop("paint_seed", 100),
+            **item,
+        },
+    }
+
+
+@pytest.fixture
+def store():
+    s = ListingsStore(capacity=16)
+    s.upsert(
+        [
+            raw_listing("1", 1500, 0.20),
+            raw_listing("2", 900, 0.35),
+            raw_listing("3", 1200, 0.16),
+            raw_listing("4", 5000, 0.01, name="AWP | Asiimov", wear="Factory New", def_index=9),
+            raw_listing("5", 700, None),
+        ]
+    )
+    return s
+
+
+class TestListingsStore:
+    def test_given_price_range_when_query_lowest_price_then_top_k_sorted(self, store):
+        # Arrange
+        params = {"min_price": 800, "max_price": 2000, "sort_by": "lowest_price", "limit": 2}
+
+        # Act
+        items, total = store.query(params)
+
+        # Assert
+        assert total == 3
+        assert [i["price"] for i in items] == [900, 1200]
+
+    def test_given_missing_floats_when_query_highest_float_then_missing_sort_last(self, store):
+        # Arrange
+        params = {"sort_by": "highest_float", "limit": 10}
+
+        # Act
+        items, _ = store.query(params)
+
+        # Assert
+        assert [i["float_value"] for i in items] == [0.35, 0.20, 0.16, 0.01, None]
+
+    def test_given_def_index_and_name_filters_when_query_then_vectorized_match(self, store):
+        # Arrange / Act
+        by_def, _ = store.query({"def_index": [9], "sort_by": "lowest_price"})
+        by_name, total = store.query(
+            {"market_hash_name": "AK-47 | Redline (Field-Tested)", "max_float": 0.3}
+        )
+
+        # Assert
+        assert [i["name"] for i in by_def] == ["AWP | Asiimov"]
+        assert by_def[0]["wear"] == "Factory New" and by_def[0]["rarity"] == "Rare"
+        assert total == 2 and {i["price"] for i in by_name} == {1500, 1200}
+
+    def test_given_existing_listing_when_upsert_and_remove_then_counts_and_rows_reused(self, store):
+        # Arrange / Act
+        counts = store.upsert([raw_listing("1", 1400, 0.20), raw_listing("6", 100, 0.5)])
+        removed = store.remove(["2", "missing"])
+        store.upsert([raw_listing("7", 200, 0.6)])
+
+        # Assert
+        assert counts == {"added": 1, "updated": 1, "repriced": 1}
+        assert removed == 1
+        assert len(store) == 6
+        assert store.stats()["free_rows"] == 0
+
+    def test_given_unsupported_sort_when_query_then_raise_validation_error(self, store):
+        # Arrange
+        params = {"sort_by": "best_deal"}
+
+        # Act / Assert
+        assert store.supports(params) is False
+        assert store.supports({"sort_by": "lowest_price", "cursor": "abc"}) is False
+        with pytest.raises(ValidationError):
+            store.query(params)
+
+    def test_given_many_rows_when_grown_then_all_rows_queryable(self):
+        # Arrange
+        s = ListingsStore(capacity=16)
+
+        # Act
+        s.upsert(raw_listing(str(i), 1000 + i, (i % 100) / 100) for i in range(500))
+        items, total = s.query({"sort_by": "highest_price", "limit": 3})
+
+        # Assert
+        assert total == 500
+        assert [i["price"] for i in items] == [1499, 1498, 1497]
+
+
+class TestFilterListings:
+    def test_given_page_when_filter_listings_then_matches_in_original_order(self):
+        # Arrange
+        page = [
+            raw_listing("1", 1500, 0.20),
+            raw_listing("2", 900, 0.35),
+            {"price": 100, "item": {}},
+            raw_listing("3", 1200, 0.16, name="AWP | Asiimov"),
+            raw_listing("4", 800, None),
+        ]
+        params = {"max_price": 1000, "item_name": "AK-47 | Redline"}
+
+        # Act
+        kept = filter_listings(page, params)
+
+        # Assert
+        assert [listing["id"] for listing in kept] == ["2", "4"]
+
+    def test_given_small_page_when_filter_listings_then_allocation_scales_with_page(self):
+        # Arrange
+        page = [raw_listing(str(i), 1000 + i, (i % 100) / 100) for i in range(50)]
+        params = {"max_price": 1040, "max_float": 0.5}
+
+        # Act
+        tracemalloc.start()
+        try:
+            kept = filter_listings(page, params)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Assert
+        assert [listing["id"] for listing in kept] == [str(i) for i in range(41)]
+        assert peak < 64 * 1024
+
+
+class TestListingsLocalSource:
+    def test_given_source_local_when_get_listings_then_answer_from_store(self, store, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+
+        def boom(params):
+            raise AssertionError("upstream must not be called")
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", boom)
+
+        # Act
+        resp = client.get("/listings", params={"source": "local", "sort_by": "lowest_price"})
+        bad = client.get("/listings", params={"source": "local", "sort_by": "best_deal"})
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["meta"]["source"] == "local" and body["meta"]["total_matches"] == 5
+        assert [i["price"] for i in body["data"]][:2] == [700, 900]
+        assert bad.status_code == 400
+
+
+class TestListingChanges:
+    def test_given_version_when_changes_then_only_deltas_for_query(self, store):
+        # Arrange
+        since = store.version
+        store.upsert([raw_listing("1", 1400, 0.20), raw_listing("6", 800, 0.3)])
+        store.upsert([raw_listing("3", 1200, 0.16)])  # unchanged price: no new version
+        store.remove(["2", "4"])
+
+        # Act
+        delta = store.changes({"def_index": [7]}, since)
+
+        # Assert
+        assert delta["version"] == since + 2 and delta["reset"] is False
+        assert [i["id"] for i in delta["added"]] == ["6"]
+        assert [(i["id"], i["price"]) for i in delta["repriced"]] == [("1", 1400)]
+        assert delta["removed"] == ["2"]  # "4" is def_index 9, outside the query
+        assert store.changes({}, delta["version"])["added"] == []
+
+    def test_given_repriced_out_of_range_when_changes_then_reported_removed(self, store):
+        # Arrange
+        since = store.version
+        store.upsert([raw_listing("1", 9000, 0.20)])
+
+        # Act
+        delta = store.changes({"max_price": 2000}, since)
+
+        # Assert
+        assert delta["repriced"] == [] and delta["removed"] == ["1"]
+
+    def test_given_evicted_tombstones_when_changes_from_old_version_then_reset(self):
+        # Arrange
+        s = ListingsStore(capacity=16, tombstone_capacity=2)
+        s.upsert(raw_listing(str(i), 100 + i, 0.1) for i in range(4))
+        since = s.version
+        for i in range(3):
+            s.remove([str(i)])
+
+        # Act
+        stale = s.changes({}, since)
+        recent = s.changes({}, since + 1)
+        future = s.changes({}, s.version + 5)
+
+        # Assert
+        assert stale["reset"] is True and stale["removed"] == []
+        assert recent["reset"] is False and recent["removed"] == ["1", "2"]
+        assert future["reset"] is True
+
+    def test_given_changes_endpoint_when_polled_then_returns_deltas(self, store, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+        first = client.get(
+            "/listings", params={"source": "local", "sort_by": "lowest_price"}
+        ).json()
+        since = first["meta"]["version"]
+        store.upsert([raw_listing("8", 650, 0.4)])
+        store.remove(["5"])
+
+        # Act
+        resp = client.get("/listings/changes", params={"since": since, "max_price": 1000})
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["since"] == since and body["version"] == since + 2
+        assert [i["id"] for i in body["added"]] == ["8"]
+        assert body["removed"] == ["5"] and body["reset"] is False
+        assert first["data"][0]["id"] == "5"
+
+
+class TestComparables:
+    def test_given_listing_when_comparables_then_k_nearest_float_same_name(self, store):
+        # Arrange
+        store.upsert([raw_listing("6", 1300, 0.19), raw_listing("7", 1000, 0.21)])
+
+        # Act
+        result = store.comparables("1", k=3)
+
+        # Assert
+        assert result["listing"]["id"] == "1"
+        assert [c["id"] for c in result["comparables"]] == ["6", "3", "7"]
+        assert result["comparables"][0]["price_delta"] == -200
+        assert abs(result["comparables"][1]["float_delta"] + 0.04) < 1e-9
+
+    def test_given_float_and_price_nearest_disagree_when_comparables_then_both_count(self, store):
+        # Arrange
+        store.upsert([raw_listing("a", 3000, 0.21), raw_listing("b", 1500, 0.23)])
+
+        # Act
+        result = store.comparables("1", k=2)
+
+        # Assert
+        assert [c["id"] for c in result["comparables"]] == ["b", "3"]
+
+    def test_given_group_changes_when_comparables_then_index_rebuilt(self, store):
+        # Arrange
+        before = store.comparables("2", k=5)
+        store.remove(["1"])
+        store.upsert([raw_listing("8", 800, 0.34)])
+
+        # Act
+        after = store.comparables("2", k=5)
+
+        # Assert
+        assert [c["id"] for c in before["comparables"]] == ["3", "1"]
+        assert [c["id"] for c in after["comparables"]] == ["8", "3"]
+
+    def test_given_unknown_listing_when_endpoint_then_404(self, store, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(listings_router, "get_listings_store", lambda: store)
+
+        # Act
+        found = client.get("/listings/3/comparables", params={"k": 1})
+        missing = client.get("/listings/nope/comparables")
+
+        # Assert
+        assert found.status_code == 200
+        assert [c["id"] for c in found.json()["comparables"]] == ["1"]
+        assert missing.status_code == 404
@@ -0,0 +1,93 @@
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.metadata.catalog import BUNDLED_PATH, MetadataCatalog, get_metadata_catalog
+
+DOC = {
+    "version": 3,
+    "weapons": [
+        {"def_index": 9, "name": "AWP", "type": "Sniper Rifle"},
+        {"def_index": 7, "name": "AK-47", "type": "Rifle"},
+    ],
+    "paint_kits": [{"paint_index": 282, "name": "Redline", "min_float": 0.1, "max_float": 0.7}],
+    "collections": [
+        {"key": "set_community_2", "name": "The Phoenix Collection", "items": [[7, 282]]}
+    ],
+}
+
+
+class TestMetadataCatalog:
+    def test_given_bundle_when_loaded_then_document_and_counts_exposed(self):
+        # Arrange
+        compressed = gzip.compress(json.dumps(DOC).encode("utf-8"))
+
+        # Act
+        catalog = MetadataCatalog(compressed)
+
+        # Assert
+        assert json.loads(catalog.document) == DOC
+        assert catalog.compressed == compressed
+        assert catalog.etag.startswith('"') and catalog.etag.endswith('"')
+        assert catalog.stats() == {
+            "weapons": 2,
+            "paint_kits": 1,
+            "collections": 1,
+            "version": 3,
+            "bytes": len(compressed),
+        }
+
+    def test_given_bundle_when_loaded_then_lookup_tables_built(self):
+        # Arrange
+        compressed = gzip.compress(json.dumps(DOC).encode("utf-8"))
+
+        # Act
+        catalog = MetadataCatalog(compressed)
+
+        # Assert
+        assert catalog.weapon_name(7) == "AK-47" and catalog.weapon_name(1) is None
+        assert catalog.paint_kit_name(282) == "Redline"
+        assert catalog.paint_kits[282]["max_float"] == 0.7
+        assert catalog.collections["set_community_2"]["name"] == "The Phoenix Collection"
+        assert catalog.collections_for(7, 282) == ["set_community_2"]
+        assert catalog.collections_for(9, 282) == []
+
+    def test_given_bundled_file_when_loaded_then_well_formed(self):
+        # Act
+        catalog = MetadataCatalog.load(BUNDLED_PATH)
+        doc = json.loads(catalog.document)
+
+        # Assert
+        weapons = {w["def_index"]: w["name"] for w in doc["weapons"]}
+        kits = {k["paint_index"]: k for k in doc["paint_kits"]}
+        phoenix = next(c for c in doc["collections"] if c["key"] == "set_community_2")
+        assert weapons[7] == "AK-47"
+        assert kits[344]["name"] == "Dragon Lore"
+        assert all(0.0 <= k["min_float"] < k["max_float"] <= 1.0 for k in kits.values())
+        assert [9, 279] in phoenix["items"]
+        assert catalog.weapon_name(7) == "AK-47" and catalog.paint_kit_name(344) == "Dragon Lore"
+        assert "set_community_2" in catalog.collections_for(9, 279)
+        assert len(catalog.weapons) == len(doc["weapons"])
+
+
+class TestMetadataEndpoint:
+    def test_given_gzip_client_when_get_then_bundle_bytes_with_long_cache(self):
+        # Arrange
+        client = TestClient(app)
+        bundle = get_metadata_catalog()
+
+        # Act
+        resp = client.get("/metadata", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/metadata", headers={"Accept-Encoding": "identity"})
+        revalidated = client.get("/metadata", headers={"If-None-Match": resp.headers["etag"]})
+
+        # Assert
+        assert resp.status_code == plain.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert int(resp.headers["content-length"]) == len(bundle.compressed)
+        assert "max-age=86400" in resp.headers["cache-control"]
+        assert resp.json() == plain.json()
+        assert "content-encoding" not in plain.headers
+        assert revalidated.status_code == 304
@@ -0,0 +1,140 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.history.router as history_router
+from backend.core.exceptions import ValidationError
+from backend.main import app
+from backend.services.market.history import PriceHistoryStore
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def listing(listing_id, price, name="AK-47 | Redline", wear="Field-Tested"):
+    return {
+        "id": listing_id,
+        "price": price,
+        "item": {"item_name": name, "wear_name": wear, "float_value": 0.2},
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def history(tmp_path, clock):
+    return PriceHistoryStore(str(tmp_path), clock=clock)
+
+
+class TestPriceHistoryStore:
+    def test_given_repeat_sightings_when_record_then_only_new_or_repriced_appended(self, history):
+        # Arrange / Act
+        first = history.record([listing("1", 1000), listing("2", 1100)])
+        again = history.record([listing("1", 1000), listing("2", 1050)])
+
+        # Assert
+        assert first == 2 and again == 1
+        assert history.query("AK-47 | Redline", "Field-Tested")["observations"] == 3
+        assert history.query("AK-47 | Redline", "Minimal Wear")["observations"] == 0
+
+    def test_given_long_series_when_query_points_then_min_median_max_per_bin(self, history, clock):
+        # Arrange
+        for hour in range(10):
+            clock.now = 1_700_000_000 + hour * 3600
+            history.record([listing(f"{hour}-{i}", 1000 + hour * 10 + i) for i in range(3)])
+
+        # Act
+        result = history.query("AK-47 | Redline", "Field-Tested", points=5)
+
+        # Assert
+        assert result["observations"] == 30
+        assert len(result["points"]) == 5
+        first = result["points"][0]
+        assert (first["min"], first["median"], first["max"], first["count"]) == (
+            1000,
+            1006.0,
+            1012,
+            6,
+        )
+        assert result["points"][-1]["max"] == 1092
+
+    def test_given_time_window_when_query_then_only_records_in_range(self, history, clock):
+        # Arrange
+        for day in range(3):
+            clock.now = 1_700_000_000 + day * 86400
+            history.record([listing(str(day), 500 + day)])
+
+        # Act
+        result = history.query(
+            "AK-47 | Redline",
+            "Field-Tested",
+            start=1_700_000_000 + 86400,
+            end=1_700_000_000 + 86400,
+        )
+
+        # Assert
+        assert result["observations"] == 1 and result["points"][0]["min"] == 501
+        with pytest.raises(ValidationError):
+            history.query("AK-47 | Redline", points=0)
+
+    def test_given_reopened_directory_when_query_then_history_persists(self, tmp_path, history):
+        # Arrange
+        history.record([listing("1", 1000)])
+
+        # Act
+        reopened = PriceHistoryStore(str(tmp_path))
+
+        # Assert
+        assert reopened.query("AK-47 | Redline", "Field-Tested")["observations"] == 1
+        assert reopened.buckets() == [{"name": "AK-47 | Redline", "wear": "Field-Tested"}]
+
+    def test_given_corrupt_index_when_opened_then_empty_and_buckets_reattached(
+        self, tmp_path, history
+    ):
+        # Arrange
+        history.record([listing("1", 1000)])
+        (tmp_path / "index.json").write_text('{"AK-47 | Redline|Field-Tes')
+
+        # Act
+        reopened = PriceHistoryStore(str(tmp_path))
+        before = reopened.buckets()
+        reopened.record([listing("2", 1100)])
+
+        # Assert
+        assert before == []
+        assert reopened.query("AK-47 | Redline", "Field-Tested")["observations"] == 2
+        assert PriceHistoryStore(str(tmp_path)).buckets() == [
+            {"name": "AK-47 | Redline", "wear": "Field-Tested"}
+        ]
+
+
+class TestHistoryEndpoint:
+    def test_given_recorded_prices_when_get_history_then_downsampled_series(
+        self, history, monkeypatch
+    ):
+        # Arrange
+        client = TestClient(app)
+        history.record([listing("1", 1000), listing("2", 1200)])
+        monkeypatch.setattr(history_router, "get_price_history", lambda: history)
+
+        # Act
+        resp = client.get(
+            "/history", params={"name": "AK-47 | Redline", "wear": "Field-Tested", "points": 10}
+        )
+        missing = client.get("/history")
+
+        # Assert
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["observations"] == 2
+        assert body["points"] == [
+            {"ts": 1_700_000_000, "min": 1000, "median": 1100.0, "max": 1200, "count": 2}
+        ]
+        assert missing.status_code == 422
@@ -0,0 +1,140 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.core.exceptions import ValidationError
+from backend.main import app
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.csfloat.projection import (
+    DEFAULT_FIELDS,
+    listing_to_item,
+    parse_fields,
+    projector,
+)
+from backend.services.market.store import ListingsStore
+
+LISTING = {
+    "id": 42,
+    "price": 1250,
+    "item": {
+        "item_name": "AK-47 | Redline",
+        "market_hash_name": "AK-47 | Redline (Field-Tested)",
+        "wear_name": "Field-Tested",
+        "rarity": 5,
+        "float_value": 0.21,
+        "def_index": 7,
+        "paint_index": 282,
+        "paint_seed": 661,
+        "inspect_link": "steam://rungame/730/+csgo_econ_action_preview%20A42",
+        "stickers": [{"stickerId": 1, "slot": 0, "name": "Sticker | Crown", "wear": 0.1}],
+    },
+}
+
+
+class TestProjector:
+    def test_given_same_field_set_when_projector_then_compiled_once(self):
+        # Act / Assert
+        assert projector(("id", "price")) is projector(("id", "price"))
+        assert projector(DEFAULT_FIELDS) is listing_to_item
+
+    def test_given_default_fields_when_project_then_api_item_shape(self):
+        # Act
+        item = listing_to_item(LISTING)
+
+        # Assert
+        assert item == {
+            "id": "42",
+            "name": "AK-47 | Redline",
+            "price": 1250,
+            "wear": "Field-Tested",
+            "rarity": "Legendary",
+            "float_value": 0.21,
+        }
+
+    def test_given_rich_fields_when_project_then_only_requested_keys(self):
+        # Act
+        item = projector(parse_fields("stickers,paint_seed,id"))(LISTING)
+
+        # Assert
+        assert list(item) == ["id", "paint_seed", "stickers"]
+        assert item["stickers"] == [{"name": "Sticker | Crown", "slot": 0, "wear": 0.1}]
+
+    def test_given_field_specs_when_parse_then_canonical_or_error(self):
+        # Act / Assert
+        assert parse_fields(None) is None
+        assert parse_fields("float_value,rarity,wear,price,name,id") is None
+        assert parse_fields(" price , id ") == ("id", "price")
+        with pytest.raises(ValidationError):
+            parse_fields("id,owner")
+
+
+class TestClientProjection:
+    def test_given_cached_page_when_other_fields_requested_then_no_second_upstream_call(self):
+        # Arrange
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"data": [LISTING]})
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+        params = {"min_price": 77.0}
+
+        # Act
+        lean, first = csfloat.fetch_listings(params)
+        rich, second = csfloat.fetch_listings(params, fields=("id", "inspect_link"))
+        again, _ = csfloat.fetch_listings(params, fields=("id", "inspect_link"))
+
+        # Assert
+        assert (first, second) == ("MISS", "HIT")
+        assert len(calls) == 1
+        assert "inspect_link" not in lean[0]
+        assert rich == [{"id": "42", "inspect_link": LISTING["item"]["inspect_link"]}]
+        assert again is rich
+        assert csfloat.listings_digest(params, rich) == csfloat.listings_digest(params, lean)
+
+
+class TestListingsFields:
+    def test_given_fields_when_get_listings_then_sparse_items(self, monkeypatch):
+        # Arrange
+        seen = []
+
+        def fake_fetch(params, fields=None):
+            seen.append(fields)
+            return [projector(fields or DEFAULT_FIELDS)(LISTING)], "MISS"
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", fake_fetch)
+        client = TestClient(app)
+
+        # Act
+        sparse = client.get("/listings", params={"fields": "price,paint_seed"})
+        lean = client.get("/listings")
+
+        # Assert
+        assert sparse.status_code == 200
+        assert seen == [("price", "paint_seed"), None]
+        assert sparse.json()["data"] == [{"price": 1250, "paint_seed": 661}]
+        assert set(lean.json()["data"][0]) == set(DEFAULT_FIELDS)
+        assert sparse.headers["etag"] != lean.headers["etag"]
+
+    def test_given_unknown_field_when_get_listings_then_400(self):
+        # Act
+        resp = TestClient(app).get("/listings", params={"fields": "id,owner"})
+
+        # Assert
+        assert resp.status_code == 400
+
+    def test_given_local_fields_when_query_store_then_projected_rows(self):
+        # Arrange
+        store = ListingsStore()
+        store.upsert([LISTING])
+
+        # Act
+        items, total = store.query({"sort_by": "lowest_price", "fields": ("id", "paint_seed")})
+
+        # Assert
+        assert total == 1
+        assert items == [{"id": "42", "paint_seed": 661}]
+        assert not store.supports({"fields": ("id", "stickers")})
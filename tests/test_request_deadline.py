@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.core.deadline import (
+    DEADLINE_HEADER,
+    TIMEOUT_HEADER,
+    DeadlineMiddleware,
+    deadline_scope,
+    remaining,
+)
+from backend.core.exceptions import DeadlineExceededError
+from backend.main import app
+from backend.services.csfloat.client import CSFloatClient
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestDeadlineMiddleware:
+    def test_given_expired_deadline_header_when_get_listings_then_504_without_work(
+        self, client, monkeypatch
+    ):
+        # Arrange
+        calls = []
+        monkeypatch.setattr(
+            listings_router.csfloat_client,
+            "fetch_listings",
+            lambda params: calls.append(params) or ([], "MISS"),
+        )
+
+        # Act
+        resp = client.get("/listings", headers={DEADLINE_HEADER: str(time.time() - 1)})
+
+        # Assert
+        assert resp.status_code == 504
+        assert resp.json()["error"] == "deadline_exceeded"
+        assert calls == []
+
+    def test_given_slow_upstream_when_deadline_passes_then_504_at_deadline(
+        self, client, monkeypatch
+    ):
+        # Arrange
+        def slow_fetch(params):
+            time.sleep(1.0)
+            return [], "MISS"
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", slow_fetch)
+
+        # Act
+        start = time.monotonic()
+        resp = client.get("/listings", headers={DEADLINE_HEADER: str(time.time() + 0.2)})
+        elapsed = time.monotonic() - start
+
+        # Assert
+        assert resp.status_code == 504
+        assert elapsed < 0.9
+
+    def test_given_relative_timeout_header_when_upstream_slow_then_504_at_budget(
+        self, client, monkeypatch
+    ):
+        # Arrange
+        def slow_fetch(params):
+            time.sleep(1.0)
+            return [], "MISS"
+
+        monkeypatch.setattr(listings_router.csfloat_client, "fetch_listings", slow_fetch)
+
+        # Act
+        start = time.monotonic()
+        resp = client.get("/listings", headers={TIMEOUT_HEADER: "0.2"})
+        elapsed = time.monotonic() - start
+
+        # Assert
+        assert resp.status_code == 504
+        assert elapsed < 0.9
+
+    def test_given_budget_above_max_when_request_then_budget_is_clamped(self):
+        # Arrange
+        seen = []
+        inner = FastAPI()
+
+        @inner.get("/budget")
+        def budget():
+            seen.append(remaining())
+            return {}
+
+        client = TestClient(DeadlineMiddleware(inner, max_seconds=5.0))
+
+        # Act
+        client.get("/budget", headers={DEADLINE_HEADER: str(time.time() + 3600)})
+
+        # Assert
+        assert seen[0] is not None and 0 < seen[0] <= 5.0
+
+    def test_given_streaming_response_when_deadline_passes_mid_body_then_body_completes(self):
+        # Arrange
+        inner = FastAPI()
+
+        @inner.get("/stream")
+        async def stream():
+            async def rows():
+                for i in range(3):
+                    await asyncio.sleep(0.1)
+                    yield f"{i}:{remaining()}\n"
+
+            return StreamingResponse(rows(), media_type="text/plain")
+
+        client = TestClient(DeadlineMiddleware(inner))
+
+        # Act
+        resp = client.get("/stream", headers={TIMEOUT_HEADER: "0.15"})
+
+        # Assert
+        assert resp.status_code == 200
+        assert resp.text.splitlines() == ["0:None", "1:None", "2:None"]
+
+
+class TestCSFloatClientDeadline:
+    def test_given_expired_deadline_when_fetch_listings_then_no_upstream_call(self):
+        # Arrange
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"data": []})
+
+        csfloat = CSFloatClient()
+        csfloat.set_http_client(httpx.Client(transport=httpx.MockTransport(handler)))
+
+        # Act / Assert
+        with deadline_scope(time.monotonic() - 0.01):
+            with pytest.raises(DeadlineExceededError):
+                csfloat.fetch_listings({"min_price": 1.0})
+        assert calls == []
+
+    def test_given_remaining_budget_when_request_then_timeouts_are_clamped(self):
+        # Arrange
+        csfloat = CSFloatClient()
+
+        # Act
+        with deadline_scope(time.monotonic() + 0.5):
+            timeout = csfloat._request_timeout()
+
+        # Assert
+        assert isinstance(timeout, httpx.Timeout)
+        assert timeout.read is not None and timeout.read <= 0.5
+        assert timeout.connect is not None and timeout.connect <= 0.5
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from backend.core.exceptions import UpstreamServiceError
+from backend.services.csfloat.scheduler import Priority, UpstreamScheduler
+
+
+def _wait_queued(scheduler, priority, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if scheduler.stats()["classes"][priority.name.lower()]["queued"] >= count:
+            return
+        time.sleep(0.005)
+    raise AssertionError("waiters did not queue in time")
+
+
+class TestUpstreamScheduler:
+    def test_given_pool_full_when_interactive_times_out_then_raise_upstream_error(self):
+        # Arrange
+        scheduler = UpstreamScheduler(1)
+        scheduler.acquire(Priority.INTERACTIVE)
+
+        # Act / Assert
+        with pytest.raises(UpstreamServiceError):
+            scheduler.acquire(Priority.INTERACTIVE, timeout=0.05)
+        assert scheduler.stats()["classes"]["interactive"]["timeouts"] == 1
+
+    def test_given_bulk_at_cap_when_interactive_arrives_then_interactive_gets_headroom(self):
+        # Arrange
+        scheduler = UpstreamScheduler(4, bulk_share=0.25)
+        scheduler.acquire(Priority.BULK)
+
+        # Act / Assert
+        with pytest.raises(UpstreamServiceError):
+            scheduler.acquire(Priority.BULK, timeout=0.05)
+        scheduler.acquire(Priority.INTERACTIVE, timeout=0.05)
+        assert scheduler.stats()["classes"]["interactive"]["in_use"] == 1
+
+    def test_given_queued_background_and_interactive_when_slot_frees_then_order_is_weighted(
+        self,
+    ):
+        # Arrange
+        scheduler = UpstreamScheduler(1, prefetch_share=1.0, bulk_share=1.0, prefetch_weight=3)
+        scheduler.acquire(Priority.INTERACTIVE)
+        order = []
+
+        def worker(priority):
+            scheduler.acquire(priority)
+            order.append(priority)
+            scheduler.release(priority)
+
+        threads = []
+        for priority, n in ((Priority.BULK, 2), (Priority.PREFETCH, 3)):
+            for _ in range(n):
+                t = threading.Thread(target=worker, args=(priority,))
+                t.start()
+                threads.append(t)
+            _wait_queued(scheduler, priority, n)
+        late = threading.Thread(target=worker, args=(Priority.INTERACTIVE,))
+        late.start()
+        threads.append(late)
+        _wait_queued(scheduler, Priority.INTERACTIVE, 1)
+
+        # Act
+        scheduler.release(Priority.INTERACTIVE)
+        for t in threads:
+            t.join(timeout=2)
+
+        # Assert
+        P, B = Priority.PREFETCH, Priority.BULK
+        assert order == [Priority.INTERACTIVE, P, P, B, P, B]
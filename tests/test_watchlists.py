@@ -0,0 +1,301 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.watchlists.router as watchlists_router
+from backend.core.exceptions import ValidationError
+from backend.config.settings import get_settings
+from backend.main import app
+from backend.models.watchlist import WatchlistCreate
+from backend.services.csfloat.client import CSFloatClient
+from backend.services.watchlists.engine import WatchlistEngine
+from backend.services.watchlists.events import EventBroker, sse_events
+from backend.services.watchlists.registry import WatchlistRegistry
+
+
+class FakeUpstream:
+    def __init__(self):
+        self.listings = {"1": 1000, "2": 2000}
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(dict(request.url.params))
+        data = [
+            {"id": lid, "price": price, "item": {"item_name": "AK-47 | Redline"}}
+            for lid, price in self.listings.items()
+        ]
+        return httpx.Response(200, json={"data": data})
+
+
+class RecordingBroker(EventBroker):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def publish(self, event):
+        self.events.append(event)
+        return super().publish(event)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return WatchlistRegistry(str(tmp_path / "watchlists.json"), ["localhost"])
+
+
+def spec(name, max_price=5000.0, **kwargs):
+    return WatchlistCreate(
+        name=name, params={"max_price": max_price, "sort_by": "lowest_price"}, **kwargs
+    )
+
+
+class TestWatchlistRegistry:
+    def test_given_watchlists_when_grouped_then_identical_searches_share_a_key(
+        self, registry, tmp_path
+    ):
+        # Arrange
+        registry.create(spec("a"))
+        registry.create(spec("b"))
+        registry.create(spec("c", max_price=10.0))
+
+        # Act
+        groups = registry.grouped()
+        reloaded = WatchlistRegistry(str(tmp_path / "watchlists.json"), ["localhost"])
+
+        # Assert
+        assert sorted(len(watchers) for _, watchers in groups.values()) == [1, 2]
+        assert {w.name for w in reloaded.list()} == {"a", "b", "c"}
+
+    def test_given_searches_differing_only_in_name_or_rarity_when_grouped_then_kept_apart(
+        self, registry
+    ):
+        # Arrange
+        base = {"max_price": 50, "sort_by": "lowest_price"}
+        registry.create(WatchlistCreate(name="ak", params=dict(base, market_hash_name="AK")))
+        registry.create(WatchlistCreate(name="awp", params=dict(base, market_hash_name="AWP")))
+        registry.create(
+            WatchlistCreate(name="awp5", params=dict(base, market_hash_name="AWP", rarity=5))
+        )
+
+        # Act
+        groups = registry.grouped()
+
+        # Assert
+        assert len(groups) == 3
+        assert {p.get("rarity") for p, _ in groups.values()} == {None, 5}
+
+    @pytest.mark.parametrize(
+        "content", ['[{"id": "w1", "name": "cheap', '[{"id": "w1"}]', '{"id": "w1"}', "[1]"]
+    )
+    def test_given_corrupt_file_when_loaded_then_empty_registry(self, tmp_path, content):
+        # Arrange
+        path = tmp_path / "watchlists.json"
+        path.write_text(content)
+
+        # Act
+        loaded = WatchlistRegistry(str(path), ["localhost"])
+        created = loaded.create(spec("cheap AKs"))
+
+        # Assert
+        assert [w.id for w in loaded.list()] == [created.id]
+        assert [w.id for w in WatchlistRegistry(str(path)).list()] == [created.id]
+
+    def test_given_unfilterable_search_when_create_then_rejected(self, registry):
+        # Act / Assert
+        with pytest.raises(ValidationError):
+            registry.create(WatchlistCreate(name="x", params={"stickers": "[1]"}))
+
+    def test_given_remote_webhook_when_create_then_rejected(self, registry):
+        # Act / Assert
+        with pytest.raises(ValidationError):
+            registry.create(spec("x", webhook_url="http://example.com/hook"))
+        assert registry.create(spec("y", webhook_url="http://localhost:9000/hook")).id
+
+
+class TestWatchlistEngine:
+    def test_given_shared_searches_when_results_change_then_one_eval_and_event_per_watcher(
+        self, registry
+    ):
+        # Arrange
+        upstream = FakeUpstream()
+        client = CSFloatClient()
+        client.set_http_client(httpx.Client(transport=httpx.MockTransport(upstream)))
+        hooks = []
+        webhook = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda r: hooks.append(json.loads(r.content)) or httpx.Response(204)
+            )
+        )
+        broker = RecordingBroker()
+        a = registry.create(spec("a", webhook_url="http://localhost/hook"))
+        b = registry.create(spec("b"))
+        engine = WatchlistEngine(client, registry, broker, webhook_client=webhook)
+
+        # Act
+        baseline = engine.run_once()
+        upstream.listings.update({"2": 1500, "3": 900})
+        second = engine.run_once()
+        quiet = engine.run_once()
+        engine.flush_webhooks(timeout=5)
+
+        # Assert
+        assert baseline == 1 and second == 1 and quiet == 1
+        assert len(upstream.requests) == 3
+        assert sorted(e["watchlist_id"] for e in broker.events) == sorted([a.id, b.id])
+        event = broker.events[0]
+        assert [i["id"] for i in event["new"]] == ["3"]
+        assert [(i["id"], i["price"]) for i in event["repriced"]] == [("2", 1500)]
+        assert [h["watchlist_id"] for h in hooks] == [a.id]
+        assert engine.stats()["webhooks_sent"] == 1
+
+    def test_given_searches_for_different_names_when_evaluated_then_each_sees_only_its_matches(
+        self, registry
+    ):
+        # Arrange
+        upstream = FakeUpstream()
+        client = CSFloatClient()
+        client.set_http_client(httpx.Client(transport=httpx.MockTransport(upstream)))
+        broker = RecordingBroker()
+        ak = registry.create(
+            WatchlistCreate(name="ak", params={"item_name": "AK-47 | Redline", "max_price": 5000})
+        )
+        registry.create(
+            WatchlistCreate(name="awp", params={"item_name": "AWP | Asiimov", "max_price": 5000})
+        )
+        engine = WatchlistEngine(client, registry, broker)
+
+        # Act
+        engine.run_once()
+        upstream.listings["3"] = 900
+        evaluations = engine.run_once()
+
+        # Assert
+        assert evaluations == 2
+        assert len(upstream.requests) == 2
+        assert all("item_name" not in r for r in upstream.requests)
+        assert [e["watchlist_id"] for e in broker.events] == [ak.id]
+        assert [i["id"] for i in broker.events[0]["new"]] == ["3"]
+
+    def test_given_slow_webhook_when_evaluated_then_tick_does_not_wait_for_it(self, registry):
+        # Arrange
+        upstream = FakeUpstream()
+        client = CSFloatClient()
+        client.set_http_client(httpx.Client(transport=httpx.MockTransport(upstream)))
+        release = threading.Event()
+
+        def slow_receiver(request):
+            release.wait(5)
+            return httpx.Response(204)
+
+        webhook = httpx.Client(transport=httpx.MockTransport(slow_receiver))
+        registry.create(spec("a", webhook_url="http://localhost/hook"))
+        engine = WatchlistEngine(client, registry, RecordingBroker(), webhook_client=webhook)
+        engine.run_once()
+        upstream.listings["3"] = 900
+
+        # Act
+        start = time.monotonic()
+        engine.run_once()
+        elapsed = time.monotonic() - start
+        release.set()
+
+        # Assert
+        assert elapsed < 1.0
+        assert engine.flush_webhooks(timeout=5)
+        assert engine.stats()["webhooks_sent"] == 1
+
+    def test_given_tick_raises_when_loop_runs_then_thread_keeps_evaluating(
+        self, registry, monkeypatch
+    ):
+        # Arrange
+        engine = WatchlistEngine(
+            CSFloatClient(), registry, RecordingBroker(), interval_seconds=0.01
+        )
+        calls = []
+
+        def flaky_run_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise KeyError("price")
+            return 0
+
+        monkeypatch.setattr(engine, "run_once", flaky_run_once)
+
+        # Act
+        engine.start()
+        deadline = time.monotonic() + 2
+        while len(calls) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        running = engine.stats()["running"]
+        engine.stop()
+
+        # Assert
+        assert len(calls) >= 3
+        assert running is True
+        assert engine.stats()["errors"] == 1
+
+
+class TestWatchlistEvents:
+    def test_given_subscriber_when_event_published_then_sse_frame_streamed(self):
+        # Arrange
+        broker = EventBroker()
+
+        async def consume():
+            stream = sse_events(broker, {"w1"}, heartbeat_seconds=0.05)
+            frames = [await stream.__anext__()]
+            broker.publish({"event_id": 1, "watchlist_id": "other"})
+            broker.publish({"event_id": 2, "watchlist_id": "w1", "new": []})
+            frames.append(await stream.__anext__())
+            await stream.aclose()
+            return frames
+
+        # Act
+        frames = asyncio.run(consume())
+
+        # Assert
+        assert frames[0] == ": connected\n\n"
+        assert frames[1].startswith("id: 2\nevent: match\ndata: ")
+        assert broker.stats()["subscribers"] == 0
+
+
+class TestWatchlistsApi:
+    def test_given_crud_calls_when_requested_then_registry_updated(self, registry, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(get_settings(), "WATCHLISTS_ENABLED", True)
+        monkeypatch.setattr(watchlists_router, "get_watchlist_registry", lambda: registry)
+
+        # Act
+        created = client.post(
+            "/watchlists", json={"name": "cheap AKs", "params": {"max_price": 20}}
+        )
+        bad = client.post("/watchlists", json={"name": "x", "webhook_url": "http://10.0.0.1/hook"})
+        listed = client.get("/watchlists")
+        deleted = client.delete(f"/watchlists/{created.json()['id']}")
+        missing = client.delete("/watchlists/nope")
+
+        # Assert
+        assert created.status_code == 200 and created.json()["params"]["max_price"] == 20
+        assert bad.status_code == 400
+        assert [w["name"] for w in listed.json()["watchlists"]] == ["cheap AKs"]
+        assert deleted.status_code == 200 and registry.list() == []
+        assert missing.status_code == 404
+
+    def test_given_engine_disabled_when_create_or_subscribe_then_404(self, registry, monkeypatch):
+        # Arrange
+        client = TestClient(app)
+        monkeypatch.setattr(get_settings(), "WATCHLISTS_ENABLED", False)
+        monkeypatch.setattr(watchlists_router, "get_watchlist_registry", lambda: registry)
+
+        # Act
+        created = client.post("/watchlists", json={"name": "cheap AKs"})
+        events = client.get("/watchlists/events")
+
+        # Assert
+        assert created.status_code == events.status_code == 404
+        assert created.json()["message"] == "The watchlists engine is disabled."
+        assert registry.list() == []
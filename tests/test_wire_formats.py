@@ -0,0 +1,104 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.features.listings.router as listings_router
+from backend.core import wire
+from backend.main import app
+
+ITEMS = [
+    {
+        "id": str(i),
+        "name": "AK-47 | Redline",
+        "price": 1000 + i,
+        "wear": "Field-Tested" if i % 2 else "Minimal Wear",
+        "rarity": "Rare" if i else None,
+        "float_value": 0.2 if i else None,
+    }
+    for i in range(4)
+]
+
+
+def load_frontend_wire():
+    path = Path(__file__).resolve().parents[1] / "frontend" / "client" / "wire.py"
+    spec = importlib.util.spec_from_file_location("frontend_wire", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(
+        listings_router.csfloat_client, "fetch_listings", lambda params: (ITEMS, "HIT")
+    )
+    return TestClient(app)
+
+
+class TestNegotiation:
+    def test_given_accept_headers_when_negotiate_then_best_available_format(self):
+        # Act / Assert
+        assert wire.negotiate(None) == wire.JSON
+        assert wire.negotiate("*/*") == wire.JSON
+        assert wire.negotiate("application/json, application/msgpack") == wire.JSON
+        expected = wire.MSGPACK if wire.MSGPACK in wire.available_formats() else wire.JSON
+        assert wire.negotiate("application/x-msgpack, application/json;q=0.5") == expected
+        assert wire.negotiate("text/html;q=1, application/msgpack;q=0") == wire.JSON
+
+
+class TestCompactListings:
+    def test_given_msgpack_accept_when_get_listings_then_dictionary_encoded_columns(self, client):
+        # Arrange
+        msgpack = pytest.importorskip("msgpack")
+
+        # Act
+        resp = client.get("/listings", headers={"Accept": "application/msgpack"})
+        as_json = client.get("/listings")
+
+        # Assert
+        assert resp.headers["content-type"] == "application/msgpack"
+        assert "Accept" in resp.headers["vary"] and "Accept" in as_json.headers["vary"]
+        doc = msgpack.unpackb(resp.content)
+        assert doc["dict"]["wear"] == ["Minimal Wear", "Field-Tested"]
+        assert doc["cols"]["wear"] == [0, 1, 0, 1]
+        assert doc["cols"]["rarity"][0] is None
+        assert len(resp.content) < len(as_json.content)
+        decoded = load_frontend_wire().decode_payload(resp.headers["content-type"], resp.content)
+        assert decoded["data"] == as_json.json()["data"]
+        assert decoded["meta"] == as_json.json()["meta"]
+
+    def test_given_arrow_accept_when_get_listings_then_dictionary_arrow_batch(self, client):
+        # Arrange
+        pytest.importorskip("pyarrow")
+
+        # Act
+        resp = client.get("/listings", headers={"Accept": wire.ARROW})
+
+        # Assert
+        assert resp.headers["content-type"] == wire.ARROW
+        decoded = load_frontend_wire().decode_payload(wire.ARROW, resp.content)
+        assert [i["price"] for i in decoded["data"]] == [1000, 1001, 1002, 1003]
+        assert decoded["data"][1]["wear"] == "Field-Tested"
+        assert decoded["meta"]["cache"] == "HIT"
+
+    def test_given_encoder_failure_when_get_listings_then_formatted_500(self, monkeypatch):
+        # Arrange
+        items = [dict(ITEMS[0], id="unencodable", price=4242)]
+        monkeypatch.setattr(
+            listings_router.csfloat_client, "fetch_listings", lambda params: (items, "HIT")
+        )
+
+        def broken_encoder(*args, **kwargs):
+            raise TypeError("can not serialize 'Decimal' object")
+
+        monkeypatch.setattr(wire, "encode_items", broken_encoder)
+        monkeypatch.setattr(wire, "negotiate", lambda accept: wire.MSGPACK)
+
+        # Act
+        resp = TestClient(app).get("/listings", headers={"Accept": wire.MSGPACK})
+
+        # Assert
+        assert resp.status_code == 500
+        assert resp.json()["message"].startswith("Unexpected error: can not serialize")